@@ -0,0 +1,145 @@
+"""
+Deterministic synthetic inputs for the benchmark suite.
+The same (n, seed) always produces byte-identical data, so timings are comparable across commits.
+"""
+
+import json
+import random
+import pathlib
+from datetime import date, timedelta
+from typing import Dict, List
+
+from scripts.utils import job_id
+
+COMPANIES = ["monday", "wix", "lemonade", "fiverr", "payoneer", "riskified", "taboola", "similarweb",
+             "snyk", "cato", "wiz", "armis", "axonius", "pagaya", "melio", "rapyd", "hibob", "papaya"]
+TITLES = ["Head of DevOps", "Director of Platform Engineering", "DevOps Group Lead", "VP Infrastructure",
+          "SRE Manager", "Head of Cloud Operations", "Engineering Manager, Platform",
+          # excluded or non-leadership titles, as a real crawl returns them
+          "Senior DevOps Engineer", "Platform Architect", "DevOps Team Lead", "Software Engineer",
+          "Backend Developer", "Data Analyst"]
+LOCATIONS = ["Tel Aviv, Israel", "Herzliya, Israel", "Remote - Israel", "Kfar Saba", "New York, USA",
+             "London, UK", "Berlin, Germany"]
+WORDS = ("kubernetes terraform aws gcp observability prometheus grafana gitops argo ci cd pipelines "
+         "reliability incident postmortem oncall scale latency cost finops security compliance soc2 "
+         "leadership hiring mentoring roadmap strategy stakeholders databases postgres kafka redis "
+         "microservices platform developer experience sre slo budget migration cloud networking").split()
+
+def _rng(seed: int, salt: str) -> random.Random:
+    return random.Random(f"{seed}:{salt}")
+
+def _jd(rng: random.Random, words: int = 80) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def greenhouse_payload(n: int, seed: int = 0) -> Dict:
+    """Greenhouse boards API response with n jobs."""
+    rng = _rng(seed, "gh")
+    start = date(2025, 1, 1)
+    jobs = []
+    for i in range(n):
+        company = rng.choice(COMPANIES)
+        jobs.append({
+            "id": 4000000 + i,
+            "title": rng.choice(TITLES),
+            "absolute_url": f"https://boards.greenhouse.io/{company}/jobs/{4000000 + i}",
+            "location": {"name": rng.choice(LOCATIONS)},
+            "updated_at": f"{start + timedelta(days=rng.randrange(90))}T10:00:00Z",
+        })
+    return {"jobs": jobs, "meta": {"total": n}}
+
+def lever_payload(n: int, seed: int = 0) -> List[Dict]:
+    """Lever postings API response (mode=json) with n postings."""
+    rng = _rng(seed, "lever")
+    postings = []
+    for i in range(n):
+        company = rng.choice(COMPANIES)
+        postings.append({
+            "id": f"{seed:04d}-{i:08d}",
+            "text": rng.choice(TITLES),
+            "categories": {"team": rng.choice(["Engineering", "Platform", "Infrastructure"]),
+                           "location": rng.choice(LOCATIONS)},
+            "hostedUrl": f"https://jobs.lever.co/{company}/{seed:04d}-{i:08d}",
+            "createdAt": 1735689600000 + rng.randrange(90) * 86400000,
+            "descriptionPlain": _jd(rng),
+        })
+    return postings
+
+def job_rows(n: int, seed: int = 0, duplicate_rate: float = 0.1) -> List[Dict]:
+    """Normalized jobs.jsonl rows; about `duplicate_rate` of them repeat an earlier title/company/location."""
+    rng = _rng(seed, "jobs")
+    rows = []
+    for i in range(n):
+        if rows and rng.random() < duplicate_rate:
+            dup = dict(rng.choice(rows))
+            dup["url"] = f"{dup['url']}?ref={i}"
+            dup["id"] = job_id(dup)
+            rows.append(dup)
+            continue
+        company = rng.choice(COMPANIES)
+        rec = {
+            "title": rng.choice(TITLES),
+            "company": company,
+            "location": rng.choice(LOCATIONS),
+            "url": f"https://boards.greenhouse.io/{company}/jobs/{i}",
+            "source": rng.choice(["greenhouse", "lever", "comeet"]),
+            "posted_at": "2025-01-15T10:00:00Z",
+            "jd": _jd(rng),
+        }
+        rec["id"] = job_id(rec)
+        rows.append(rec)
+    return rows
+
+def score_rows(jobs: List[Dict], seed: int = 0) -> List[Dict]:
+    """scores.jsonl rows for jobs, best first."""
+    rng = _rng(seed, "scores")
+    rows = [{"id": j["id"], "title": j["title"], "company": j["company"], "location": j["location"],
+             "url": j["url"], "score": round(rng.random(), 4), "why_fit": "strong profile alignment"}
+            for j in jobs]
+    rows.sort(key=lambda r: -r["score"])
+    return rows
+
+def job_state_data(n: int, seed: int = 0) -> Dict:
+    """job_state.json with n entries split across applied, ignored and sent_to_telegram."""
+    rng = _rng(seed, "state")
+    data = {"applied": {}, "ignored": {}, "sent_to_telegram": {}, "last_updated": "2025-01-01"}
+    for i in range(n):
+        jid = f"{i:020x}"
+        day = (date(2025, 1, 1) + timedelta(days=rng.randrange(60))).isoformat()
+        bucket = rng.random()
+        if bucket < 0.1:
+            data["applied"][jid] = {"date": day, "title": rng.choice(TITLES), "company": rng.choice(COMPANIES)}
+        elif bucket < 0.3:
+            data["ignored"][jid] = {"date": day, "title": rng.choice(TITLES), "company": rng.choice(COMPANIES),
+                                    "reason": "not_relevant"}
+        else:
+            data["sent_to_telegram"][jid] = {"date": day, "sent_count": rng.randint(1, 3)}
+    return data
+
+def career_page_html(n_jobs: int, seed: int = 0, company: str = "acme", jsonld: bool = False) -> str:
+    """A career page with n_jobs listing cards among the usual page chrome (plus a
+    JobPosting JSON-LD block per card with jsonld)."""
+    rng = _rng(seed, "html")
+    cards = []
+    for i in range(n_jobs):
+        title, location, jd = rng.choice(TITLES), rng.choice(LOCATIONS), _jd(rng, 20)
+        cards.append(
+            f'<div class="job-card position-{i}"><h3><a href="/careers/{i}">{title}</a></h3>'
+            f'<span class="location">{location}</span><p>{jd}</p></div>'
+        )
+        if jsonld:
+            posting = {"@context": "https://schema.org", "@type": "JobPosting", "title": title,
+                       "url": f"https://{company}.example/careers/{i}", "datePosted": "2025-03-01",
+                       "description": f"<p>{jd}</p>", "jobLocation": {"@type": "Place", "address": location}}
+            cards.append(f'<script type="application/ld+json">{json.dumps(posting)}</script>')
+    nav = "".join(f'<li><a href="/{w}">{w.title()}</a></li>' for w in WORDS[:20])
+    return (f"<!DOCTYPE html><html><head><title>Careers at {company}</title></head><body>"
+            f"<nav><ul>{nav}</ul></nav><header><h1>Join {company} in Tel Aviv, Israel</h1>"
+            f"<p>Open positions and career opportunities</p></header>"
+            f"<main><section class=\"openings\">{''.join(cards)}</section></main>"
+            f"<footer>{_jd(rng, 40)}</footer></body></html>")
+
+def write_jsonl(path: pathlib.Path, rows: List[Dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
@@ -0,0 +1,300 @@
+"""
+Throughput benchmarks for the pipeline stages.
+
+Usage:
+  PYTHONPATH=. python benchmarks/run.py [--full] [--only NAME] [--max-rows N] [--repeat R] [--out FILE]
+  PYTHONPATH=. python benchmarks/run.py --compare BASE.json [NEW.json]
+
+Every case runs against deterministic synthetic data in a temp directory, with the
+stage's file paths patched there, so nothing under data/ or outputs/ is touched.
+Results are written as JSON (one file per commit by default) for regression checks.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import platform
+import pathlib
+import argparse
+import statistics
+import subprocess
+import tempfile
+import contextlib
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from unittest.mock import patch
+
+import numpy as np
+import requests
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks import generators as gen
+
+RESULTS = ROOT / "benchmarks" / "results"
+
+JOB_SIZES = [1_000, 10_000, 100_000]
+FULL_JOB_SIZES = JOB_SIZES + [500_000]
+STATE_SIZES = [1_000, 10_000, 100_000]
+HTML_SIZES = [10, 100, 1_000]
+STATE_MUTATIONS = 20
+TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "1.2"))  # slowdown ratio reported as a regression
+
+# -- cached inputs (generation is not part of any timing) --------------------
+
+@lru_cache(maxsize=None)
+def _jobs(n):
+    return gen.job_rows(n)
+
+@lru_cache(maxsize=None)
+def _gh(n):
+    return gen.greenhouse_payload(n)["jobs"]
+
+@lru_cache(maxsize=None)
+def _lever(n):
+    return gen.lever_payload(n)
+
+class FakeEmbedder:
+    """Deterministic bag-of-words embedder with the score.py backend interface; no network."""
+    name = "fake"
+    model = "fake-bow-64"
+    indexed = False
+    dim = 64
+
+    def embed_batch(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, t in enumerate(texts):
+            for w in t.lower().split():
+                out[i, zlib.crc32(w.encode("utf-8")) % self.dim] += 1.0
+        return out
+
+# -- cases: setup(n, work, stack) patches paths, writes inputs, returns the timed callable --
+
+def setup_normalize_gh(n, work, stack):
+    from scripts.crawl import normalize_gh
+    payload = _gh(n)
+    return lambda: [normalize_gh(j) for j in payload]
+
+def setup_normalize_lever(n, work, stack):
+    from scripts.crawl import normalize_lever
+    payload = _lever(n)
+    return lambda: [normalize_lever(j) for j in payload]
+
+def setup_deduplicate(n, work, stack):
+    from scripts.deduplicate_jobs import deduplicate_jobs
+    gen.write_jsonl(work / "data" / "processed" / "jobs.jsonl", _jobs(n))
+    stack.enter_context(patch("scripts.deduplicate_jobs.ROOT", work))
+    return deduplicate_jobs
+
+def setup_update_ages(n, work, stack):
+    from scripts import job_tracker
+    jobs = _jobs(n)
+    jobs_jl, tracked_path = work / "jobs.jsonl", work / "job_tracker.json"
+    gen.write_jsonl(jobs_jl, jobs)
+    # Half the jobs were tracked yesterday, plus some that have since disappeared
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    tracked = {j["id"]: {"age": 1 + i % 20, "first_seen": yesterday, "last_seen": yesterday,
+                         "title": j["title"], "company": j["company"], "url": j["url"]}
+               for i, j in enumerate(jobs[: n // 2])}
+    tracked.update({f"gone{i}": {"age": 3, "first_seen": yesterday, "last_seen": yesterday,
+                                 "title": "", "company": "", "url": ""} for i in range(n // 20)})
+    with open(tracked_path, "w", encoding="utf-8") as f:
+        json.dump({"last_updated": yesterday, "jobs": tracked}, f)
+    stack.enter_context(patch.object(job_tracker, "JOBS_JL", jobs_jl))
+    stack.enter_context(patch.object(job_tracker, "TRACKED_JOBS", tracked_path))
+    return job_tracker.update_job_ages
+
+def _score_store(work):
+    from scripts.embedding_store import EmbeddingStore
+    return EmbeddingStore(FakeEmbedder.model, work / "embeddings.npy", work / "embeddings_index.json")
+
+def setup_score_cold(n, work, stack):
+    from scripts.score import score_jobs
+    jobs = _jobs(n)
+    store = _score_store(work)
+    return lambda: score_jobs(jobs, store, backend=FakeEmbedder())
+
+def setup_score_warm(n, work, stack):
+    from scripts.score import score_jobs, embed_jobs, profile_embedding
+    jobs = _jobs(n)
+    store = _score_store(work)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        profile_embedding(store, FakeEmbedder())
+        embed_jobs(jobs, store, FakeEmbedder())
+    return lambda: score_jobs(jobs, store, backend=FakeEmbedder())
+
+def _state_file(n, work):
+    path = work / "job_state.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(gen.job_state_data(n), f)
+    return path
+
+def setup_select_digest(n, work, stack):
+    from scripts import digest, job_state
+    scores = work / "scores.jsonl"
+    gen.write_jsonl(scores, gen.score_rows(_jobs(n)))
+    stack.enter_context(patch.object(job_state, "JOB_STATE_FILE", _state_file(n // 2, work)))
+    stack.enter_context(patch.object(digest, "job_state", job_state.JobState()))
+    return lambda: digest.select_digest(scores, threshold=0.78, limit=30)
+
+def setup_job_state(n, work, stack):
+    from scripts import job_state
+    stack.enter_context(patch.object(job_state, "JOB_STATE_FILE", _state_file(n, work)))
+    state = job_state.JobState()
+    def mutate():
+        for i in range(STATE_MUTATIONS):
+            jid = f"bench{i:04d}"
+            if i % 3 == 0:
+                state.mark_applied(jid, "Head of DevOps", "acme")
+            elif i % 3 == 1:
+                state.mark_ignored(jid, "Data Analyst", "acme")
+            else:
+                state.mark_sent_to_telegram(jid)
+    return mutate
+
+def setup_career_page(n, work, stack):
+    from scripts import career_page_scraper as cps
+    from scripts import ats_fingerprint, dns_cache
+
+    html = gen.career_page_html(n).encode("utf-8")
+
+    class Session:
+        def get(self, url, timeout=None, **kwargs):
+            page = requests.Response()
+            page.status_code, page.url, page._content, page._content_consumed = 200, url, html, True
+            page.headers["Content-Type"] = "text/html; charset=utf-8"
+            return page
+
+    stack.enter_context(patch.object(cps, "create_stealth_session", lambda: Session()))
+    stack.enter_context(patch.object(cps.time, "sleep", lambda s: None))
+    stack.enter_context(patch.object(ats_fingerprint, "_map", ats_fingerprint.AtsMap(work / "ats_map.json")))
+    stack.enter_context(patch.object(dns_cache, "_cache", dns_cache.DnsCache(work / "dns_cache.json",
+                                                                             resolver=lambda host: ["127.0.0.1"])))
+    company = {"name": "acme", "career_page": "https://acme.example/careers"}
+    positions = ["Head of DevOps", "Director of Platform Engineering", "VP Infrastructure"]
+    return lambda: cps.search_company_careers(company, positions)
+
+def setup_jsonld(n, work, stack):
+    from scripts.jsonld import page_records
+    html = gen.career_page_html(n, jsonld=True)
+    titles = ["Head of DevOps", "Director of Platform Engineering", "VP Infrastructure"]
+    return lambda: page_records(html, "https://acme.example/careers", "acme", titles=titles)
+
+CASES = {
+    "crawl.normalize_gh": (JOB_SIZES, setup_normalize_gh),
+    "crawl.normalize_lever": (JOB_SIZES, setup_normalize_lever),
+    "deduplicate_jobs": (JOB_SIZES, setup_deduplicate),
+    "job_tracker.update_job_ages": (JOB_SIZES, setup_update_ages),
+    "score.cold": (JOB_SIZES, setup_score_cold),
+    "score.warm": (JOB_SIZES, setup_score_warm),
+    "digest.select_digest": (JOB_SIZES, setup_select_digest),
+    "job_state.mutations": (STATE_SIZES, setup_job_state),
+    "career_page.parse": (HTML_SIZES, setup_career_page),
+    "career_page.jsonld": (HTML_SIZES, setup_jsonld),
+}
+
+# -- runner --------------------------------------------------------------------
+
+def time_case(setup, n, repeat):
+    """Seconds per run, with fresh inputs for every repeat (several stages rewrite their files)."""
+    times = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp, contextlib.ExitStack() as stack:
+            fn = setup(n, pathlib.Path(tmp), stack)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - start)
+    return times
+
+def git_commit():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ("-dirty" if dirty else "")
+    except Exception:
+        return "unknown"
+
+def run(cases=None, sizes_for=None, max_rows=None, repeat=3):
+    """Run the selected cases and return the results document."""
+    results = []
+    for name, (sizes, setup) in CASES.items():
+        if cases and not any(c in name for c in cases):
+            continue
+        for n in (sizes_for(name, sizes) if sizes_for else sizes):
+            if max_rows and n > max_rows:
+                continue
+            times = time_case(setup, n, repeat)
+            best = min(times)
+            results.append({
+                "case": name,
+                "size": n,
+                "best_s": round(best, 6),
+                "median_s": round(statistics.median(times), 6),
+                "per_item_us": round(best / n * 1e6, 3),
+            })
+            print(f"[BENCH] {name:<28} n={n:<8} best {best:9.4f}s  median {statistics.median(times):9.4f}s  "
+                  f"{best / n * 1e6:9.2f} us/item")
+    return {
+        "commit": git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+def compare(base, new, tolerance=TOLERANCE):
+    """Print best-time ratios new/base per (case, size); returns the regressed entries."""
+    old = {(r["case"], r["size"]): r for r in base["results"]}
+    regressions = []
+    print(f"[INFO] {base.get('commit')} -> {new.get('commit')} (regression above x{tolerance})")
+    for r in new["results"]:
+        b = old.get((r["case"], r["size"]))
+        if not b or not b["best_s"]:
+            continue
+        ratio = r["best_s"] / b["best_s"]
+        tag = "[WARN]" if ratio > tolerance else "[OK]"
+        print(f"{tag} {r['case']:<28} n={r['size']:<8} {b['best_s']:9.4f}s -> {r['best_s']:9.4f}s  x{ratio:.2f}")
+        if ratio > tolerance:
+            regressions.append({**r, "base_s": b["best_s"], "ratio": round(ratio, 3)})
+    return regressions
+
+def _load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the job search pipeline stages")
+    ap.add_argument("--full", action="store_true", help="include 500k-row inputs")
+    ap.add_argument("--only", action="append", help="run cases whose name contains this (repeatable)")
+    ap.add_argument("--max-rows", type=int, help="skip sizes above this")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", type=pathlib.Path, help="results file (default benchmarks/results/<commit>.json)")
+    ap.add_argument("--compare", nargs="+", metavar="JSON", help="BASE [NEW]: compare two results files, "
+                    "or BASE against a fresh run")
+    args = ap.parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        regressions = compare(_load(args.compare[0]), _load(args.compare[1]))
+        return 1 if regressions else 0
+
+    sizes_for = (lambda name, sizes: FULL_JOB_SIZES if sizes is JOB_SIZES else sizes) if args.full else None
+    doc = run(args.only, sizes_for, args.max_rows, max(1, args.repeat))
+    out = args.out or RESULTS / f"{doc['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+    print(f"[OK] Wrote {len(doc['results'])} results to {out}")
+    if args.compare:
+        return 1 if compare(_load(args.compare[0]), doc) else 0
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,6 +7,7 @@ import json
 import pathlib
 from datetime import date
 from scripts.utils import job_id
+from scripts.shards import write_shard
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 
@@ -116,11 +117,8 @@ def main():
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(jobs, f, indent=2, ensure_ascii=False)
         
-        # Append to main jobs file
-        jobs_file = ROOT / "data" / "processed" / "jobs.jsonl"
-        with open(jobs_file, "a", encoding="utf-8") as f:
-            for job in jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        # Write this source's shard; scripts/shards.py merges it into jobs.jsonl
+        write_shard("known_jobs", jobs)
         
         print(f"[SUCCESS] Added {len(jobs)} known real jobs")
     
@@ -0,0 +1,199 @@
+"""
+Asyncio crawl engine for large probe fan-outs (hundreds of companies x URL patterns).
+
+One pooled httpx.AsyncClient with a global concurrency cap and a semaphore per
+host. Failed requests are retried like create_session() does (3 retries on 429 and
+5xx responses and connection errors, backing off 1, 2, 4 seconds; Retry-After is
+honoured) and bodies are read with the same content-type gate and size cap as
+utils.capped_get. Scripts that are not async use the *_sync wrappers:
+
+  pages = async_crawl.fetch_all_sync(urls)                       # [Fetched]
+  first = async_crawl.probe_sync({"wiz": [url1, url2], ...})     # {key: Fetched | None}
+"""
+
+import os
+import json
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+import httpx
+from scripts.utils import MAX_BODY_BYTES, TEXT_TYPES
+from scripts import dns_cache
+from scripts.dns_cache import DnsCache, host_of
+
+CONCURRENCY = int(os.getenv("ASYNC_CONCURRENCY", "256"))  # requests in flight overall
+PER_HOST = int(os.getenv("ASYNC_PER_HOST", "4"))          # requests in flight per host
+TIMEOUT = float(os.getenv("ASYNC_TIMEOUT", "20"))
+RETRIES = 3
+BACKOFF = 1.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+@dataclass
+class Fetched:
+    url: str
+    status_code: int = 0
+    content: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoding: Optional[str] = None
+    truncated: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status_code < 300
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+class AsyncFetcher:
+    """Use as `async with AsyncFetcher() as f: await f.get(url)`."""
+
+    def __init__(self, concurrency: int = CONCURRENCY, per_host: int = PER_HOST, timeout: float = TIMEOUT,
+                 retries: int = RETRIES, backoff: float = BACKOFF, max_bytes: int = MAX_BODY_BYTES,
+                 content_types: Optional[Iterable[str]] = TEXT_TYPES, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 dns: Optional[DnsCache] = None):
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_bytes = max_bytes
+        self.content_types = tuple(content_types) if content_types is not None else None
+        self.transport = transport
+        # Probes skip hosts that do not resolve; a custom transport never touches DNS
+        self.dns = dns if dns is not None or transport is not None else dns_cache.cache()
+        self.skipped = 0
+        self.requests = 0
+        self.retried = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self):
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._client = httpx.AsyncClient(
+            transport=self.transport, timeout=self.timeout, follow_redirects=True,
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/json;q=0.9,*/*;q=0.8"},
+            limits=httpx.Limits(max_connections=self.concurrency,
+                                max_keepalive_connections=min(self.concurrency, 100)))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+
+    def _host(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> Fetched:
+        """The response to a GET; never raises: failures come back with `error` set."""
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt
+            async with self._slots, self._host(url):
+                self.requests += 1
+                try:
+                    result = await self._get_once(url, params, headers)
+                except (httpx.HTTPError, httpx.InvalidURL) as e:
+                    result = Fetched(url, error=f"{type(e).__name__}: {e}")
+                    # Only network trouble is worth another try; redirect loops, bad encodings
+                    # and malformed URLs fail the same way every time
+                    if not isinstance(e, httpx.TransportError) or isinstance(e, httpx.UnsupportedProtocol):
+                        return result
+            # Connection failures have no status; a rejected content type has one and is final
+            retryable = result.status_code in RETRY_STATUSES or (result.error and not result.status_code)
+            if not retryable or attempt == self.retries:
+                return result
+            try:
+                delay = min(60.0, float(result.headers.get("retry-after", delay)))
+            except ValueError:
+                pass
+            self.retried += 1
+            await asyncio.sleep(delay)  # outside the semaphores, so waiting holds no slot
+        return result
+
+    async def _get_once(self, url: str, params: Optional[Dict], headers: Optional[Dict]) -> Fetched:
+        async with self._client.stream("GET", url, params=params, headers=headers) as r:
+            result = Fetched(str(r.url), r.status_code, headers=dict(r.headers), encoding=r.charset_encoding)
+            ctype = r.headers.get("content-type", "").split(";")[0].strip().lower()
+            if self.content_types is not None and ctype and not ctype.startswith(self.content_types):
+                result.error = f"{ctype} is not read"
+                return result
+            chunks, size = [], 0
+            async for chunk in r.aiter_bytes():
+                if size + len(chunk) > self.max_bytes:
+                    chunks.append(chunk[: self.max_bytes - size])
+                    result.truncated = True
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+            result.content = b"".join(chunks)
+            return result
+
+    async def fetch_all(self, urls: Iterable[str]) -> List[Fetched]:
+        return list(await asyncio.gather(*(self.get(u) for u in urls)))
+
+    async def probe(self, candidates: Dict[str, List[str]]) -> Dict[str, Optional[Fetched]]:
+        """For each key, the first of its URLs (in the given order) that answers 200.
+
+        All candidate URLs of all keys are requested at once; the preference order
+        only decides which answer is used. Hosts are resolved in parallel first and
+        the ones that do not exist are not contacted.
+        """
+        keys = list(candidates)
+        alive = None
+        if self.dns is not None:
+            hosts = {host_of(u) for urls in candidates.values() for u in urls}
+            alive = await asyncio.to_thread(self.dns.prewarm, hosts)
+
+        async def fetch(url):
+            if alive is not None and not alive.get(host_of(url), True):
+                self.skipped += 1
+                return Fetched(url, error="host does not resolve")
+            return await self.get(url)
+
+        results = await asyncio.gather(*(asyncio.gather(*(fetch(u) for u in candidates[k])) for k in keys))
+        return {k: next((r for r in rs if r.ok and r.status_code == 200), None) for k, rs in zip(keys, results)}
+
+def run_sync(coro):
+    """Run a coroutine to completion from synchronous code (even inside a running loop)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    out = {}
+    def runner():
+        try:
+            out["value"] = asyncio.run(coro)
+        except BaseException as e:
+            out["error"] = e
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if "error" in out:
+        raise out["error"]
+    return out["value"]
+
+async def _with_fetcher(method: str, arg, **kwargs):
+    async with AsyncFetcher(**kwargs) as fetcher:
+        result = await getattr(fetcher, method)(arg)
+        print(f"[ASYNC] {fetcher.requests} requests ({fetcher.retried} retried, "
+              f"{fetcher.skipped} skipped for unresolvable hosts)")
+        return result
+
+def fetch_all_sync(urls: Iterable[str], **kwargs) -> List[Fetched]:
+    """Fetch URLs concurrently from synchronous code; results in input order."""
+    return run_sync(_with_fetcher("fetch_all", list(urls), **kwargs))
+
+def probe_sync(candidates: Dict[str, List[str]], **kwargs) -> Dict[str, Optional[Fetched]]:
+    """AsyncFetcher.probe from synchronous code."""
+    return run_sync(_with_fetcher("probe", candidates, **kwargs))
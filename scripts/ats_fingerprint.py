@@ -0,0 +1,158 @@
+"""
+ATS fingerprinting for company career pages.
+
+Many career pages are a wrapper around a Greenhouse, Lever, Ashby, Comeet or
+SmartRecruiters board, or publish their openings as JSON-LD JobPosting blocks.
+The first time a scraper downloads such a page, fingerprint() finds the board
+(iframe src, script URLs, links, JSON-LD) and the mapping is stored in
+data/processed/ats_map.json. Later runs call known_jobs(), which goes straight to
+the board's JSON API: one small request per company instead of several HTML pages.
+A mapping that stops working (404, renamed board) is dropped and the scraper falls
+back to HTML, where it is detected again.
+"""
+
+import os
+import re
+import json
+import pathlib
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from scripts.utils import create_session, job_id
+from scripts.jsonld import job_postings, page_records
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+ATS_MAP = ROOT / "data" / "processed" / "ats_map.json"
+
+# (ats, pattern capturing the board token), in order of preference
+FINGERPRINTS = [
+    ("greenhouse", re.compile(r"(?:boards|job-boards)(?:\.eu)?\.greenhouse\.io/(?:embed/job_board(?:/js)?\?for=)?([\w-]+)", re.I)),
+    ("greenhouse", re.compile(r"boards-api\.greenhouse\.io/v1/boards/([\w-]+)", re.I)),
+    ("lever", re.compile(r"(?:jobs|api)\.lever\.co/(?:v0/postings/)?([\w-]+)", re.I)),
+    ("ashby", re.compile(r"(?:jobs\.ashbyhq\.com|api\.ashbyhq\.com/posting-api/job-board)/([\w.-]+)", re.I)),
+    ("comeet", re.compile(r"comeet\.(?:co|com)/jobs/([\w-]+)/", re.I)),
+    ("comeet", re.compile(r"([\w-]+)\.comeet\.co/careers", re.I)),
+    ("smartrecruiters", re.compile(r"(?:careers|jobs|api)\.smartrecruiters\.com/(?:v1/companies/)?([\w-]+)", re.I)),
+]
+# Host names every FINGERPRINTS pattern contains; a page read can stop once one has arrived
+MARKERS = ("greenhouse.io", "lever.co", "ashbyhq.com", "comeet.co", "smartrecruiters.com")
+IGNORED_BOARDS = {"embed", "v0", "v1", "js", "jobs", "api", "static", "assets", "widget", "postings"}
+
+def fingerprint(html: str, page_url: str = "") -> Optional[Dict]:
+    """{"ats", "board"} for the job board a page embeds, or None."""
+    for ats, pattern in FINGERPRINTS:
+        for match in pattern.finditer(html or ""):
+            board = match.group(1)
+            if board.lower() not in IGNORED_BOARDS:
+                return {"ats": ats, "board": board}
+    if page_url and job_postings(html):
+        return {"ats": "jsonld", "board": page_url}
+    return None
+
+def api_url(ats: str, board: str) -> str:
+    from scripts.israeli_job_sources import comeet_url, smartrecruiters_url
+    return {
+        "greenhouse": f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs",
+        "lever": f"https://api.lever.co/v0/postings/{board}?mode=json",
+        "ashby": f"https://api.ashbyhq.com/posting-api/job-board/{board}",
+        "comeet": comeet_url(board),
+        "smartrecruiters": smartrecruiters_url(board),
+        "jsonld": board,
+    }[ats]
+
+def _records(ats: str, board: str, payload) -> List[Dict]:
+    """All postings of a board as job records (unfiltered unless the ATS helper filters)."""
+    from scripts.crawl import normalize_gh, normalize_lever
+    from scripts.israeli_job_sources import comeet_record, smartrecruiters_record
+    if ats == "greenhouse":
+        return [normalize_gh(j) for j in (payload or {}).get("jobs", [])]
+    if ats == "lever":
+        return [normalize_lever(j) for j in payload or []]
+    if ats == "ashby":
+        return [{"title": j.get("title", ""), "company": "", "location": j.get("location", ""),
+                 "url": j.get("jobUrl", ""), "source": "ashby", "posted_at": j.get("publishedAt", ""),
+                 "jd": j.get("descriptionPlain", "")} for j in (payload or {}).get("jobs", [])]
+    if ats == "comeet":
+        return [r for r in (comeet_record(board, p) for p in payload or []) if r]
+    if ats == "smartrecruiters":
+        return [r for r in (smartrecruiters_record(board, p) for p in (payload or {}).get("content", [])) if r]
+    # The page is an Israeli company's own career page; no location means the local office
+    return page_records(payload, board, default_location="Israel")
+
+class AtsMap:
+    def __init__(self, path: pathlib.Path = None):
+        self.path = path or ATS_MAP
+        self.companies: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.companies = json.load(f).get("companies", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, company: str) -> Optional[Dict]:
+        return self.companies.get(company.lower())
+
+    def learn(self, company: str, html: str, page_url: str) -> Optional[Dict]:
+        """Fingerprint a downloaded career page and remember the board it embeds."""
+        found = fingerprint(html, page_url)
+        if found:
+            with self._lock:
+                self.companies[company.lower()] = {**found, "page": page_url,
+                                                   "detected": datetime.now().isoformat(timespec="seconds")}
+                self._save()
+            print(f"[ATS] {company}: {found['ats']} board {found['board']}")
+        return found
+
+    def forget(self, company: str):
+        with self._lock:
+            if self.companies.pop(company.lower(), None) is not None:
+                self._save()
+
+    def known_jobs(self, company: str, session=None, display: Optional[str] = None,
+                   timeout: float = 20) -> Optional[List[Dict]]:
+        """Matching jobs from the company's mapped board, or None when it has no (working) mapping.
+
+        `display` is the company name put on the records (defaults to `company`).
+        """
+        from scripts.crawl import title_matches, location_matches
+        entry = self.get(company)
+        if not entry:
+            return None
+        session = session or create_session()
+        try:
+            r = session.get(api_url(entry["ats"], entry["board"]), timeout=timeout)
+            if r.status_code in (404, 410):
+                print(f"[ATS] {company}: {entry['ats']} board {entry['board']} is gone; re-detecting")
+                self.forget(company)
+                return None
+            r.raise_for_status()
+            records = _records(entry["ats"], entry["board"], r.text if entry["ats"] == "jsonld" else r.json())
+        except Exception as e:
+            print(f"[ATS] {company}: {e}")
+            return None
+        jobs = []
+        for rec in records:
+            if title_matches(rec["title"]) and location_matches(rec["location"]):
+                rec["company"] = display or company
+                rec["id"] = job_id(rec)
+                jobs.append(rec)
+        return jobs
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"companies": self.companies}, f, indent=2)
+        os.replace(tmp, self.path)
+
+_map = None
+_map_lock = threading.Lock()
+
+def ats_map() -> AtsMap:
+    """Process-wide mapping shared by the career page scrapers."""
+    global _map
+    with _map_lock:
+        if _map is None:
+            _map = AtsMap()
+        return _map
@@ -0,0 +1,208 @@
+"""
+Incremental BM25 inverted index over job titles and descriptions.
+
+Each job is stored as a term-frequency map keyed by job id together with a
+content hash, so only new or changed jobs are re-tokenized and jobs that left
+jobs.jsonl are dropped. Token postings lists (term -> {job id: tf}) are built in
+memory on load. Scoring and explanations need no network, which makes the index
+usable as an offline ranking and as a lexical signal fused with embeddings.
+
+    python scripts/bm25_index.py search <query words> [-k N]
+    python scripts/bm25_index.py stats
+"""
+
+import os
+import re
+import json
+import math
+import pathlib
+import numpy as np
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+from scripts.embedding_store import text_hash
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+BM25_INDEX = ROOT / "data" / "processed" / "bm25_index.json"
+JOBS_JL = ROOT / "data" / "processed" / "jobs.jsonl"
+
+K1 = 1.2
+B = 0.75
+TITLE_BOOST = 3  # title tokens count this many times in a job's term frequencies
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset("""
+a about across all also an and are as at be been by can for from has have in into is it its of on or our
+that the their this to we will with within you your
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if len(t) > 1 and t not in STOPWORDS]
+
+def job_terms(job: Dict) -> Dict[str, int]:
+    return dict(Counter(tokenize(job.get("title", "")) * TITLE_BOOST + tokenize(job.get("jd", ""))))
+
+def job_hash(job: Dict) -> str:
+    return text_hash(f"{job.get('title', '')}\n{job.get('jd', '')}")
+
+class BM25Index:
+    def __init__(self, path: pathlib.Path = None):
+        self.path = pathlib.Path(path or BM25_INDEX)
+        self.docs: Dict[str, Dict] = {}  # id -> {"h": content hash, "tf": {term: count}}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.docs = json.load(f).get("docs", {})
+            except Exception as e:
+                print(f"[BM25] Could not load {self.path.name}, rebuilding: {e}")
+        self._dirty = False
+        self._rebuild()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, job_id: str):
+        return job_id in self.docs
+
+    def _rebuild(self):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_len: Dict[str, int] = {}
+        for jid, doc in self.docs.items():
+            self._index(jid, doc["tf"])
+
+    def _index(self, jid: str, tf: Dict[str, int]):
+        self.doc_len[jid] = sum(tf.values())
+        for term, n in tf.items():
+            self.postings.setdefault(term, {})[jid] = n
+
+    def _unindex(self, jid: str):
+        for term in self.docs[jid]["tf"]:
+            plist = self.postings.get(term)
+            if plist is not None:
+                plist.pop(jid, None)
+                if not plist:
+                    del self.postings[term]
+        self.doc_len.pop(jid, None)
+
+    def update(self, jobs: Iterable[Dict]) -> int:
+        """Sync the index with the current jobs; returns how many docs changed."""
+        changes = 0
+        current = set()
+        for job in jobs:
+            jid = job.get("id")
+            if not jid or jid in current:
+                continue
+            current.add(jid)
+            h = job_hash(job)
+            doc = self.docs.get(jid)
+            if doc and doc["h"] == h:
+                continue
+            if doc:
+                self._unindex(jid)
+            tf = job_terms(job)
+            self.docs[jid] = {"h": h, "tf": tf}
+            self._index(jid, tf)
+            changes += 1
+        for jid in [j for j in self.docs if j not in current]:
+            self._unindex(jid)
+            del self.docs[jid]
+            changes += 1
+        if changes:
+            self._dirty = True
+        return changes
+
+    def _idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.docs) - df + 0.5) / (df + 0.5))
+
+    def _avg_len(self) -> float:
+        return (sum(self.doc_len.values()) / len(self.doc_len)) if self.doc_len else 0.0
+
+    def scores(self, query: str, doc_ids: List[str]):
+        """BM25 score of every listed job against the query text (numpy array)."""
+        out = np.zeros(len(doc_ids))
+        if not self.docs:
+            return out
+        pos = {jid: i for i, jid in enumerate(doc_ids)}
+        avg = self._avg_len() or 1.0
+        for term in set(tokenize(query)):
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            idf = self._idf(term)
+            for jid, tf in plist.items():
+                i = pos.get(jid)
+                if i is not None:
+                    norm = K1 * (1 - B + B * self.doc_len[jid] / avg)
+                    out[i] += idf * tf * (K1 + 1) / (tf + norm)
+        return out
+
+    def explain(self, query: str, doc_id: str, top: int = 3) -> List[Tuple[str, float]]:
+        """Query terms that contribute most to one job's score."""
+        doc = self.docs.get(doc_id)
+        if not doc:
+            return []
+        tf_map = doc["tf"]
+        norm = K1 * (1 - B + B * self.doc_len[doc_id] / (self._avg_len() or 1.0))
+        parts = []
+        for term in set(tokenize(query)):
+            tf = tf_map.get(term)
+            if tf:
+                parts.append((term, self._idf(term) * tf * (K1 + 1) / (tf + norm)))
+        parts.sort(key=lambda p: (-p[1], p[0]))
+        return parts[:top]
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        ids = list(self.docs)
+        s = self.scores(query, ids)
+        order = np.argsort(-s)[:k]
+        return [(ids[i], float(s[i])) for i in order if s[i] > 0]
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"k1": K1, "b": B, "docs": self.docs}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+def main():
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("search", "stats"):
+        print(__doc__.strip().split("\n\n")[-1])
+        return
+
+    jobs = {}
+    if JOBS_JL.exists():
+        with open(JOBS_JL, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    j = json.loads(line)
+                except:
+                    continue
+                if j.get("id"):
+                    jobs[j["id"]] = j
+    index = BM25Index()
+    changed = index.update(jobs.values())
+    index.save()
+
+    if sys.argv[1] == "stats":
+        print(f"Docs: {len(index)}  Terms: {len(index.postings)}  Avg length: {index._avg_len():.1f}  Updated: {changed}")
+        return
+
+    args = sys.argv[2:]
+    k = 10
+    if "-k" in args:
+        i = args.index("-k")
+        k = int(args[i + 1])
+        args = args[:i] + args[i + 2:]
+    query = " ".join(args)
+    for jid, s in index.search(query, k):
+        j = jobs.get(jid, {})
+        terms = ", ".join(t for t, _ in index.explain(query, jid))
+        print(f"  {s:6.2f}  {j.get('title', '')} @ {j.get('company', '')}  ({terms})")
+
+if __name__ == "__main__":
+    main()
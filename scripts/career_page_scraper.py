@@ -5,11 +5,14 @@ Bypasses job board limitations by going directly to company career pages.
 """
 
 import requests
-import json
 import pathlib
 from datetime import date
 from bs4 import BeautifulSoup
-from scripts.utils import create_session, job_id
+from scripts.utils import create_session, capped_get, job_id
+from scripts.shards import write_shard
+from scripts.ats_fingerprint import ats_map, MARKERS
+from scripts.jsonld import job_postings, page_records
+from scripts import dns_cache
 import yaml
 import time
 import random
@@ -43,13 +46,9 @@ def create_stealth_session():
     
     return session
 
-def search_company_careers(company_info, position_types):
-    """Search a specific company's career page for all position types."""
-    jobs = []
-    session = create_stealth_session()
-    
+def career_urls_for(company_info):
+    """Candidate career page URLs for a company, the configured page first."""
     company_name = company_info['name']
-    company_description = company_info.get('description', company_name)
     
     # Try multiple career page patterns
     career_urls = [
@@ -65,16 +64,63 @@ def search_company_careers(company_info, position_types):
     # Add specific career page if provided
     if 'career_page' in company_info:
         career_urls.insert(0, company_info['career_page'])
+    return career_urls
+
+def _serial_fetch(session):
+    def fetch(url):
+        time.sleep(random.uniform(1, 3))  # Random delay
+        # A page that embeds a job board is only needed up to the board's URL
+        return capped_get(session, url, timeout=15, stop_at=MARKERS)
+    return fetch
+
+def search_company_careers(company_info, position_types, fetch=None):
+    """Search a specific company's career page for all position types.
+
+    fetch(url) returns the page; the crawl scheduler passes Http.render so pages come
+    through the shared rendering pool. Standalone runs use a capped GET after a pause
+    that stops reading once an ATS board URL has arrived.
+    """
+    jobs = []
+    session = create_stealth_session()
+    fetch = fetch or _serial_fetch(session)
+    
+    company_name = company_info['name']
+    company_description = company_info.get('description', company_name)
+    career_urls = career_urls_for(company_info)
     
     print(f"[CAREER] Searching {company_name}...")
     
-    for url in career_urls:
+    # A company whose page embeds a known job board is read from the board's JSON API
+    boards = ats_map()
+    known = boards.known_jobs(company_name, session, display=company_description)
+    if known is not None:
+        print(f"[CAREER] {company_name}: {len(known)} matching jobs via its job board API")
+        return known
+    
+    # Hosts that do not resolve (cached NXDOMAIN) are skipped without a connect attempt
+    for url in dns_cache.cache().filter_urls(career_urls):
         try:
-            time.sleep(random.uniform(1, 3))  # Random delay
-            
-            response = session.get(url, timeout=15)
+            response = fetch(url)
             
             if response.status_code == 200:
+                board = boards.learn(company_name, response.text, url)
+                if board and board["ats"] != "jsonld":
+                    known = boards.known_jobs(company_name, session, display=company_description)
+                    if known is not None:
+                        return known
+                
+                if getattr(response, "stopped_at", None):
+                    # Reading stopped at an ATS link but the board gave nothing; the HTML needs the whole page
+                    response = capped_get(session, url, timeout=15)
+                
+                if job_postings(response.text):
+                    # JobPosting JSON-LD: exact titles, per-job URLs and dates, no DOM needed
+                    jobs = page_records(response.text, url, company_description, "career_page_jsonld",
+                                        titles=position_types, default_location="Israel")
+                    for job in jobs:
+                        print(f"[CAREER] Found: {job['title']} @ {company_name}")
+                    return jobs
+                
                 soup = BeautifulSoup(response.text, 'html.parser')
                 page_text = soup.get_text().lower()
                 
@@ -153,76 +199,80 @@ def search_company_careers(company_info, position_types):
     
     return jobs
 
+# Major Israeli companies with known career pages
+MAJOR_COMPANIES = [
+    {
+        'name': 'monday',
+        'description': 'Monday.com - Work OS Platform',
+        'career_page': 'https://monday.com/careers'
+    },
+    {
+        'name': 'wix',
+        'description': 'Wix - Website Builder Platform',
+        'career_page': 'https://www.wix.com/jobs'
+    },
+    {
+        'name': 'outbrain',
+        'description': 'Outbrain - Content Discovery',
+        'career_page': 'https://www.outbrain.com/careers'
+    },
+    {
+        'name': 'gong',
+        'description': 'Gong - Revenue Intelligence',
+        'career_page': 'https://www.gong.io/careers'
+    },
+    {
+        'name': 'fiverr',
+        'description': 'Fiverr - Freelance Marketplace',
+        'career_page': 'https://careers.fiverr.com'
+    },
+    {
+        'name': 'cyberark',
+        'description': 'CyberArk - Privileged Access Management',
+        'career_page': 'https://www.cyberark.com/careers'
+    },
+    {
+        'name': 'checkmarx',
+        'description': 'Checkmarx - Application Security',
+        'career_page': 'https://www.checkmarx.com/careers'
+    },
+    {
+        'name': 'walkme',
+        'description': 'WalkMe - Digital Adoption Platform',
+        'career_page': 'https://www.walkme.com/careers'
+    },
+    {
+        'name': 'lightricks',
+        'description': 'Lightricks - AI-Powered Creative Tools',
+        'career_page': 'https://www.lightricks.com/careers'
+    },
+    {
+        'name': 'nvidia-israel',
+        'description': 'NVIDIA Israel - AI Chip Leader',
+        'career_page': 'https://nvidia.wd5.myworkdayjobs.com/NVIDIAExternalCareerSite'
+    },
+    {
+        'name': 'google-israel',
+        'description': 'Google Israel - Search and Cloud',
+        'career_page': 'https://careers.google.com/locations/israel/'
+    },
+    {
+        'name': 'microsoft-israel',
+        'description': 'Microsoft Israel - Cloud and Software',
+        'career_page': 'https://careers.microsoft.com/professionals/us/en/l-israel'
+    }
+]
+
 def search_major_israeli_companies():
     """Search career pages of major Israeli companies."""
     jobs = []
     
-    # Major Israeli companies with known career pages
-    companies = [
-        {
-            'name': 'monday',
-            'description': 'Monday.com - Work OS Platform',
-            'career_page': 'https://monday.com/careers'
-        },
-        {
-            'name': 'wix',
-            'description': 'Wix - Website Builder Platform',
-            'career_page': 'https://www.wix.com/jobs'
-        },
-        {
-            'name': 'outbrain',
-            'description': 'Outbrain - Content Discovery',
-            'career_page': 'https://www.outbrain.com/careers'
-        },
-        {
-            'name': 'gong',
-            'description': 'Gong - Revenue Intelligence',
-            'career_page': 'https://www.gong.io/careers'
-        },
-        {
-            'name': 'fiverr',
-            'description': 'Fiverr - Freelance Marketplace',
-            'career_page': 'https://careers.fiverr.com'
-        },
-        {
-            'name': 'cyberark',
-            'description': 'CyberArk - Privileged Access Management',
-            'career_page': 'https://www.cyberark.com/careers'
-        },
-        {
-            'name': 'checkmarx',
-            'description': 'Checkmarx - Application Security',
-            'career_page': 'https://www.checkmarx.com/careers'
-        },
-        {
-            'name': 'walkme',
-            'description': 'WalkMe - Digital Adoption Platform',
-            'career_page': 'https://www.walkme.com/careers'
-        },
-        {
-            'name': 'lightricks',
-            'description': 'Lightricks - AI-Powered Creative Tools',
-            'career_page': 'https://www.lightricks.com/careers'
-        },
-        {
-            'name': 'nvidia-israel',
-            'description': 'NVIDIA Israel - AI Chip Leader',
-            'career_page': 'https://nvidia.wd5.myworkdayjobs.com/NVIDIAExternalCareerSite'
-        },
-        {
-            'name': 'google-israel',
-            'description': 'Google Israel - Search and Cloud',
-            'career_page': 'https://careers.google.com/locations/israel/'
-        },
-        {
-            'name': 'microsoft-israel',
-            'description': 'Microsoft Israel - Cloud and Software',
-            'career_page': 'https://careers.microsoft.com/professionals/us/en/l-israel'
-        }
-    ]
-    
+    companies = MAJOR_COMPANIES
     position_types = load_position_types()
     
+    # Resolve every candidate host of every company in parallel up front
+    dns_cache.cache().prewarm(dns_cache.host_of(u) for c in companies for u in career_urls_for(c))
+    
     for company in companies:
         try:
             company_jobs = search_company_careers(company, position_types)
@@ -255,12 +305,8 @@ def main():
     
     # Save results
     if unique_jobs:
-        jobs_file = ROOT / "data" / "processed" / "jobs.jsonl"
-        jobs_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(jobs_file, "a", encoding="utf-8") as f:
-            for job in unique_jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        # Write this source's shard; scripts/shards.py merges it into jobs.jsonl
+        write_shard("career_pages", unique_jobs)
     
     print("=" * 60)
     print(f"✅ CAREER PAGE SEARCH COMPLETE")
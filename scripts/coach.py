@@ -1,6 +1,9 @@
-import os, json, pathlib
+import os, json, heapq, pathlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from openai import OpenAI
+from scripts.embedding_store import text_hash
+from scripts.utils import retry_on_rate_limit
 
 load_dotenv()
 ROOT = pathlib.Path(__file__).resolve().parents[1]
@@ -10,16 +13,24 @@ def get_client():
     return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 SCORES = ROOT / "outputs" / "scores.jsonl"
 PROFILE = (ROOT / "configs" / "profile.md").read_text(encoding="utf-8")
+PREP_CACHE = ROOT / "outputs" / "interview_prep"
 
-def best_job():
-    # return the top-scoring job as default
-    rows = []
+PREP_TOP_N = int(os.getenv("COACH_TOP_N", "5"))
+CONCURRENCY = int(os.getenv("COACH_CONCURRENCY", "4"))
+
+def _iter_scores():
     with open(SCORES, "r", encoding="utf-8") as f:
         for line in f:
-            try: rows.append(json.loads(line))
+            try: yield json.loads(line)
             except: pass
-    rows.sort(key=lambda r: r.get("score",0), reverse=True)
-    return rows[0] if rows else None
+
+def best_job():
+    # return the top-scoring job as default (single pass, no sort)
+    return max(_iter_scores(), key=lambda r: r.get("score",0), default=None)
+
+def top_jobs(n: int = PREP_TOP_N):
+    """The n highest-scoring jobs, selected with a bounded heap."""
+    return heapq.nlargest(n, _iter_scores(), key=lambda r: r.get("score",0))
 
 def generate_questions(job):
     prompt = f"""Create 10 senior DevOps/Platform leadership interview questions tailored to this role.
@@ -38,7 +49,50 @@ def generate_questions(job):
     )
     return resp.choices[0].message.content.strip()
 
-def score_answer(question, answer):
+def cache_path(job) -> pathlib.Path:
+    """Interview prep cache entry for (job id, profile hash)."""
+    job_id = (job or {}).get("id") or "general"
+    return PREP_CACHE / f"{text_hash(job_id + '|' + text_hash(PROFILE))}.json"
+
+def questions_for(job, refresh: bool = False):
+    """Interview questions for a job, generated once and then served from the disk cache."""
+    path = cache_path(job)
+    if not refresh and path.exists():
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))["questions"]
+        except Exception:
+            pass
+    questions = retry_on_rate_limit(generate_questions, job, label=(job or {}).get("title", ""))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({
+        "id": (job or {}).get("id"),
+        "title": (job or {}).get("title"),
+        "company": (job or {}).get("company"),
+        "questions": questions,
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return questions
+
+def precompute(jobs, concurrency: int = CONCURRENCY):
+    """Generate interview questions for jobs not yet cached, `concurrency` requests at a time."""
+    todo = [j for j in jobs if not cache_path(j).exists()]
+    done, failed = 0, 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(questions_for, j): j for j in todo}
+        for fut in as_completed(futures):
+            job = futures[fut]
+            try:
+                fut.result()
+                done += 1
+            except Exception as e:
+                failed += 1
+                print(f"[WARN] Interview prep failed for {job.get('title')} @ {job.get('company')}: {e}")
+    print(f"[OK] Interview prep: {done} generated, {len(jobs) - len(todo)} cached, {failed} failed")
+    return {"generated": done, "cached": len(jobs) - len(todo), "failed": failed}
+
+def score_answer_stream(question, answer):
+    """Yield the feedback text as it is generated."""
     rubric = "Score 1-10; consider clarity, metrics, STAR structure, relevance to reliability/cost/scale, and leadership signal."
     prompt = f"""Question: {question}
     Candidate answer:
@@ -46,26 +100,45 @@ def score_answer(question, answer):
     {rubric}
     Return a JSON with keys: score (int), strengths (bullets), improvements (bullets), tighter_version (<=120 words)."""
     client = get_client()
-    resp = client.chat.completions.create(
+    stream = client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[{"role":"user","content":prompt}],
         temperature=0.2,
+        stream=True,
     )
-    return resp.choices[0].message.content.strip()
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+def score_answer(question, answer):
+    return "".join(score_answer_stream(question, answer)).strip()
 
 if __name__ == "__main__":
     import sys
-    job = best_job()
-    qs = generate_questions(job)
+    if len(sys.argv) > 1 and sys.argv[1] == "--precompute":
+        precompute(top_jobs(int(sys.argv[2]) if len(sys.argv) > 2 else PREP_TOP_N))
+        raise SystemExit()
+
+    # Usage: python scripts/coach.py [JOB_ID] [QUESTION_NUMBER]
+    if len(sys.argv) > 1:
+        from scripts.tailor import pick
+        job = pick(sys.argv[1])
+    else:
+        job = best_job()
+    qs = questions_for(job)
     print(qs)
-    print("\nPaste one answer below and press Ctrl+D (Linux/macOS) or Ctrl+Z (Windows) when done:\n")
+    q_no = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    print(f"\nPaste your answer to question {q_no} below and press Ctrl+D (Linux/macOS) or Ctrl+Z (Windows) when done:\n")
     try:
         ans = sys.stdin.read()
     except KeyboardInterrupt:
         raise SystemExit()
     if ans.strip():
-        q1 = qs.splitlines()[0]
+        lines = [l for l in qs.splitlines() if l.strip()]
+        question = lines[min(q_no, len(lines)) - 1]
         print("\nFeedback:")
-        print(score_answer(q1, ans.strip()))
+        for part in score_answer_stream(question, ans.strip()):
+            print(part, end="", flush=True)
+        print()
     else:
         print("No answer provided. Exiting.")
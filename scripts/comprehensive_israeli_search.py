@@ -5,12 +5,12 @@ Searches all top 50+ Israeli companies for all position types from boards.yaml.
 """
 
 import os
-import json
 import yaml
 import pathlib
 from datetime import date
 from dotenv import load_dotenv
 from scripts.utils import create_session, job_id
+from scripts.shards import write_shard
 
 load_dotenv()
 
@@ -245,12 +245,8 @@ def main():
     
     # Save results
     if unique_jobs:
-        jobs_file = ROOT / "data" / "processed" / "jobs.jsonl"
-        jobs_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(jobs_file, "a", encoding="utf-8") as f:
-            for job in unique_jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        # Write this source's shard; scripts/shards.py merges it into jobs.jsonl
+        jobs_file = write_shard("comprehensive_israeli", unique_jobs)
     
     print("=" * 60)
     print(f"✅ COMPREHENSIVE SEARCH COMPLETE")
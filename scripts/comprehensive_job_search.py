@@ -7,6 +7,7 @@ import json
 import pathlib
 from datetime import date
 from scripts.utils import job_id, create_session
+from scripts.shards import write_shard
 from bs4 import BeautifulSoup
 import re
 import time
@@ -259,11 +260,8 @@ def main():
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(unique_jobs, f, indent=2, ensure_ascii=False)
         
-        # Append to main jobs file
-        jobs_file = ROOT / "data" / "processed" / "jobs.jsonl"
-        with open(jobs_file, "a", encoding="utf-8") as f:
-            for job in unique_jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        # Write this source's shard; scripts/shards.py merges it into jobs.jsonl
+        write_shard("comprehensive", unique_jobs)
         
         print(f"\n[SUCCESS] Found {len(unique_jobs)} DevOps leadership roles across all platforms")
         print(f"[INFO] Searched {len(companies)} Israeli hitech companies")
@@ -1,12 +1,11 @@
-import os, json, yaml, pathlib, datetime
+import os, yaml, pathlib
 from dotenv import load_dotenv
-from scripts.utils import job_id, slug, now_iso, create_session, safe_get
+from scripts.utils import slug, now_iso, create_session, safe_get
+from scripts.shards import write_shard, shard_dir
 
 load_dotenv()
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 CFG = yaml.safe_load(open(ROOT / "configs" / "boards.yaml"))
-OUT_RAW = ROOT / "data" / "raw" / f"{datetime.date.today().isoformat()}.json"
-OUT_JL  = ROOT / "data" / "processed" / "jobs.jsonl"
 
 def greenhouse_company_jobs(company: str, session):
     url = f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
@@ -52,14 +51,14 @@ def location_matches(loc: str) -> bool:
 
 def main():
     session = create_session()
-    records = []
+    shards = {"greenhouse": [], "lever": []}
     # Greenhouse
     for comp in CFG.get("sources",{}).get("greenhouse",{}).get("companies",[]):
         try:
             for j in greenhouse_company_jobs(comp, session):
                 rec = normalize_gh(j)
                 if title_matches(rec["title"]) and location_matches(rec["location"]):
-                    records.append(rec)
+                    shards["greenhouse"].append(rec)
         except Exception as e:
             print(f"[WARN] greenhouse {comp}: {e}")
     # Lever
@@ -68,35 +67,15 @@ def main():
             for j in lever_company_jobs(comp, session):
                 rec = normalize_lever(j)
                 if title_matches(rec["title"]) and location_matches(rec["location"]):
-                    records.append(rec)
+                    shards["lever"].append(rec)
         except Exception as e:
             print(f"[WARN] lever {comp}: {e}")
 
-    # Dedupe
-    dedup = {}
-    for r in records:
-        k = r["title"].lower() + "|" + r["company"].lower() + "|" + (r["location"] or "").lower()
-        dedup[k] = r
-    records = list(dedup.values())
-
-    OUT_RAW.write_text(json.dumps(records, ensure_ascii=False, indent=2))
-    # Append to jobs.jsonl (idempotent-ish by URL)
-    seen = set()
-    if OUT_JL.exists():
-        with open(OUT_JL, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    item = json.loads(line)
-                    seen.add(item.get("url",""))
-                except:
-                    pass
-    with open(OUT_JL, "a", encoding="utf-8") as f:
-        for r in records:
-            if r["url"] in seen: 
-                continue
-            r["id"] = job_id(r)
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
-    print(f"[OK] Collected {len(records)} records. Saved to {OUT_RAW} and appended new to {OUT_JL}.")
+    # One shard per source; dedupe against jobs.jsonl happens in scripts/shards.py
+    for source, records in shards.items():
+        write_shard(source, records)
+    total = sum(len(r) for r in shards.values())
+    print(f"[OK] Collected {total} records into shards under {shard_dir()}. Run scripts/shards.py to merge.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,135 @@
+"""
+Adaptive revisit plan for crawl targets (one per source and company).
+
+Each target remembers how often a crawl turned up new matching postings and how
+often it failed. Targets that yield are revisited more often (the interval halves,
+down to CRAWL_MIN_INTERVAL_H); targets that come back with nothing new back off
+exponentially (the interval doubles, up to CRAWL_MAX_INTERVAL_H). Failures retry
+after 1, 2, 4 ... days without touching the interval. The plan is persisted in
+data/processed/crawl_plan.json and consulted by scripts/crawl_scheduler.py.
+"""
+
+import os
+import json
+import pathlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from scripts.embedding_store import text_hash
+from scripts.shards import dedupe_key
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+PLAN = ROOT / "data" / "processed" / "crawl_plan.json"
+
+MIN_INTERVAL_H = float(os.getenv("CRAWL_MIN_INTERVAL_H", "24"))
+MAX_INTERVAL_H = float(os.getenv("CRAWL_MAX_INTERVAL_H", str(24 * 30)))
+SLACK_H = 2.0        # a target due within this window counts as due (daily runs drift)
+YIELD_DECAY = 0.7    # weight of history in the per-crawl yield average
+SEEN_CAP = 500       # posting keys remembered per target to tell new from already seen
+
+def _parse(ts: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(ts) if ts else None
+    except ValueError:
+        return None
+
+class CrawlPlan:
+    def __init__(self, path: pathlib.Path = None):
+        self.path = path or PLAN
+        self.targets: Dict[str, Dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.targets = json.load(f).get("targets", {})
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def key(source: str, target_key: str) -> str:
+        return f"{source}:{target_key}"
+
+    def entry(self, source: str, target_key: str) -> Dict:
+        return self.targets.setdefault(self.key(source, target_key), {
+            "interval_h": MIN_INTERVAL_H, "next_due": None, "last_crawl": None,
+            "crawls": 0, "new": 0, "yield": 0.0, "failures": 0, "seen": [],
+        })
+
+    def is_due(self, source: str, target_key: str, now: datetime = None) -> bool:
+        e = self.targets.get(self.key(source, target_key))
+        due = _parse(e.get("next_due")) if e else None
+        return due is None or due <= (now or datetime.now()) + timedelta(hours=SLACK_H)
+
+    def due(self, source: str, targets: Iterable[Dict], now: datetime = None) -> List[Dict]:
+        """Targets due for a visit, best-yielding first (so budgets go to active boards)."""
+        now = now or datetime.now()
+        due = [t for t in targets if self.is_due(source, t["key"], now)]
+        def priority(t):
+            e = self.targets.get(self.key(source, t["key"]))
+            return -(e["yield"] if e else float("inf"))  # never crawled: first
+        return sorted(due, key=priority)
+
+    def record(self, source: str, target_key: str, ok: bool, records: Iterable[Dict] = (),
+               now: datetime = None) -> Dict:
+        """Update a target after a crawl and schedule its next visit."""
+        now = now or datetime.now()
+        e = self.entry(source, target_key)
+        e["last_crawl"] = now.isoformat(timespec="seconds")
+        if not ok:
+            e["failures"] += 1
+            retry_h = min(MAX_INTERVAL_H, 24.0 * 2 ** (e["failures"] - 1))
+            e["next_due"] = (now + timedelta(hours=retry_h)).isoformat(timespec="seconds")
+            return e
+
+        seen = set(e["seen"])
+        fresh = []
+        for rec in records:
+            h = text_hash(dedupe_key(rec))
+            if h not in seen:
+                seen.add(h)
+                fresh.append(h)
+        first = e["crawls"] == 0
+        e["crawls"] += 1
+        e["failures"] = 0
+        e["seen"] = (e["seen"] + fresh)[-SEEN_CAP:]
+        if not first:  # everything is "new" on the first visit
+            e["new"] += len(fresh)
+            e["yield"] = round(YIELD_DECAY * e["yield"] + (1 - YIELD_DECAY) * len(fresh), 4)
+            factor = 0.5 if fresh else 2.0
+            e["interval_h"] = max(MIN_INTERVAL_H, min(MAX_INTERVAL_H, e["interval_h"] * factor))
+        e["next_due"] = (now + timedelta(hours=e["interval_h"])).isoformat(timespec="seconds")
+        return e
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"updated": datetime.now().isoformat(timespec="seconds"), "targets": self.targets}, f)
+        os.replace(tmp, self.path)
+
+    def summary(self, now: datetime = None) -> Dict[str, Dict]:
+        """Per-source totals: targets, due now, new postings found, failing targets."""
+        now = now or datetime.now()
+        out: Dict[str, Dict] = {}
+        for key, e in self.targets.items():
+            source, _, target_key = key.partition(":")
+            s = out.setdefault(source, {"targets": 0, "due": 0, "new": 0, "failing": 0, "interval_h": 0.0})
+            s["targets"] += 1
+            s["due"] += self.is_due(source, target_key, now)
+            s["new"] += e["new"]
+            s["failing"] += e["failures"] > 0
+            s["interval_h"] += e["interval_h"]
+        for s in out.values():
+            s["interval_h"] = round(s["interval_h"] / s["targets"], 1)
+        return out
+
+def main():
+    """Show the crawl plan per source."""
+    plan = CrawlPlan()
+    if not plan.targets:
+        print("[INFO] No crawl plan yet; it is created by the first scheduled crawl")
+        return
+    print(f"{'source':<24} {'targets':>7} {'due':>5} {'new':>6} {'failing':>7} {'avg interval':>13}")
+    for source, s in sorted(plan.summary().items()):
+        print(f"{source:<24} {s['targets']:>7} {s['due']:>5} {s['new']:>6} {s['failing']:>7} "
+              f"{s['interval_h'] / 24:>11.1f} d")
+
+if __name__ == "__main__":
+    main()
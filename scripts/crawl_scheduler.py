@@ -0,0 +1,295 @@
+"""
+Concurrent crawl scheduler for the source plugins in scripts/sources.py.
+
+All targets of all sources share one worker pool, one HTTP session with per-host
+rate limits, an in-run response cache and a cross-source dedupe pass. Each source
+keeps its own concurrency cap, rate, target budget and timeout, and writes its own
+shard (data/raw/<date>/<source>.jsonl) for scripts/shards.py to merge.
+"""
+
+import os
+import json
+import time
+import threading
+import pathlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+from scripts.utils import create_session, RateLimiter
+from scripts.embedding_store import text_hash
+from scripts.shards import write_shard, dedupe_key, shard_dir
+from scripts.sources import Source, get_sources
+from scripts.crawl_planner import CrawlPlan
+
+load_dotenv()
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "8"))
+HOST_RATE = float(os.getenv("CRAWL_HOST_RATE", "4"))  # requests per second per host, across sources
+ADAPTIVE = os.getenv("CRAWL_ADAPTIVE", "1") != "0"    # follow data/processed/crawl_plan.json
+HTTP_CACHE = ROOT / "data" / "processed" / "http_cache"  # bodies + ETag/Last-Modified per URL
+
+_stats_lock = threading.Lock()
+
+def _count(stats: Dict, key: str, n: int = 1):
+    with _stats_lock:
+        stats[key] += n
+
+class Http:
+    """Thread-safe GETs shared by all sources: per-host rate limits, an in-run response
+    cache and, for sources that opt in, a persistent cache revalidated with ETag/Last-Modified."""
+
+    def __init__(self, session=None, host_rate: float = HOST_RATE, cache_dir: pathlib.Path = None):
+        self.session = session or create_session()
+        self.host_rate = host_rate
+        self.cache_dir = cache_dir or HTTP_CACHE
+        self.requests = 0
+        self.cache_hits = 0
+        self.not_modified = 0
+        self._hosts: Dict[str, RateLimiter] = {}
+        self._cache: Dict[str, object] = {}
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, host: str) -> RateLimiter:
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = RateLimiter(self.host_rate)
+            return self._hosts[host]
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout: float = 20, headers: Optional[Dict] = None):
+        self.limiter(urlsplit(url).netloc).wait()
+        with self._lock:
+            self.requests += 1
+        kwargs = {"headers": headers} if headers else {}
+        r = self.session.get(url, params=params, timeout=timeout, **kwargs)
+        r.raise_for_status()
+        return r
+
+    def render(self, url: str, timeout: Optional[float] = None):
+        """A page after JavaScript ran, via the shared rendering pool (scripts/render.py)."""
+        from scripts import render
+        self.limiter(urlsplit(url).netloc).wait()
+        with self._lock:
+            self.requests += 1
+        return render.pool().render(url, timeout)
+
+    def _revalidate(self, key: str, url: str, params: Optional[Dict], timeout: float):
+        """Conditional GET against the on-disk copy; a 304 reuses the stored body."""
+        path = self.cache_dir / f"{text_hash(key)}.json"
+        cached = None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            pass
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        r = self.get(url, params, timeout, headers)
+        if r.status_code == 304 and cached:
+            with self._lock:
+                self.not_modified += 1
+            return cached["body"]
+        body = r.json()
+        etag, modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+        if etag or modified:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"url": key, "etag": etag, "last_modified": modified, "body": body}, f)
+            os.replace(tmp, path)
+        return body
+
+    def get_json(self, url: str, params: Optional[Dict] = None, timeout: float = 20, revalidate: bool = False):
+        """Decoded JSON for a URL, fetched at most once per run even if several sources ask.
+
+        With revalidate, the last response is kept on disk and re-requested conditionally.
+        """
+        key = url + "?" + "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        while True:
+            with self._lock:
+                if key in self._cache:
+                    self.cache_hits += 1
+                    return self._cache[key]
+                event = self._inflight.get(key)
+                if event is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            event.wait()  # another worker is fetching it; its result lands in the cache
+            with self._lock:
+                if key not in self._cache:
+                    raise RuntimeError(f"shared fetch of {url} failed")
+        try:
+            if revalidate:
+                payload = self._revalidate(key, url, params, timeout)
+            else:
+                payload = self.get(url, params, timeout).json()
+            with self._lock:
+                self._cache[key] = payload
+            return payload
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+def _crawl_target(source: Source, target: Dict, http: Http, limiter: RateLimiter, stats: Dict):
+    """(ok, matching records) for one target."""
+    limiter.wait()
+    try:
+        payload = source.fetch(target, http)
+        records = []
+        for item in source.parse(target, payload):
+            rec = source.normalize(target, item)
+            if rec and source.keep(rec):
+                records.append(rec)
+    except Exception as e:
+        _count(stats, "failed")
+        print(f"[WARN] {source.name} {target.get('key')}: {e}")
+        return False, []
+    _count(stats, "fetched")
+    return True, records
+
+def _lane(source: Source, queue: deque, http: Http, limiter: RateLimiter, deadline: float,
+          stats: Dict, out: List):
+    """One of a source's `concurrency` workers: takes its targets one at a time until the deadline."""
+    while True:
+        try:
+            target = queue.popleft()
+        except IndexError:
+            return
+        if time.monotonic() > deadline:
+            _count(stats, "skipped", 1 + len(queue))
+            queue.clear()
+            return
+        ok, records = _crawl_target(source, target, http, limiter, stats)
+        out.append((target["key"], ok, records))
+
+def crawl(sources: Iterable[Source], http: Optional[Http] = None, concurrency: int = CONCURRENCY,
+          plan: Optional[CrawlPlan] = None):
+    """Crawl all sources concurrently; returns ({source: deduped records}, {source: stats}).
+
+    With a plan, only targets due for a revisit are crawled and the outcomes are
+    recorded back into it.
+    """
+    sources = list(sources)
+    http = http or Http()
+    started = time.monotonic()
+    stats = {s.name: {"targets": 0, "fetched": 0, "failed": 0, "skipped": 0, "deferred": 0,
+                      "records": 0, "duplicates": 0, "seconds": 0.0} for s in sources}
+    queues, results, lanes = {}, {}, {}
+    limiters = {s.name: RateLimiter(s.rate) for s in sources}
+
+    for s in sources:
+        try:
+            targets = list(s.discover())
+        except Exception as e:
+            print(f"[WARN] {s.name}: discovery failed: {e}")
+            stats[s.name]["failed"] += 1
+            targets = []
+        if plan is not None:
+            due = plan.due(s.name, targets)
+            stats[s.name]["deferred"] = len(targets) - len(due)
+            targets = due
+        if len(targets) > s.budget:
+            print(f"[INFO] {s.name}: {len(targets)} targets, budget {s.budget}; skipping the rest")
+            stats[s.name]["skipped"] += len(targets) - s.budget
+            targets = targets[: s.budget]
+        stats[s.name]["targets"] = len(targets)
+        queues[s.name] = deque(targets)
+        results[s.name] = []
+        lanes[s.name] = []
+
+    # Lanes are submitted round-robin, so every source starts right away and a
+    # source with many targets never holds more than `concurrency` pool workers
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        for i in range(max((s.concurrency for s in sources), default=0)):
+            for s in sources:
+                if i < max(1, s.concurrency) and i < stats[s.name]["targets"]:
+                    lanes[s.name].append(pool.submit(
+                        _lane, s, queues[s.name], http, limiters[s.name], started + s.timeout,
+                        stats[s.name], results[s.name]))
+
+        # Wait for each source up to its deadline plus a grace period for requests
+        # already in flight; stragglers are abandoned, not awaited
+        for s in sources:
+            remaining = max(0.0, started + s.timeout - time.monotonic()) + 30
+            _, pending = wait(lanes[s.name], timeout=remaining)
+            if pending:
+                print(f"[WARN] {s.name}: {len(pending)} workers still running at timeout; dropped")
+                _count(stats[s.name], "skipped", len(queues[s.name]))
+                queues[s.name].clear()
+            results[s.name] = list(results[s.name])  # snapshot; abandoned workers may still append
+            stats[s.name]["seconds"] = round(time.monotonic() - started, 2)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if plan is not None:
+        for s in sources:
+            for key, ok, records in results[s.name]:
+                plan.record(s.name, key, ok, records)
+
+    # Cross-source dedupe in registry order, so the outcome does not depend on timing
+    seen = set()
+    collected = {}
+    for s in sources:
+        unique = []
+        for rec in (rec for _, _, records in results[s.name] for rec in records):
+            key = dedupe_key(rec)
+            if key in seen:
+                stats[s.name]["duplicates"] += 1
+                continue
+            seen.add(key)
+            unique.append(rec)
+        stats[s.name]["records"] = len(unique)
+        collected[s.name] = unique
+    return collected, stats
+
+def run(sources: Iterable[Source], http: Optional[Http] = None, concurrency: int = CONCURRENCY,
+        write: bool = True, plan: Optional[CrawlPlan] = None) -> Dict[str, Dict]:
+    """Crawl, write one shard per source and save the plan; returns per-source stats."""
+    sources = list(sources)
+    http = http or Http()
+    collected, stats = crawl(sources, http, concurrency, plan)
+    if write:
+        for s in sources:
+            # A source that failed everywhere keeps yesterday's view instead of an empty shard
+            if collected[s.name] or not stats[s.name]["failed"]:
+                write_shard(s.name, collected[s.name])
+        if plan is not None:
+            plan.save()
+
+    for s in sources:
+        st = stats[s.name]
+        print(f"[CRAWL] {s.name}: {st['fetched']}/{st['targets']} targets ({st['deferred']} not due), {st['failed']} failed, "
+              f"{st['skipped']} skipped, {st['records']} records ({st['duplicates']} duplicates) in {st['seconds']}s")
+    print(f"[INFO] {http.requests} HTTP requests ({http.not_modified} not modified), "
+          f"{http.cache_hits} served from the run cache")
+    return stats
+
+def main():
+    """Crawl every enabled source (or `python scripts/crawl_scheduler.py <source> ...`)."""
+    import sys
+    from scripts.sources import SOURCES
+    if "--list" in sys.argv:
+        for name, s in SOURCES.items():
+            print(f"{name:<24} {'enabled' if s.enabled else 'disabled':<8}  rate={s.rate}/s "
+                  f"concurrency={s.concurrency} budget={s.budget} timeout={s.timeout:.0f}s")
+        return
+    # --all ignores the revisit plan (and does not update it)
+    names = [a for a in sys.argv[1:] if not a.startswith("--")]
+    plan = CrawlPlan() if ADAPTIVE and "--all" not in sys.argv else None
+    try:
+        stats = run(get_sources(names), plan=plan)
+    finally:
+        from scripts import render
+        render.close_pool()
+    total = sum(st["records"] for st in stats.values())
+    print(f"[OK] Collected {total} records from {len(stats)} sources into {shard_dir()}. Run scripts/shards.py to merge.")
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ This runs on cron schedule or when triggered by Telegram /search command.
 
 import os
 import sys
+import json
 import pathlib
 import subprocess
 from datetime import datetime
@@ -15,6 +16,9 @@ load_dotenv()
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 
+# Sources time out after Source.timeout (300s) plus a grace period for requests in flight
+CRAWL_TIMEOUT = 600
+
 class PipelineDeployer:
     def __init__(self):
         self.start_time = datetime.now()
@@ -26,7 +30,8 @@ class PipelineDeployer:
             "jobs_sent_to_telegram": 0
         }
     
-    def run_step(self, step_name: str, script_path: str, description: str):
+    def run_step(self, step_name: str, script_path: str, description: str, args: list = None,
+                 timeout: int = 300):
         """Run a single pipeline step and track results."""
         print(f"\n🔄 {step_name}")
         print(f"   {description}")
@@ -38,8 +43,8 @@ class PipelineDeployer:
             env["PYTHONPATH"] = str(ROOT)
             
             result = subprocess.run([
-                sys.executable, script_path
-            ], cwd=ROOT, env=env, capture_output=True, text=True, timeout=300)
+                sys.executable, script_path, *(args or [])
+            ], cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout)
             
             if result.returncode == 0:
                 print(f"   ✅ {step_name} completed successfully")
@@ -60,11 +65,11 @@ class PipelineDeployer:
                 return False
                 
         except subprocess.TimeoutExpired:
-            print(f"   ⏰ {step_name} timed out (5 minutes)")
+            print(f"   ⏰ {step_name} timed out ({timeout // 60} minutes)")
             self.results["steps_failed"].append({
                 "name": step_name,
                 "script": script_path,
-                "error": "Timeout after 5 minutes"
+                "error": f"Timeout after {timeout // 60} minutes"
             })
             return False
         except Exception as e:
@@ -83,84 +88,50 @@ class PipelineDeployer:
         print(f"Started at: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 60)
         
-        # Step 1: Search Greenhouse/Lever APIs
-        self.run_step(
-            "API Search",
-            "scripts/crawl.py", 
-            "Search Greenhouse and Lever job board APIs"
-        )
-        
-        # Step 2: Search comprehensive sources
-        self.run_step(
-            "Comprehensive Search",
-            "scripts/real_job_finder.py",
-            "Search additional verified job sources"
-        )
-        
-        # Step 3: Add known real jobs
-        self.run_step(
-            "Known Jobs",
-            "scripts/add_known_jobs.py",
-            "Add manually verified real positions"
-        )
-        
-        # Step 4: Search verified positions
-        self.run_step(
-            "Verified Positions",
-            "scripts/real_verified_jobs.py",
-            "Search verified real job positions"
-        )
-        
-        # Step 5: Search Israeli sources
-        self.run_step(
-            "Israeli Sources",
-            "scripts/israeli_job_sources.py",
-            "Search Israeli job boards and company sources"
-        )
-        
-        # Step 6: Run job board workarounds
+        # Step 1: Crawl every enabled source concurrently (scripts/sources.py), one shard each
         self.run_step(
-            "Workaround Sources",
-            "scripts/job_board_workarounds.py",
-            "Use workarounds for blocked job boards"
+            "Crawl Sources",
+            "scripts/crawl_scheduler.py",
+            "Every enabled source in scripts/sources.py (python scripts/crawl_scheduler.py --list)",
+            timeout=CRAWL_TIMEOUT
         )
         
-        # Step 7: Search career pages
+        # Step 2: Merge per-source shards into jobs.jsonl
         self.run_step(
-            "Career Pages",
-            "scripts/career_page_scraper.py",
-            "Search company career pages directly"
+            "Merge Shards",
+            "scripts/shards.py",
+            "K-way merge of today's source shards into jobs.jsonl"
         )
         
-        # Step 8: Deduplicate
+        # Step 3: Deduplicate
         self.run_step(
             "Deduplication",
             "scripts/deduplicate_jobs.py",
             "Remove duplicates and filter unwanted roles"
         )
         
-        # Step 9: Update job ages
+        # Step 4: Update job ages
         self.run_step(
             "Job Tracking",
             "scripts/job_tracker.py",
             "Update job age information"
         )
         
-        # Step 10: Learn from user feedback
+        # Step 5: Learn from user feedback
         self.run_step(
             "Learning System",
             "scripts/learning_system.py",
             "Analyze user feedback patterns to improve matching"
         )
         
-        # Step 11: Score jobs (with learning adjustments)
+        # Step 6: Score jobs (with learning adjustments)
         self.run_step(
             "Job Scoring",
             "scripts/score.py",
             "Score jobs against user profile using AI + learned preferences"
         )
         
-        # Step 11: Send digest
+        # Step 7: Send digest
         digest_success = self.run_step(
             "Send Digest",
             "scripts/digest.py",
@@ -177,7 +148,9 @@ class PipelineDeployer:
         print("=" * 60)
         
         # Quick pipeline - just essential steps
-        self.run_step("API Search", "scripts/crawl.py", "Quick Greenhouse/Lever search")
+        self.run_step("API Search", "scripts/crawl_scheduler.py", "Quick Greenhouse/Lever search",
+                      args=["greenhouse", "lever"], timeout=CRAWL_TIMEOUT)
+        self.run_step("Merge Shards", "scripts/shards.py", "Merge source shards into jobs.jsonl")
         self.run_step("Deduplication", "scripts/deduplicate_jobs.py", "Clean up results")
         self.run_step("Job Scoring", "scripts/score.py", "Score jobs")
         self.run_step("Send Digest", "scripts/digest.py", "Send to Telegram")
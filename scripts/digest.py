@@ -3,6 +3,7 @@ from dotenv import load_dotenv
 from scripts.utils import create_session, safe_get
 from scripts.job_state import job_state
 from scripts.telegram_bot import telegram_bot
+from scripts.network import warm_intros
 
 load_dotenv()
 ROOT = pathlib.Path(__file__).resolve().parents[1]
@@ -30,35 +31,58 @@ def send_telegram(text: str):
         print("Digest content:")
         print(text)
 
-def main():
-    # Load all scored jobs
-    rows = []
-    with open(SCORES, "r", encoding="utf-8") as f:
+def select_digest(path=None, threshold=None, limit=None):
+    """Stream scores once: the best `limit` unsent rows above threshold plus status counts.
+
+    scores.jsonl is written best-first (by score or fused rank), so the first unsent
+    rows are the best ones; once `limit` are kept the rest of the file is only counted.
+    """
+    threshold = THRESHOLD if threshold is None else threshold
+    limit = MAX_ITEMS if limit is None else limit
+    counts = {"above": 0, "unsent": 0, "applied": 0, "ignored": 0, "sent": 0}
+    picked = []
+    with open(path or SCORES, "r", encoding="utf-8") as f:
         for line in f:
             try:
-                rows.append(json.loads(line))
+                r = json.loads(line)
             except:
-                pass
-    
-    # Filter by score threshold
-    rows = [r for r in rows if r.get("score",0) >= THRESHOLD]
-    
-    # Filter out jobs that were already sent, applied to, or ignored
-    unsent_rows = job_state.get_unsent_jobs(rows)
+                continue
+            # Offline BM25-only rows have no score on the threshold's scale
+            if r.get("score", 0) < threshold or r.get("lexical_only"):
+                continue
+            counts["above"] += 1
+            jid = r.get("id", "")
+            applied = job_state.is_applied(jid)
+            ignored = job_state.is_ignored(jid)
+            sent = job_state.was_sent_to_telegram(jid)
+            counts["applied"] += applied
+            counts["ignored"] += ignored
+            counts["sent"] += sent
+            if not jid or applied or ignored or sent:
+                continue
+            counts["unsent"] += 1
+            if len(picked) < limit:
+                picked.append(r)
+    return picked, counts
+
+def main():
+    # One pass over all scored jobs: threshold filter, state lookups, first DIGEST_MAX unsent rows
+    unsent_rows, counts = select_digest()
+    above = counts["above"]
     
     if not unsent_rows:
         # Check if there were any jobs above threshold at all
-        if not rows:
+        if not above:
             send_telegram("No matches above threshold today. Try lowering SCORE_THRESHOLD.")
         else:
             # Send notification about no new jobs
             message = f"✅ <b>Daily Job Search Complete</b>\n\n"
-            message += f"📊 Found {len(rows)} job{'s' if len(rows) != 1 else ''} above threshold, but all already processed:\n"
+            message += f"📊 Found {above} job{'s' if above != 1 else ''} above threshold, but all already processed:\n"
             
             # Count by status
-            applied_count = sum(1 for job in rows if job_state.is_applied(job.get('id', '')))
-            ignored_count = sum(1 for job in rows if job_state.is_ignored(job.get('id', '')))
-            sent_count = sum(1 for job in rows if job_state.was_sent_to_telegram(job.get('id', '')))
+            applied_count = counts["applied"]
+            ignored_count = counts["ignored"]
+            sent_count = counts["sent"]
             
             if applied_count > 0:
                 message += f"• ✅ {applied_count} already applied to\n"
@@ -69,18 +93,25 @@ def main():
             
             message += f"\n🔍 <i>No new opportunities today - I'll keep searching!</i>"
             send_telegram(message)
-            print(f"[INFO] Found {len(rows)} jobs above threshold, but all were already sent/applied/ignored")
+            print(f"[INFO] Found {above} jobs above threshold, but all were already sent/applied/ignored")
         return
     
-    # Limit to MAX_ITEMS
-    unsent_rows = unsent_rows[:MAX_ITEMS]
-    
     # Send processing notification
     if unsent_rows:
         processing_msg = f"🔄 <b>Processing {len(unsent_rows)} new job match{'es' if len(unsent_rows) != 1 else ''}...</b>\n"
-        processing_msg += f"<i>Found {len(rows)} total jobs above threshold, sending {len(unsent_rows)} new ones</i>"
+        processing_msg += f"<i>Found {above} total jobs above threshold, sending {len(unsent_rows)} new ones</i>"
         telegram_bot.send_message(processing_msg)
     
+    # Warm-intro candidates for every company in the digest, one index lookup pass
+    try:
+        intros = warm_intros(r.get("company", "") for r in unsent_rows)
+    except Exception as e:
+        print(f"[WARN] Connections lookup failed: {e}")
+        intros = {}
+    for r in unsent_rows:
+        if intros.get(r.get("company")):
+            r["intros"] = intros[r["company"]]
+    
     # Send interactive digest using new telegram bot
     telegram_bot.send_job_digest(unsent_rows)
     
@@ -89,8 +120,8 @@ def main():
         summary_msg = f"✅ <b>Job Digest Complete!</b>\n\n"
         summary_msg += f"📊 <b>Summary:</b>\n"
         summary_msg += f"• {len(unsent_rows)} new jobs sent\n"
-        summary_msg += f"• {len(rows) - len(unsent_rows)} jobs already seen/processed\n"
-        summary_msg += f"• {len(rows)} total jobs above score threshold\n\n"
+        summary_msg += f"• {above - len(unsent_rows)} jobs already seen/processed\n"
+        summary_msg += f"• {above} total jobs above score threshold\n\n"
         summary_msg += f"💡 <b>Next Steps:</b>\n"
         summary_msg += f"• Click 🔗 <i>Apply Now</i> to open job applications\n"
         summary_msg += f"• Click ✅ <i>Mark Applied</i> after applying\n"
@@ -98,7 +129,7 @@ def main():
         summary_msg += f"🤖 I'll remember your choices and won't show these jobs again!"
         telegram_bot.send_message(summary_msg)
     
-    print(f"[OK] Sent {len(unsent_rows)} new jobs to Telegram (out of {len(rows)} total above threshold)")
+    print(f"[OK] Sent {len(unsent_rows)} new jobs to Telegram (out of {above} total above threshold)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,122 @@
+"""
+DNS resolution cache for company domain probes.
+
+Career page probing guesses hosts ({company}.com, www., careers., jobs. ...) and
+many of them do not exist; each such probe used to cost a resolver round trip and
+often a connect timeout. Hosts are resolved in parallel up front (prewarm), and
+the verdicts are cached in data/processed/dns_cache.json: existing hosts for
+DNS_TTL_H hours, nonexistent ones (NXDOMAIN) for DNS_NEGATIVE_TTL_H hours, so
+later probes skip dead hosts before any TCP connect. Transient resolver failures
+are not cached and count as "exists" (the request itself will tell).
+"""
+
+import os
+import json
+import time
+import socket
+import pathlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+DNS_CACHE = ROOT / "data" / "processed" / "dns_cache.json"
+
+TTL_H = float(os.getenv("DNS_TTL_H", "12"))
+NEGATIVE_TTL_H = float(os.getenv("DNS_NEGATIVE_TTL_H", str(24 * 7)))
+WORKERS = int(os.getenv("DNS_WORKERS", "32"))
+
+# gaierror codes meaning "this name does not exist" (EAI_NODATA is missing on some platforms)
+NXDOMAIN = {getattr(socket, name) for name in ("EAI_NONAME", "EAI_NODATA") if hasattr(socket, name)}
+
+def _getaddrinfo(host: str) -> List[str]:
+    return sorted({info[4][0] for info in socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)})
+
+def host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+class DnsCache:
+    def __init__(self, path: pathlib.Path = None, ttl_h: float = TTL_H, negative_ttl_h: float = NEGATIVE_TTL_H,
+                 resolver: Callable[[str], List[str]] = None):
+        self.path = path or DNS_CACHE
+        self.ttl = ttl_h * 3600
+        self.negative_ttl = negative_ttl_h * 3600
+        self.resolver = resolver or _getaddrinfo
+        self.hosts: Dict[str, Dict] = {}
+        self.lookups = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.hosts = json.load(f).get("hosts", {})
+        except (OSError, ValueError):
+            pass
+
+    def cached(self, host: str, now: Optional[float] = None) -> Optional[bool]:
+        """True/False while a verdict for the host is fresh, else None."""
+        e = self.hosts.get(host.lower())
+        if not e:
+            return None
+        age = (now or time.time()) - e["at"]
+        if age >= (self.ttl if e["addrs"] else self.negative_ttl):
+            return None
+        return bool(e["addrs"])
+
+    def resolve(self, host: str) -> bool:
+        """Whether the host exists, from the cache or a fresh lookup."""
+        host = host.lower()
+        with self._lock:
+            verdict = self.cached(host)
+            if verdict is not None:
+                self.hits += 1
+                return verdict
+            self.lookups += 1
+        try:
+            addrs = self.resolver(host)
+        except socket.gaierror as e:
+            if e.errno not in NXDOMAIN:
+                return True  # resolver trouble, not an answer: don't cache, let the request try
+            addrs = []
+        except (OSError, UnicodeError):
+            return True
+        with self._lock:
+            self.hosts[host] = {"addrs": addrs, "at": time.time()}
+        return bool(addrs)
+
+    def prewarm(self, hosts: Iterable[str], workers: int = WORKERS) -> Dict[str, bool]:
+        """Resolve many hosts in parallel (cached ones are free) and save the cache."""
+        hosts = sorted({h.lower() for h in hosts if h})
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(hosts) or 1))) as pool:
+            verdicts = dict(zip(hosts, pool.map(self.resolve, hosts)))
+        self.save()
+        return verdicts
+
+    def filter_urls(self, urls: Iterable[str]) -> List[str]:
+        """The URLs whose host resolves (resolving all hosts up front, in parallel)."""
+        urls = list(urls)
+        verdicts = self.prewarm(host_of(u) for u in urls)
+        return [u for u in urls if verdicts.get(host_of(u), True)]
+
+    def save(self):
+        with self._lock:
+            now = time.time()
+            keep = max(self.ttl, self.negative_ttl)
+            self.hosts = {h: e for h, e in self.hosts.items() if now - e["at"] < keep}
+            data = {"hosts": self.hosts}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".tmp{threading.get_ident()}")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def cache() -> DnsCache:
+    """Process-wide cache shared by the sync scrapers and the async engine."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DnsCache()
+        return _cache
@@ -0,0 +1,126 @@
+"""
+On-disk embedding matrix for scored jobs.
+
+Embeddings live in a single `.npy` matrix (float16 by default, float32 via
+EMBEDDING_DTYPE) that is memory-mapped rather than loaded, plus a small JSON
+index mapping job id -> (row, text hash). Rows are preallocated in doubling
+chunks, so appending is cheap and the file is always a valid `.npy`. A job is
+re-embedded only when its text hash or the embedding model changes.
+"""
+
+import os
+import json
+import hashlib
+import pathlib
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+EMBEDDINGS = ROOT / "outputs" / "embeddings.npy"
+EMBEDDINGS_INDEX = ROOT / "outputs" / "embeddings_index.json"
+
+DTYPE = os.getenv("EMBEDDING_DTYPE", "float16")
+MIN_CAPACITY = 1024
+
+def text_hash(text: str) -> str:
+    """Short content hash used to detect changed job text."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+class EmbeddingStore:
+    def __init__(self, model: str, path: pathlib.Path = None, index_path: pathlib.Path = None,
+                 dtype: str = None):
+        self.path = pathlib.Path(path or EMBEDDINGS)
+        self.index_path = pathlib.Path(index_path or EMBEDDINGS_INDEX)
+        self.model = model
+        self.dtype = np.dtype(dtype or DTYPE)
+        self.dim = 0
+        self.rows = 0
+        self.ids: Dict[str, List] = {}  # id -> [row, text_hash]
+        self.matrix = None
+        self._dirty = False
+
+        if self.index_path.exists() and self.path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                idx = json.load(f)
+            if idx.get("model") == model:
+                self.matrix = np.load(self.path, mmap_mode="r+")
+                self.dtype = self.matrix.dtype
+                self.dim = int(idx["dim"])
+                self.rows = int(idx["rows"])
+                self.ids = idx["ids"]
+            else:
+                print(f"[EMBED] Stored embeddings are for {idx.get('model')}; starting a new store for {model}")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, job_id: str):
+        return job_id in self.ids
+
+    def __getitem__(self, job_id: str):
+        """float32 vector for a job id (reads one row from the memmap)."""
+        return np.asarray(self.matrix[self.ids[job_id][0]], dtype=np.float32)
+
+    def lookup(self, job_id: str, text_hash: str) -> Optional[int]:
+        """Row holding the embedding of this exact job text, if any."""
+        entry = self.ids.get(job_id)
+        if entry and entry[1] == text_hash:
+            return entry[0]
+        return None
+
+    def get_many(self, job_ids: Iterable[str]):
+        """float32 matrix of the given jobs' embeddings, in order."""
+        rows = [self.ids[j][0] for j in job_ids]
+        return np.asarray(self.matrix[rows], dtype=np.float32)
+
+    def view(self):
+        """Memory-mapped view of all used rows (no copy)."""
+        if self.matrix is None:
+            return np.zeros((0, self.dim), dtype=self.dtype)
+        return self.matrix[:self.rows]
+
+    def _ensure_capacity(self, rows: int):
+        capacity = 0 if self.matrix is None else self.matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(MIN_CAPACITY, capacity * 2, rows)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.stem + ".tmp.npy")
+        grown = np.lib.format.open_memmap(tmp, mode="w+", dtype=self.dtype, shape=(new_capacity, self.dim))
+        if self.rows:
+            grown[:self.rows] = self.matrix[:self.rows]
+        grown.flush()
+        del grown
+        self.matrix = None
+        os.replace(tmp, self.path)
+        self.matrix = np.load(self.path, mmap_mode="r+")
+
+    def put(self, job_id: str, text_hash: str, vector):
+        """Store (or replace) a job's embedding."""
+        vector = np.asarray(vector, dtype=np.float32)
+        if not self.dim:
+            self.dim = vector.shape[0]
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Embedding size {vector.shape[0]} does not match store size {self.dim}")
+        entry = self.ids.get(job_id)
+        if entry:
+            row = entry[0]
+        else:
+            row = self.rows
+            self._ensure_capacity(row + 1)
+            self.rows += 1
+        self.matrix[row] = vector.astype(self.dtype)
+        self.ids[job_id] = [row, text_hash]
+        self._dirty = True
+
+    def save(self):
+        """Flush the matrix and atomically write the id index."""
+        if not self._dirty:
+            return
+        self.matrix.flush()
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "dim": self.dim, "dtype": self.dtype.name,
+                       "rows": self.rows, "ids": self.ids}, f)
+        os.replace(tmp, self.index_path)
+        self._dirty = False
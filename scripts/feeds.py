@@ -0,0 +1,89 @@
+"""
+Conditional RSS polling with entry-level dedupe.
+
+Each feed keeps its ETag/Last-Modified (sent back to the server, so an unchanged
+feed costs one 304) and a set of entry GUIDs already processed, each expiring
+after FEED_SEEN_TTL_DAYS. poll() returns only entries not seen before, so keyword
+matching runs on new entries only. State lives in data/processed/feed_state.json.
+"""
+
+import os
+import json
+import pathlib
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import feedparser
+from scripts.embedding_store import text_hash
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+FEED_STATE = ROOT / "data" / "processed" / "feed_state.json"
+
+SEEN_TTL_DAYS = int(os.getenv("FEED_SEEN_TTL_DAYS", "30"))
+
+def entry_guid(entry) -> str:
+    """Stable id of a feed entry: its GUID, else its link, else its title."""
+    return text_hash(entry.get("id") or entry.get("link") or entry.get("title", ""))
+
+class FeedPoller:
+    def __init__(self, path: pathlib.Path = None, ttl_days: int = SEEN_TTL_DAYS):
+        self.path = path or FEED_STATE
+        self.ttl = timedelta(days=ttl_days)
+        self.feeds: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.feeds = json.load(f).get("feeds", {})
+        except (OSError, ValueError):
+            pass
+
+    def poll(self, url: str, limit: Optional[int] = None, now: datetime = None) -> Tuple[List, Dict]:
+        """(new entries, {"status", "entries", "new"}) for a feed; the state is saved afterwards.
+
+        `limit` keeps only the first (most recent) entries of the feed, as before.
+        """
+        now = now or datetime.now()
+        with self._lock:
+            state = self.feeds.setdefault(url, {"etag": None, "modified": None, "seen": {}})
+            etag, modified = state["etag"], state["modified"]
+
+        feed = feedparser.parse(url, etag=etag, modified=modified)
+        status = feed.get("status", 200 if feed.entries else None)
+        if feed.get("bozo") and not feed.entries and status != 304:
+            raise RuntimeError(f"feed unavailable: {feed.get('bozo_exception') or status}")
+
+        entries = list(feed.entries[:limit] if limit else feed.entries)
+        with self._lock:
+            if status != 304:
+                state["etag"] = feed.get("etag") or None
+                state["modified"] = feed.get("modified") or None
+            cutoff = (now - self.ttl).isoformat(timespec="seconds")
+            seen = {g: ts for g, ts in state["seen"].items() if ts >= cutoff}
+            fresh = []
+            for e in entries:
+                guid = entry_guid(e)
+                if guid not in seen:
+                    fresh.append(e)
+                seen[guid] = now.isoformat(timespec="seconds")  # still in the feed: keep it alive
+            state["seen"] = seen
+            state["last_poll"] = now.isoformat(timespec="seconds")
+            self._save()
+        return fresh, {"status": status, "entries": len(entries), "new": len(fresh)}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"feeds": self.feeds}, f)
+        os.replace(tmp, self.path)
+
+_poller = None
+_poller_lock = threading.Lock()
+
+def poller() -> FeedPoller:
+    """Process-wide poller, shared by every feed source (they may run concurrently)."""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = FeedPoller()
+        return _poller
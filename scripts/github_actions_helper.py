@@ -14,7 +14,15 @@ ROOT = pathlib.Path(__file__).resolve().parents[1]
 STATE_FILES = [
     "data/processed/job_state.json",
     "data/processed/job_tracker.json",
-    "data/processed/jobs.jsonl"
+    "data/processed/jobs.jsonl",
+    "data/processed/preference_vectors.npz",
+    "data/processed/notion_ledger.json",
+    "data/processed/crawl_plan.json",
+    "data/processed/feed_state.json",
+    "data/processed/ats_map.json",
+    "data/processed/dns_cache.json",
+    "outputs/scores.jsonl",
+    "outputs/scores_meta.json"
 ]
 
 def setup_git_config():
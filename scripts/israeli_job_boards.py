@@ -5,11 +5,11 @@ Uses direct web scraping since RSS feeds are broken.
 """
 
 import requests
-import json
 import pathlib
 from datetime import date
 from bs4 import BeautifulSoup
 from scripts.utils import create_session, job_id
+from scripts.shards import write_shard
 import yaml
 import time
 import urllib.parse
@@ -284,12 +284,8 @@ def main():
     
     # Save results
     if unique_jobs:
-        jobs_file = ROOT / "data" / "processed" / "jobs.jsonl"
-        jobs_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(jobs_file, "a", encoding="utf-8") as f:
-            for job in unique_jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        # Write this source's shard; scripts/shards.py merges it into jobs.jsonl
+        write_shard("israeli_job_boards", unique_jobs)
     
     print("=" * 50)
     print(f"✅ ISRAELI JOB BOARDS SEARCH COMPLETE")
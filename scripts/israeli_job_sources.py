@@ -8,11 +8,12 @@ import json
 from datetime import date
 import pathlib
 from scripts.utils import create_session, job_id
+from scripts.shards import write_shard
 from bs4 import BeautifulSoup
 import re
 import time
 from urllib.parse import quote_plus, urljoin
-import feedparser
+from scripts import feeds
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 
@@ -65,10 +66,14 @@ def search_alljobs():
         
         # Try RSS feed first
         rss_url = "https://www.alljobs.co.il/rss/jobs.aspx?region=2,3,4&category=2"
-        
+        feed_ok = False
+
         try:
-            feed = feedparser.parse(rss_url)
-            for entry in feed.entries[:20]:  # Limit to 20 most recent
+            # Only entries not seen in earlier runs; an unchanged feed is a single 304
+            entries, info = feeds.poller().poll(rss_url, limit=20)  # Limit to 20 most recent
+            feed_ok = True
+            print(f"[ALLJOBS] RSS: {info['new']} new of {info['entries']} entries (HTTP {info['status']})")
+            for entry in entries:
                 title = entry.title
                 if any(keyword.lower() in title.lower() for keyword in DEVOPS_KEYWORDS_ENGLISH):
                     job = {
@@ -92,7 +97,7 @@ def search_alljobs():
             print(f"[ALLJOBS] RSS feed error: {e}")
             
         # Fallback to web scraping if RSS fails
-        if not jobs:
+        if not feed_ok:
             search_url = "https://www.alljobs.co.il/SearchResultsGuest.aspx"
             for keyword in DEVOPS_KEYWORDS_ENGLISH[:3]:  # Limit searches
                 try:
@@ -127,9 +132,10 @@ def search_themarker_rss():
     
     try:
         rss_url = "https://www.themarker.com/career/rss/"
-        feed = feedparser.parse(rss_url)
-        
-        for entry in feed.entries[:30]:  # Check recent entries
+        entries, info = feeds.poller().poll(rss_url, limit=30)  # Check recent entries
+        print(f"[THEMARKER] RSS: {info['new']} new of {info['entries']} entries (HTTP {info['status']})")
+
+        for entry in entries:
             title = entry.title
             description = entry.summary if hasattr(entry, 'summary') else ""
             
@@ -167,124 +173,89 @@ def search_themarker_rss():
     
     return jobs
 
+# Israeli companies using Comeet (verified working endpoints)
+COMEET_COMPANIES = [
+    "monday", "wix", "outbrain", "walkme", "fiverr"
+]
+
+# Israeli companies using SmartRecruiters (verified working)
+SMARTRECRUITERS_COMPANIES = [
+    "wix", "outbrain"
+]
+
+ISRAEL_LOCATIONS = ["israel", "tel aviv", "jerusalem", "herzliya"]
+
+def is_leadership_title(title: str) -> bool:
+    return any(keyword.lower() in title.lower() for keyword in DEVOPS_KEYWORDS_ENGLISH)
+
+def comeet_url(company: str) -> str:
+    return f"https://{company}.comeet.co/careers-api/2.0/company/positions"
+
+def comeet_record(company: str, position: dict):
+    """Job record for a Comeet position, or None unless it is a DevOps leadership role in Israel."""
+    title = position.get("name", "")
+    location = (position.get("location") or {}).get("name", "")
+    if not is_leadership_title(title) or not any(loc in location.lower() for loc in ISRAEL_LOCATIONS):
+        return None
+    url = f"https://{company}.comeet.co/careers/{position.get('uid', '')}"
+    return {
+        "title": title,
+        "company": company.title(),
+        "location": location,
+        "url": url,
+        "source": "comeet",
+        "posted_at": position.get("time_updated", date.today().isoformat()),
+        "jd": position.get("details", ""),
+        "id": job_id({
+            "title": title,
+            "company": company,
+            "location": location,
+            "url": url
+        })
+    }
+
 def search_comeet_companies():
-    """Search Comeet API for Israeli companies."""
-    jobs = []
-    session = create_session()
-    
-    # Israeli companies using Comeet (verified working endpoints)
-    comeet_companies = [
-        "monday", "wix", "outbrain", "walkme", "fiverr"
-    ]
-    
-    print(f"[COMEET] Searching {len(comeet_companies)} companies using Comeet ATS...")
-    
-    for company in comeet_companies:
-        try:
-            # Comeet API endpoint
-            url = f"https://{company}.comeet.co/careers-api/2.0/company/positions"
-            
-            response = session.get(url, timeout=20)
-            if response.status_code == 200:
-                positions = response.json()
-                
-                for position in positions:
-                    title = position.get("name", "")
-                    location = position.get("location", {}).get("name", "")
-                    
-                    # Filter for DevOps leadership and Israel location
-                    if (any(keyword.lower() in title.lower() for keyword in DEVOPS_KEYWORDS_ENGLISH) and
-                        ("israel" in location.lower() or "tel aviv" in location.lower() or 
-                         "jerusalem" in location.lower() or "herzliya" in location.lower())):
-                        
-                        job = {
-                            "title": title,
-                            "company": company.title(),
-                            "location": location,
-                            "url": f"https://{company}.comeet.co/careers/{position.get('uid', '')}",
-                            "source": "comeet",
-                            "posted_at": position.get("time_updated", date.today().isoformat()),
-                            "jd": position.get("details", ""),
-                            "id": job_id({
-                                "title": title,
-                                "company": company,
-                                "location": location,
-                                "url": f"https://{company}.comeet.co/careers/{position.get('uid', '')}"
-                            })
-                        }
-                        jobs.append(job)
-                        print(f"[COMEET] {title} @ {company.title()} ({location})")
-            
-            time.sleep(0.5)  # Rate limiting
-            
-        except Exception as e:
-            print(f"[COMEET] Error for {company}: {e}")
-            continue
-    
-    return jobs
+    """Search Comeet API for Israeli companies (all companies fetched concurrently)."""
+    return _crawl_ats("comeet")
+
+def _crawl_ats(name: str):
+    from scripts.crawl_scheduler import crawl
+    from scripts.sources import SOURCES
+    records, stats = crawl([SOURCES[name]])
+    st = stats[name]
+    print(f"[{name.upper()}] {st['records']} roles from {st['fetched']}/{st['targets']} companies ({st['failed']} failed)")
+    return records[name]
+
+def smartrecruiters_url(company: str) -> str:
+    return f"https://api.smartrecruiters.com/v1/companies/{company}/postings"
+
+def smartrecruiters_record(company: str, posting: dict):
+    """Job record for a SmartRecruiters posting, or None unless it is a DevOps leadership role in Israel."""
+    title = posting.get("name", "")
+    location = posting.get("location") or {}
+    city = location.get("city", "")
+    country = location.get("country", "")
+    if not is_leadership_title(title) or country.lower() != "israel":
+        return None
+    return {
+        "title": title,
+        "company": posting.get("company", {}).get("name", company.title()),
+        "location": f"{city}, Israel" if city else "Israel",
+        "url": f"https://jobs.smartrecruiters.com/{posting.get('id', '')}",
+        "source": "smartrecruiters",
+        "posted_at": posting.get("releasedDate", date.today().isoformat()),
+        "jd": posting.get("jobAd", {}).get("sections", {}).get("jobDescription", {}).get("text", ""),
+        "id": job_id({
+            "title": title,
+            "company": company,
+            "location": city,
+            "url": posting.get('id', '')
+        })
+    }
 
 def search_smartrecruiters_companies():
-    """Search SmartRecruiters API for Israeli companies."""
-    jobs = []
-    session = create_session()
-    
-    # Israeli companies using SmartRecruiters (verified working)
-    smartrecruiters_companies = [
-        "wix", "outbrain"
-    ]
-    
-    print(f"[SMARTRECRUITERS] Searching {len(smartrecruiters_companies)} companies...")
-    
-    for company in smartrecruiters_companies:
-        try:
-            # SmartRecruiters public API
-            url = f"https://api.smartrecruiters.com/v1/companies/{company}/postings"
-            params = {
-                "limit": 50,
-                "offset": 0,
-                "country": "il"  # Israel
-            }
-            
-            response = session.get(url, params=params, timeout=20)
-            if response.status_code == 200:
-                data = response.json()
-                postings = data.get("content", [])
-                
-                for posting in postings:
-                    title = posting.get("name", "")
-                    location = posting.get("location", {})
-                    city = location.get("city", "")
-                    country = location.get("country", "")
-                    
-                    # Filter for DevOps leadership in Israel
-                    if (any(keyword.lower() in title.lower() for keyword in DEVOPS_KEYWORDS_ENGLISH) and
-                        country.lower() == "israel"):
-                        
-                        job = {
-                            "title": title,
-                            "company": posting.get("company", {}).get("name", company.title()),
-                            "location": f"{city}, Israel" if city else "Israel",
-                            "url": f"https://jobs.smartrecruiters.com/{posting.get('id', '')}",
-                            "source": "smartrecruiters",
-                            "posted_at": posting.get("releasedDate", date.today().isoformat()),
-                            "jd": posting.get("jobAd", {}).get("sections", {}).get("jobDescription", {}).get("text", ""),
-                            "id": job_id({
-                                "title": title,
-                                "company": company,
-                                "location": city,
-                                "url": posting.get('id', '')
-                            })
-                        }
-                        jobs.append(job)
-                        print(f"[SMARTRECRUITERS] {title} @ {company.title()} ({city})")
-            
-            time.sleep(0.5)  # Rate limiting
-            
-        except Exception as e:
-            print(f"[SMARTRECRUITERS] Error for {company}: {e}")
-            continue
-    
-    return jobs
+    """Search SmartRecruiters API for Israeli companies (concurrent, lazily paginated)."""
+    return _crawl_ats("smartrecruiters")
 
 def search_vc_portfolio_companies():
     """Search VC portfolio companies for DevOps leadership roles."""
@@ -501,11 +472,8 @@ def main():
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(unique_jobs, f, indent=2, ensure_ascii=False)
         
-        # Append to main jobs file
-        jobs_file = ROOT / "data" / "processed" / "jobs.jsonl"
-        with open(jobs_file, "a", encoding="utf-8") as f:
-            for job in unique_jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        # Write this source's shard; scripts/shards.py merges it into jobs.jsonl
+        write_shard("israeli_sources", unique_jobs)
         
         print(f"\n[SUCCESS] Found {len(unique_jobs)} DevOps leadership roles from additional Israeli sources")
         print(f"[INFO] Sources: {len(alljobs_results)} AllJobs, {len(themarker_results)} TheMarker, {len(comeet_results)} Comeet, {len(smartrecruiters_results)} SmartRecruiters, {len(vc_results)} VC Portfolio, {len(executive_results)} Executive Search")
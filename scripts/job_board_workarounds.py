@@ -5,15 +5,16 @@ Uses alternative methods to bypass anti-bot protection and JavaScript rendering.
 """
 
 import requests
-import json
 import pathlib
 from datetime import date
 from bs4 import BeautifulSoup
-from scripts.utils import create_session, job_id
+from scripts.utils import create_session, capped_get, job_id
+from scripts.shards import write_shard
 import yaml
 import time
 import urllib.parse
 import random
+from scripts import render
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 BOARDS_CONFIG = ROOT / "configs" / "boards.yaml"
@@ -46,10 +47,26 @@ def create_stealth_session():
     
     return session
 
-def search_alljobs_workaround():
+def get_page(session, url, timeout=15):
+    """The page as a browser sees it when Playwright is installed (these boards build
+    their listings with JavaScript), else a size-capped GET with the stealth session."""
+    if render.playwright_available():
+        return render.pool().render(url, timeout)
+    return capped_get(session, url, timeout=timeout)
+
+def _serial_fetch(session, pause):
+    """get_page after a random pause, for standalone runs; under the crawl scheduler
+    fetch is Http.render, which rate-limits per host instead."""
+    def fetch(url):
+        time.sleep(random.uniform(*pause))
+        return get_page(session, url)
+    return fetch
+
+def search_alljobs_workaround(fetch=None):
     """Workaround for AllJobs.co.il using mobile site and alternative endpoints."""
     jobs = []
     session = create_stealth_session()
+    fetch = fetch or _serial_fetch(session, (2, 5))
     
     print("[ALLJOBS-WORKAROUND] Trying mobile site and alternative endpoints...")
     
@@ -67,10 +84,7 @@ def search_alljobs_workaround():
         try:
             print(f"[ALLJOBS-WORKAROUND] Trying endpoint: {endpoint}")
             
-            # Add random delay to avoid rate limiting
-            time.sleep(random.uniform(2, 5))
-            
-            response = session.get(endpoint, timeout=15)
+            response = fetch(endpoint)
             
             if response.status_code == 200 and "job" in response.text.lower():
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -189,10 +203,11 @@ def search_linkedin_workaround():
     
     return jobs
 
-def search_glassdoor_workaround():
+def search_glassdoor_workaround(fetch=None):
     """Workaround for Glassdoor using mobile site and API endpoints."""
     jobs = []
     session = create_stealth_session()
+    fetch = fetch or _serial_fetch(session, (2, 4))
     
     print("[GLASSDOOR-WORKAROUND] Using mobile site and API endpoints...")
     
@@ -212,9 +227,7 @@ def search_glassdoor_workaround():
                 'Accept': 'application/json, text/plain, */*'
             })
             
-            time.sleep(random.uniform(2, 4))
-            
-            response = session.get(endpoint, timeout=15)
+            response = fetch(endpoint)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -256,10 +269,11 @@ def search_glassdoor_workaround():
     
     return jobs
 
-def search_themarker_workaround():
+def search_themarker_workaround(fetch=None):
     """Workaround for TheMarker using alternative endpoints and mobile site."""
     jobs = []
     session = create_stealth_session()
+    fetch = fetch or _serial_fetch(session, (2, 4))
     
     print("[THEMARKER-WORKAROUND] Trying alternative endpoints...")
     
@@ -275,9 +289,7 @@ def search_themarker_workaround():
         try:
             print(f"[THEMARKER-WORKAROUND] Trying: {endpoint}")
             
-            time.sleep(random.uniform(2, 4))
-            
-            response = session.get(endpoint, timeout=15)
+            response = fetch(endpoint)
             
             if response.status_code == 200 and len(response.text) > 1000:  # Has content
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -347,12 +359,8 @@ def main():
     
     # Save results
     if unique_jobs:
-        jobs_file = ROOT / "data" / "processed" / "jobs.jsonl"
-        jobs_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(jobs_file, "a", encoding="utf-8") as f:
-            for job in unique_jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        # Write this source's shard; scripts/shards.py merges it into jobs.jsonl
+        write_shard("workarounds", unique_jobs)
     
     print("=" * 50)
     print(f"✅ JOB BOARD WORKAROUNDS COMPLETE")
@@ -0,0 +1,111 @@
+"""
+Schema.org JobPosting extraction from JSON-LD.
+
+Career pages built for search engines carry every opening as an
+application/ld+json JobPosting block with its own URL, date and location. The
+blocks are found with a regex over the raw HTML (no DOM is built) and decoded
+with json, so pages that have them are read accurately and cheaply; scrapers fall
+back to their HTML heuristics only when job_postings() finds nothing.
+"""
+
+import re
+import json
+import html as htmllib
+from typing import Dict, Iterable, List, Optional
+from scripts.utils import job_id
+
+LD_BLOCK = re.compile(r"<script[^>]*type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>", re.I | re.S)
+JOB_TYPE = re.compile(r"[\"']@type[\"']\s*:\s*\[?\s*[\"']JobPosting[\"']", re.I)
+BREAK = re.compile(r"<(?:br|/p|/li|/h[1-6]|/div|/tr)\b[^>]*>", re.I)
+TAG = re.compile(r"<[^>]+>")
+SPACE = re.compile(r"[ \t\r\f\v]+")
+WRAPPER = re.compile(r"^\s*(?:<!--|//\s*<!\[CDATA\[)|(?:-->|//\s*\]\]>)\s*$")
+
+def _types(item: Dict) -> List[str]:
+    kinds = item.get("@type", [])
+    return kinds if isinstance(kinds, list) else [kinds]
+
+def job_postings(html: str) -> List[Dict]:
+    """Raw JobPosting objects in a page (including ones inside @graph and ItemList)."""
+    if not html or "ld+json" not in html:
+        return []
+    postings = []
+    for block in LD_BLOCK.findall(html):
+        if not JOB_TYPE.search(block):
+            continue  # Organization, BreadcrumbList...: not worth decoding
+        try:
+            data = json.loads(WRAPPER.sub("", block.strip()), strict=False)
+        except ValueError:
+            continue
+        stack = data if isinstance(data, list) else [data]
+        while stack:
+            item = stack.pop(0)
+            if isinstance(item, list):
+                stack.extend(item)
+                continue
+            if not isinstance(item, dict):
+                continue
+            if "JobPosting" in _types(item):
+                postings.append(item)
+                continue
+            stack.extend(item.get("@graph", []))
+            stack.extend(el.get("item", el) if isinstance(el, dict) else el
+                         for el in item.get("itemListElement", []))
+    return postings
+
+def text(value: Optional[str]) -> str:
+    """Plain text of an HTML description."""
+    if not value:
+        return ""
+    plain = htmllib.unescape(TAG.sub(" ", BREAK.sub("\n", str(value))))
+    return "\n".join(line.strip() for line in SPACE.sub(" ", plain).splitlines() if line.strip())
+
+def _name(value) -> str:
+    if isinstance(value, dict):
+        return value.get("name", "") or ""
+    return value if isinstance(value, str) else ""
+
+def location(posting: Dict) -> str:
+    """Each jobLocation as "City, Country", joined with "; "; telecommute postings add "Remote"."""
+    places = posting.get("jobLocation") or []
+    places = places if isinstance(places, list) else [places]
+    out = []
+    for place in places:
+        address = place.get("address", "") if isinstance(place, dict) else place
+        if isinstance(address, dict):
+            parts = [address.get("addressLocality"), _name(address.get("addressRegion")),
+                     _name(address.get("addressCountry"))]
+            label = ", ".join(dict.fromkeys(p for p in parts if p))
+        else:
+            label = _name(address)
+        if label and label not in out:
+            out.append(label)
+    if "TELECOMMUTE" in str(posting.get("jobLocationType", "")).upper():
+        out.append("Remote")
+    return "; ".join(out)
+
+def posting_record(posting: Dict, page_url: str = "", company: str = "", source: str = "jsonld") -> Dict:
+    """Job record for a JobPosting; the page URL stands in when the posting has none."""
+    return {
+        "title": text(posting.get("title") or posting.get("name")),
+        "company": company or _name(posting.get("hiringOrganization")),
+        "location": location(posting),
+        "url": posting.get("url") or page_url,
+        "source": source,
+        "posted_at": posting.get("datePosted", ""),
+        "jd": text(posting.get("description")),
+    }
+
+def page_records(html: str, page_url: str, company: str = "", source: str = "jsonld",
+                 titles: Optional[Iterable[str]] = None, default_location: str = "") -> List[Dict]:
+    """Records (with ids) for a page's postings; with `titles`, only those containing one of them."""
+    titles = [t.lower() for t in titles] if titles is not None else None
+    out = []
+    for posting in job_postings(html):
+        rec = posting_record(posting, page_url, company, source)
+        if titles is not None and not any(t in rec["title"].lower() for t in titles):
+            continue
+        rec["location"] = rec["location"] or default_location
+        rec["id"] = job_id(rec)
+        out.append(rec)
+    return out
@@ -5,10 +5,12 @@ Learns from Applied vs Ignored jobs to improve future scoring.
 """
 
 import json
+import hashlib
 import pathlib
 from datetime import date
 from collections import defaultdict
 import re
+import numpy as np
 from scripts.job_state import job_state
 from scripts.utils import create_session
 import openai
@@ -19,10 +21,213 @@ load_dotenv()
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 LEARNING_DATA = ROOT / "data" / "processed" / "learning_patterns.json"
+PREFERENCE_VECTORS = ROOT / "data" / "processed" / "preference_vectors.npz"
+
+# Pattern list -> (job field it is matched against, score delta per match)
+PATTERN_WEIGHTS = {
+    "preferred_keywords": ("title", 0.1),
+    "preferred_roles": ("title", 0.15),
+    "preferred_companies": ("company", 0.1),
+    "avoided_keywords": ("title", -0.2),
+    "avoided_roles": ("title", -0.3),
+    "avoided_companies": ("company", -0.2),
+}
+MAX_ADJUSTMENT = 0.5
+# Scale applied to (job . preference vector) when the embedding model is trained
+VECTOR_WEIGHT = float(os.getenv("LEARNING_VECTOR_WEIGHT", "0.5"))
+
+class _FieldMatcher:
+    """One regex alternation over all learned terms for a single field.
+
+    A term contributes once per text if it occurs anywhere as a substring,
+    same as the original `keyword in title` loops. The regex is a lookahead
+    with longest terms first, so each position yields the longest term that
+    starts there; shorter terms starting at the same position are its prefixes
+    and are looked up from a precomputed table.
+    """
+
+    def __init__(self, term_weights: dict):
+        self.terms = sorted(term_weights, key=lambda t: (-len(t), t))
+        self.index = {t: i for i, t in enumerate(self.terms)}
+        self.weights = np.array([term_weights[t] for t in self.terms], dtype=np.float64)
+        self.prefixes = [
+            [self.index[p] for p in self.terms if t.startswith(p)]
+            for t in self.terms
+        ]
+        self.regex = None
+        if self.terms:
+            alternation = "|".join(re.escape(t) for t in self.terms)
+            self.regex = re.compile(f"(?=({alternation}))")
+
+    def hits(self, texts):
+        """Boolean (len(texts), n_terms) matrix of which terms occur in each text."""
+        out = np.zeros((len(texts), len(self.terms)), dtype=bool)
+        if self.regex is None or not texts:
+            return out
+        # Scan the whole batch in one pass; "\n" never occurs inside a term
+        blob = "\n".join(texts)
+        starts = np.cumsum([0] + [len(t) + 1 for t in texts[:-1]])
+        positions, terms = [], []
+        for m in self.regex.finditer(blob):
+            for i in self.prefixes[self.index[m.group(1)]]:
+                positions.append(m.start())
+                terms.append(i)
+        if positions:
+            rows = np.searchsorted(starts, positions, side="right") - 1
+            out[rows, terms] = True
+        return out
+
+class PreferenceMatcher:
+    """Learned patterns compiled once into weighted per-field matchers."""
+
+    def __init__(self, patterns: dict):
+        fields = defaultdict(lambda: defaultdict(float))
+        for key, (field, weight) in PATTERN_WEIGHTS.items():
+            # Empty terms would match every job; skip them
+            for term in patterns.get(key, []):
+                if not term:
+                    continue
+                fields[field][term] += weight
+        self.title = _FieldMatcher(fields["title"])
+        self.company = _FieldMatcher(fields["company"])
+
+    def contributions(self, titles, companies):
+        """Per-term weight matrices (title, company) for a batch of jobs."""
+        titles = [(t or "").lower() for t in titles]
+        companies = [(c or "").lower() for c in companies]
+        return (self.title.hits(titles) * self.title.weights,
+                self.company.hits(companies) * self.company.weights)
+
+    def scores(self, titles, companies):
+        """Capped preference adjustment for every job in the batch."""
+        title_c, company_c = self.contributions(titles, companies)
+        total = title_c.sum(axis=1) + company_c.sum(axis=1)
+        return np.clip(total, -MAX_ADJUSTMENT, MAX_ADJUSTMENT)
+
+    def explain(self, title: str, company: str):
+        """Matched terms and their weights for a single job."""
+        title_c, company_c = self.contributions([title], [company])
+        terms = {}
+        for matcher, row in ((self.title, title_c[0]), (self.company, company_c[0])):
+            for i in np.flatnonzero(row):
+                terms[matcher.terms[i]] = terms.get(matcher.terms[i], 0.0) + float(row[i])
+        return terms
+
+class PreferenceVectorModel:
+    """Preference direction in embedding space learned from applied vs ignored jobs.
+
+    Keeps the embedding of every job that has feedback (label +1 applied, -1
+    ignored) so labels can change later, and derives the preference vector as
+    the difference of the normalized class centroids. Jobs are scored with a
+    single matrix product against that vector.
+    """
+
+    def __init__(self, ids=None, labels=None, vectors=None):
+        self.ids = list(ids) if ids is not None else []
+        self.labels = np.asarray(labels if labels is not None else [], dtype=np.int8)
+        self.vectors = vectors if vectors is not None else np.zeros((0, 0), dtype=np.float32)
+        self._vector = None
+
+    @classmethod
+    def load(cls, path: pathlib.Path = None):
+        path = path or PREFERENCE_VECTORS
+        if path.exists():
+            try:
+                with np.load(path) as data:
+                    return cls(data["ids"].tolist(), data["labels"], data["vectors"])
+            except Exception as e:
+                print(f"[LEARNING] Could not load {path.name}: {e}")
+        return cls()
+
+    def save(self, path: pathlib.Path = None):
+        path = path or PREFERENCE_VECTORS
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, ids=np.array(self.ids, dtype=str), labels=self.labels, vectors=self.vectors)
+        os.replace(tmp, path)
+
+    @property
+    def ready(self) -> bool:
+        """Both applied and ignored examples are needed for a direction."""
+        return bool((self.labels > 0).any() and (self.labels < 0).any())
+
+    def update(self, state: dict, vectors_by_id: dict) -> int:
+        """Sync labels with job_state and add embeddings of newly labeled jobs.
+
+        `vectors_by_id` is any id -> embedding mapping, normally the on-disk
+        EmbeddingStore, so feedback on jobs scored in earlier runs is picked up
+        without re-embedding. Returns the number of changes.
+        """
+        wanted = {jid: 1 for jid in state.get("applied", {})}
+        wanted.update({jid: -1 for jid in state.get("ignored", {}) if jid not in wanted})
+
+        changes = 0
+        keep = []
+        for i, jid in enumerate(self.ids):
+            label = wanted.get(jid)
+            if label is None:
+                changes += 1  # feedback was removed
+                continue
+            if label != self.labels[i]:
+                self.labels[i] = label
+                changes += 1
+            keep.append(i)
+        if len(keep) != len(self.ids):
+            self.ids = [self.ids[i] for i in keep]
+            self.labels = self.labels[keep]
+            self.vectors = self.vectors[keep]
+
+        known = set(self.ids)
+        new_ids = [jid for jid in wanted if jid not in known and jid in vectors_by_id]
+        if new_ids:
+            new_vecs = np.vstack([vectors_by_id[jid] for jid in new_ids]).astype(np.float32)
+            if self.vectors.size and self.vectors.shape[1] != new_vecs.shape[1]:
+                print("[LEARNING] Embedding size changed; resetting preference vectors")
+                self.ids, self.labels = [], np.zeros(0, dtype=np.int8)
+                self.vectors = np.zeros((0, new_vecs.shape[1]), dtype=np.float32)
+            self.ids.extend(new_ids)
+            self.labels = np.concatenate([self.labels, np.array([wanted[j] for j in new_ids], dtype=np.int8)])
+            self.vectors = new_vecs if not self.vectors.size else np.vstack([self.vectors, new_vecs])
+            changes += len(new_ids)
+
+        if changes:
+            self._vector = None
+        return changes
+
+    def vector(self):
+        """Unit-centroid(applied) minus unit-centroid(ignored), or None if untrained."""
+        if not self.ready:
+            return None
+        if self._vector is None:
+            def unit_centroid(rows):
+                c = rows.mean(axis=0)
+                n = np.linalg.norm(c)
+                return c / n if n else c
+            norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+            unit = self.vectors / np.where(norms == 0, 1, norms)
+            self._vector = unit_centroid(unit[self.labels > 0]) - unit_centroid(unit[self.labels < 0])
+        return self._vector
+
+    def scores(self, matrix):
+        """Capped preference adjustment for each row of a (normalized) embedding matrix."""
+        w = self.vector()
+        if w is None or matrix.shape[1] != w.shape[0]:
+            return np.zeros(matrix.shape[0])
+        return np.clip(VECTOR_WEIGHT * (matrix @ w), -MAX_ADJUSTMENT, MAX_ADJUSTMENT)
 
 class JobLearningSystem:
     def __init__(self):
         self.patterns = self.load_learning_patterns()
+        self._matcher = None
+        self.vector_model = PreferenceVectorModel.load()
+
+    @property
+    def matcher(self) -> PreferenceMatcher:
+        """Compiled matcher for the current patterns (built on first use)."""
+        if self._matcher is None:
+            self._matcher = PreferenceMatcher(self.patterns)
+        return self._matcher
         
     def load_learning_patterns(self):
         """Load existing learning patterns."""
@@ -138,6 +343,7 @@ class JobLearningSystem:
             "preferred_roles": preferred_roles,
             "avoided_roles": avoided_roles
         })
+        self._matcher = None
         
         # Print insights
         print("\n✅ LEARNED PREFERENCES:")
@@ -151,38 +357,39 @@ class JobLearningSystem:
     
     def calculate_preference_score(self, job_title: str, job_company: str):
         """Calculate preference score based on learned patterns."""
-        title_lower = job_title.lower()
-        company_lower = job_company.lower()
-        
-        score_adjustment = 0.0
-        
-        # Positive signals (boost score)
-        for keyword in self.patterns.get("preferred_keywords", []):
-            if keyword in title_lower:
-                score_adjustment += 0.1
-        
-        for role in self.patterns.get("preferred_roles", []):
-            if role in title_lower:
-                score_adjustment += 0.15
-        
-        for company in self.patterns.get("preferred_companies", []):
-            if company in company_lower:
-                score_adjustment += 0.1
-        
-        # Negative signals (reduce score)
-        for keyword in self.patterns.get("avoided_keywords", []):
-            if keyword in title_lower:
-                score_adjustment -= 0.2
-        
-        for role in self.patterns.get("avoided_roles", []):
-            if role in title_lower:
-                score_adjustment -= 0.3
-        
-        for company in self.patterns.get("avoided_companies", []):
-            if company in company_lower:
-                score_adjustment -= 0.2
-        
-        return max(-0.5, min(0.5, score_adjustment))  # Cap between -0.5 and +0.5
+        return float(self.matcher.scores([job_title], [job_company])[0])
+
+    def calculate_preference_scores(self, jobs):
+        """Preference adjustments for a batch of jobs in one pass (numpy array)."""
+        return self.matcher.scores(
+            [j.get("title", "") for j in jobs],
+            [j.get("company", "") for j in jobs],
+        )
+
+    def learn_from_embeddings(self, vectors_by_id) -> bool:
+        """Fold newly labeled jobs from job_state into the preference vector model."""
+        changes = self.vector_model.update(job_state.data, vectors_by_id)
+        if changes:
+            self.vector_model.save()
+            print(f"[LEARNING] Preference vectors updated ({changes} changes, {len(self.vector_model.ids)} labeled jobs)")
+        return self.vector_model.ready
+
+    def calculate_embedding_preference_scores(self, matrix):
+        """Preference adjustments as one matrix product with the learned vector."""
+        return self.vector_model.scores(matrix)
+
+    def fingerprint(self) -> str:
+        """Hash of the learned state that affects scores (patterns and feedback labels)."""
+        h = hashlib.sha1()
+        h.update(json.dumps({k: self.patterns.get(k, []) for k in PATTERN_WEIGHTS}, sort_keys=True).encode("utf-8"))
+        h.update(f"{VECTOR_WEIGHT}|{MAX_ADJUSTMENT}".encode("utf-8"))
+        for jid, label in zip(self.vector_model.ids, self.vector_model.labels.tolist()):
+            h.update(f"{jid}:{label};".encode("utf-8"))
+        return h.hexdigest()[:16]
+
+    def explain_preference(self, job_title: str, job_company: str):
+        """Learned terms matched by a job and how much each contributed."""
+        return self.matcher.explain(job_title, job_company)
     
     def generate_learning_insights(self):
         """Generate AI insights about user preferences."""
@@ -0,0 +1,174 @@
+"""
+CPU-only job text embeddings: hashed n-gram TF-IDF reduced with a truncated SVD.
+
+Words, word bigrams and character trigrams are hashed into a fixed number of
+buckets (no vocabulary to store), weighted by sublinear TF times IDF learned
+from our own job history, and projected onto the top singular directions of
+that corpus. Everything runs in batches on NumPy with no network, and the
+trained model is saved to disk and retrained once the job history has grown.
+
+    python scripts/local_embeddings.py train
+"""
+
+import os
+import re
+import zlib
+import json
+import hashlib
+import pathlib
+import numpy as np
+from typing import Iterable, List
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+LOCAL_MODEL = ROOT / "data" / "processed" / "local_embedder.npz"
+JOBS_JL = ROOT / "data" / "processed" / "jobs.jsonl"
+
+N_FEATURES = 2 ** 13
+DIM = 256
+TRAIN_MAX = 5000        # documents sampled for IDF and SVD
+RETRAIN_GROWTH = 2      # retrain once the corpus is this many times larger
+BATCH = 512
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_bucket_cache = {}
+
+def _bucket(feature: str) -> int:
+    b = _bucket_cache.get(feature)
+    if b is None:
+        b = zlib.crc32(feature.encode("utf-8")) % N_FEATURES
+        if len(_bucket_cache) < 500000:
+            _bucket_cache[feature] = b
+    return b
+
+def features(text: str) -> List[int]:
+    """Hashed feature ids for words, word bigrams and character trigrams."""
+    words = WORD_RE.findall((text or "").lower())
+    feats = [_bucket(w) for w in words]
+    feats += [_bucket(f"{a} {b}") for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"<{w}>"
+        feats += [_bucket(padded[i:i + 3]) for i in range(len(padded) - 2)]
+    return feats
+
+def term_matrix(texts: List[str]):
+    """Dense sublinear TF matrix (len(texts) x N_FEATURES)."""
+    m = np.zeros((len(texts), N_FEATURES), dtype=np.float32)
+    for i, t in enumerate(texts):
+        feats = features(t)
+        if feats:
+            m[i] = np.bincount(feats, minlength=N_FEATURES)
+    np.log1p(m, out=m)
+    return m
+
+def _normalize(m):
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.where(norms == 0, 1, norms)
+
+def randomized_svd(x, k: int, oversample: int = 10, power_iters: int = 2, seed: int = 0):
+    """Top-k right singular vectors of x (k x features) via a randomized range finder."""
+    rng = np.random.default_rng(seed)
+    k = min(k, *x.shape)
+    y = x @ rng.standard_normal((x.shape[1], k + oversample)).astype(np.float32)
+    for _ in range(power_iters):
+        y, _ = np.linalg.qr(y)
+        y = x @ (x.T @ y)
+    q, _ = np.linalg.qr(y)
+    _, _, vt = np.linalg.svd(q.T @ x, full_matrices=False)
+    return vt[:k].astype(np.float32)
+
+class LocalEmbedder:
+    def __init__(self, idf=None, components=None, trained_n: int = 0):
+        self.idf = idf
+        self.components = components
+        self.trained_n = trained_n
+
+    @property
+    def ready(self) -> bool:
+        return self.components is not None
+
+    @property
+    def model(self) -> str:
+        """Model name, unique per trained state (so cached embeddings are not mixed)."""
+        digest = hashlib.sha1(self.components.tobytes()).hexdigest()[:8] if self.ready else "untrained"
+        return f"local-tfidf-svd-{DIM}-{digest}"
+
+    @property
+    def dim(self) -> int:
+        return self.components.shape[0] if self.ready else 0
+
+    def train(self, texts: List[str], seed: int = 0):
+        """Learn IDF weights and SVD projection from a corpus of job texts."""
+        texts = [t for t in texts if t and t.strip()]
+        if not texts:
+            raise ValueError("No job texts to train the local embedder on")
+        rng = np.random.default_rng(seed)
+        if len(texts) > TRAIN_MAX:
+            texts = [texts[i] for i in sorted(rng.choice(len(texts), TRAIN_MAX, replace=False))]
+        tf = term_matrix(texts)
+        df = np.count_nonzero(tf, axis=0)
+        self.idf = (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+        self.components = randomized_svd(_normalize(tf * self.idf), DIM, seed=seed)
+        self.trained_n = len(texts)
+        return self
+
+    def embed(self, texts: Iterable[str]):
+        """Unit-length embeddings for a batch of texts (float32, len x dim)."""
+        if not self.ready:
+            raise RuntimeError("Local embedder is not trained")
+        texts = list(texts)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), BATCH):
+            x = _normalize(term_matrix(texts[start:start + BATCH]) * self.idf)
+            out[start:start + BATCH] = _normalize(x @ self.components.T)
+        return out
+
+    def save(self, path: pathlib.Path = None):
+        path = pathlib.Path(path or LOCAL_MODEL)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, idf=self.idf, components=self.components, trained_n=self.trained_n)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: pathlib.Path = None) -> "LocalEmbedder":
+        path = pathlib.Path(path or LOCAL_MODEL)
+        if path.exists():
+            try:
+                with np.load(path) as data:
+                    return cls(data["idf"], data["components"], int(data["trained_n"]))
+            except Exception as e:
+                print(f"[EMBED] Could not load {path.name}: {e}")
+        return cls()
+
+    @classmethod
+    def for_corpus(cls, texts: List[str], path: pathlib.Path = None) -> "LocalEmbedder":
+        """Saved model, (re)trained when missing or the job history has grown enough."""
+        model = cls.load(path)
+        target = min(len(texts), TRAIN_MAX)
+        if not model.ready or target >= RETRAIN_GROWTH * max(model.trained_n, 1):
+            model.train(texts)
+            model.save(path)
+            print(f"[EMBED] Trained local embedder on {model.trained_n} jobs ({model.model})")
+        return model
+
+def main():
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != "train":
+        print(__doc__.strip().split("\n\n")[-1])
+        return
+    texts = []
+    with open(JOBS_JL, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                j = json.loads(line)
+            except:
+                continue
+            texts.append(f"{j.get('title', '')}\n{j.get('jd', '')}")
+    model = LocalEmbedder().train(texts)
+    model.save()
+    print(f"[OK] Trained {model.model} on {model.trained_n} jobs -> {LOCAL_MODEL}")
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,131 @@
-import sys, csv, re, pathlib
+import sys, csv, re, sqlite3, difflib, pathlib
+from typing import Dict, Iterable, List, Tuple
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 CSV = ROOT / "data" / "connections.csv"
+INDEX = ROOT / "data" / "processed" / "connections.db"
 
 HELP = "Usage: python scripts/network.py <company_domain_or_name>\nPlace your LinkedIn connections export as data/connections.csv"
 
+FUZZY_CUTOFF = 0.85
+COMPANY_SUFFIXES = {"ltd", "inc", "llc", "corp", "corporation", "co", "limited", "gmbh", "plc", "technologies", "technology"}
+DOMAIN_RE = re.compile(r"^(https?://)?(www\.)?|\.(com|io|ai|co|net|org|dev)(\.il)?\b|/+$")
+
 def norm(s): return (s or "").strip().lower()
 
+def company_key(name: str) -> str:
+    """Canonical company name: 'Monday.com Ltd', 'monday.com' and 'Monday' all map to 'monday'."""
+    s = DOMAIN_RE.sub("", norm(name))
+    tokens = [t for t in re.split(r"[^a-z0-9]+", s) if t]
+    while len(tokens) > 1 and tokens[-1] in COMPANY_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+class ConnectionsIndex:
+    """Company -> people index over connections.csv, kept in SQLite and rebuilt when the CSV changes."""
+
+    def __init__(self, csv_path: pathlib.Path = None, index_path: pathlib.Path = None):
+        self.csv_path = csv_path or CSV
+        self.index_path = index_path or INDEX
+        self.db = None
+        self._keys = None
+
+    def _stamp(self) -> str:
+        st = self.csv_path.stat()
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    def open(self):
+        if self.db is not None:
+            return self
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.index_path))
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS people (ckey TEXT, company TEXT, name TEXT, email TEXT)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS people_ckey ON people (ckey)")
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'csv'").fetchone()
+        stamp = self._stamp()
+        if not row or row[0] != stamp:
+            self.rebuild(stamp)
+        return self
+
+    def rebuild(self, stamp: str = None):
+        rows = []
+        with open(self.csv_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                company = row.get("Company","") or row.get("Position","") or ""
+                name = row.get("First Name","") + " " + row.get("Last Name","")
+                rows.append((company_key(company), company, name.strip(), row.get("Email Address","") or ""))
+        with self.db:
+            self.db.execute("DELETE FROM people")
+            self.db.executemany("INSERT INTO people VALUES (?, ?, ?, ?)", rows)
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('csv', ?)", (stamp or self._stamp(),))
+        self._keys = None
+        print(f"[NETWORK] Indexed {len(rows)} connections from {self.csv_path.name}")
+
+    def keys(self) -> List[str]:
+        if self._keys is None:
+            self._keys = [k for (k,) in self.db.execute("SELECT DISTINCT ckey FROM people") if k]
+        return self._keys
+
+    def match_keys(self, company: str) -> List[str]:
+        """Indexed company keys for a name or domain: exact, then containment, then fuzzy."""
+        key = company_key(company)
+        if not key:
+            return []
+        keys = self.keys()
+        if key in keys:
+            exact = [key]
+            return exact + [k for k in keys if k != key and re.search(rf"\b{re.escape(key)}\b", k)]
+        contained = [k for k in keys if key in k]
+        return contained or difflib.get_close_matches(key, keys, n=3, cutoff=FUZZY_CUTOFF)
+
+    def people(self, keys: Iterable[str]) -> List[Tuple[str, str, str]]:
+        keys = list(keys)
+        if not keys:
+            return []
+        marks = ",".join("?" * len(keys))
+        return self.db.execute(f"SELECT name, email, company FROM people WHERE ckey IN ({marks}) ORDER BY rowid", keys).fetchall()
+
+    def lookup(self, company: str) -> List[Tuple[str, str, str]]:
+        """(name, email, company) of connections at a company."""
+        self.open()
+        return self.people(self.match_keys(company))
+
+    def lookup_many(self, companies: Iterable[str]) -> Dict[str, List[Tuple[str, str, str]]]:
+        """Connections for many companies against one loaded index (each name resolved once)."""
+        self.open()
+        out = {}
+        for c in companies:
+            if c and c not in out:
+                out[c] = self.people(self.match_keys(c))
+        return out
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+def warm_intros(companies: Iterable[str], limit: int = 3) -> Dict[str, List[str]]:
+    """Names of up to `limit` connections per company; empty when there is no connections export."""
+    if not CSV.exists():
+        return {}
+    index = ConnectionsIndex()
+    try:
+        return {c: [n for n, _, _ in people[:limit]] for c, people in index.lookup_many(companies).items() if people}
+    finally:
+        index.close()
+
 def main():
     if len(sys.argv) < 2:
         print(HELP); raise SystemExit(1)
     needle = norm(sys.argv[1])
     if not CSV.exists():
         print("Missing data/connections.csv (export from LinkedIn)."); raise SystemExit(2)
-    matches = []
-    with open(CSV, newline="", encoding="utf-8") as f:
-        rd = csv.DictReader(f)
-        for row in rd:
-            company = norm(row.get("Company","") or row.get("Position",""))
-            name = row.get("First Name","") + " " + row.get("Last Name","")
-            if needle in company or re.search(needle.replace(".", r"\."), company or ""):
-                matches.append((name, row.get("Email Address","") or "", row.get("Company","") or row.get("Position","")))
+    index = ConnectionsIndex()
+    try:
+        matches = index.lookup(needle)
+    finally:
+        index.close()
     if not matches:
         print("No likely connectors found.")
         return
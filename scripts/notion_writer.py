@@ -1,45 +1,155 @@
-import os, json, pathlib
+import os, json, heapq, uuid, pathlib, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from notion_client import Client
+from scripts.embedding_store import text_hash
+from scripts.utils import retry_on_rate_limit, RateLimiter
 
 load_dotenv()
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 SCORES = ROOT / "outputs" / "scores.jsonl"
+LEDGER = ROOT / "data" / "processed" / "notion_ledger.json"
 
 NOTION_API_KEY = os.getenv("NOTION_API_KEY","")
 NOTION_DB_ID   = os.getenv("NOTION_DB_ID","")
 
+TOP_N = 15                 # only push the best rows to avoid clutter
+CONCURRENCY = int(os.getenv("NOTION_CONCURRENCY", "3"))
+RATE_LIMIT = float(os.getenv("NOTION_RATE_LIMIT", "3"))  # requests per second (Notion's average limit)
+
 def ensure_notion():
     if not NOTION_API_KEY or not NOTION_DB_ID:
         raise SystemExit("NOTION_API_KEY / NOTION_DB_ID missing. Skipping.")
     return Client(auth=NOTION_API_KEY)
 
-def upsert_row(notion, row):
-    props = {
+class FakeNotionClient:
+    """In-memory stand-in for notion_client.Client (tests and --dry-run)."""
+
+    class _Pages:
+        def __init__(self):
+            self.store = {}
+            self.calls = []
+            self._lock = threading.Lock()
+
+        def create(self, parent, properties):
+            page_id = str(uuid.uuid4())
+            with self._lock:
+                self.calls.append(("create", page_id))
+                self.store[page_id] = properties
+            return {"id": page_id}
+
+        def update(self, page_id, properties):
+            with self._lock:
+                self.calls.append(("update", page_id))
+                if page_id not in self.store:
+                    err = Exception("Could not find page")
+                    err.status = 404
+                    raise err
+                self.store[page_id].update(properties)
+            return {"id": page_id}
+
+    def __init__(self):
+        self.pages = self._Pages()
+
+def row_props(row):
+    """Notion properties for a row, without Status (owned by the user once created)."""
+    return {
         "Title": {"title": [{"text": {"content": row.get("title","")}}]},
         "Company": {"rich_text": [{"text": {"content": row.get("company","")}}]},
         "Location": {"rich_text": [{"text": {"content": row.get("location","")}}]},
         "Score": {"number": float(row.get("score",0))},
         "URL": {"url": row.get("url","")},
-        "Status": {"select": {"name": "New"}},
         "Why": {"rich_text": [{"text": {"content": row.get("why_fit","")}}]},
     }
-    notion.pages.create(parent={"database_id": NOTION_DB_ID}, properties=props)
 
-def main():
-    notion = ensure_notion()
-    rows = []
+def props_hash(props) -> str:
+    return text_hash(json.dumps(props, sort_keys=True, ensure_ascii=False))
+
+def upsert_row(notion, row, page_id=None, limiter=None):
+    """Update the row's page if it has one, else create it. Returns the page id."""
+    props = row_props(row)
+    if page_id:
+        try:
+            if limiter: limiter.wait()
+            retry_on_rate_limit(notion.pages.update, page_id=page_id, properties=props, label="notion")
+            return page_id
+        except Exception as e:
+            if getattr(e, "status", None) != 404:
+                raise
+            print(f"[WARN] Notion page for {row.get('title')} was deleted; recreating")
+    props["Status"] = {"select": {"name": "New"}}
+    if limiter: limiter.wait()
+    page = retry_on_rate_limit(notion.pages.create, parent={"database_id": NOTION_DB_ID}, properties=props, label="notion")
+    return page["id"]
+
+def load_ledger():
+    """job id -> {"page": Notion page id, "hash": props hash} for the configured database."""
+    try:
+        with open(LEDGER, "r", encoding="utf-8") as f:
+            ledger = json.load(f)
+        if ledger.get("database_id") == NOTION_DB_ID:
+            return ledger.get("pages", {})
+    except Exception:
+        pass
+    return {}
+
+def save_ledger(pages):
+    LEDGER.parent.mkdir(parents=True, exist_ok=True)
+    tmp = LEDGER.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"database_id": NOTION_DB_ID, "pages": pages}, f, indent=2)
+    os.replace(tmp, LEDGER)
+
+def _iter_scores():
     with open(SCORES, "r", encoding="utf-8") as f:
         for line in f:
             try:
-                rows.append(json.loads(line))
+                yield json.loads(line)
             except:
                 pass
-    # Only push top 15 to avoid clutter
-    rows = sorted(rows, key=lambda r: r.get("score",0), reverse=True)[:15]
+
+def top_rows(n: int = TOP_N):
+    return heapq.nlargest(n, _iter_scores(), key=lambda r: r.get("score",0))
+
+def sync(notion, rows, concurrency: int = CONCURRENCY, rate: float = RATE_LIMIT, save: bool = True):
+    """Create or update only rows whose content changed since the last sync."""
+    pages = load_ledger()
+    pending = []
     for r in rows:
-        upsert_row(notion, r)
-    print(f"[OK] Pushed {len(rows)} rows to Notion.")
+        jid = r.get("id")
+        if not jid:
+            continue
+        h = props_hash(row_props(r))
+        entry = pages.get(jid)
+        if entry and entry.get("hash") == h:
+            continue
+        pending.append((r, h, entry.get("page") if entry else None))
+
+    stats = {"created": 0, "updated": 0, "unchanged": len(rows) - len(pending), "failed": 0}
+    limiter = RateLimiter(rate)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(upsert_row, notion, r, page, limiter): (r, h, page) for r, h, page in pending}
+        for fut in as_completed(futures):
+            r, h, page = futures[fut]
+            try:
+                page_id = fut.result()
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"[WARN] Notion sync failed for {r.get('title')} @ {r.get('company')}: {e}")
+                continue
+            stats["updated" if page_id == page else "created"] += 1
+            pages[r["id"]] = {"page": page_id, "hash": h}
+    if save:
+        save_ledger(pages)
+    return stats
+
+def main():
+    import sys
+    dry_run = "--dry-run" in sys.argv
+    notion = FakeNotionClient() if dry_run else ensure_notion()
+    stats = sync(notion, top_rows(), save=not dry_run)
+    print(f"[OK] Notion sync: {stats['created']} created, {stats['updated']} updated, "
+          f"{stats['unchanged']} unchanged, {stats['failed']} failed.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,59 @@
+"""
+Cheap first stage of the scoring cascade.
+
+Before any embedding is computed, new or changed jobs go through:
+  1. rules    - title filter from deduplicate_jobs and an explicit-location check
+  2. reach    - learned keyword adjustments must leave room to reach SCORE_THRESHOLD
+                (PREFILTER_CEILING is the best embedding score we expect to see)
+  3. top N    - optional cap on how many jobs are embedded, by cheap score
+                (BM25 match + title seniority + learned adjustment)
+Only the survivors are embedded and scored; the rest are screened again next run.
+"""
+
+import os
+from typing import Dict, List, Tuple
+from scripts.deduplicate_jobs import should_exclude_job
+from scripts.crawl import location_matches
+
+ENABLED = os.getenv("SCORE_PREFILTER", "1") != "0"
+THRESHOLD = float(os.getenv("SCORE_THRESHOLD", "0.78"))
+CEILING = float(os.getenv("PREFILTER_CEILING", "0.9"))
+TOP_N = int(os.getenv("PREFILTER_TOP_N", "0"))  # 0 = no cap
+
+SENIORITY = {"vp": 0.3, "vice president": 0.3, "head": 0.3, "director": 0.25, "group lead": 0.15, "manager": 0.1}
+OPEN_LOCATIONS = ("remote", "hybrid", "anywhere")
+
+def location_ok(location: str) -> bool:
+    """Unknown, remote or Israeli locations pass; explicit locations elsewhere do not."""
+    loc = (location or "").strip().lower().replace("-", " ")
+    return not loc or location_matches(loc) or any(w in loc for w in OPEN_LOCATIONS)
+
+def seniority(title: str) -> float:
+    t = (title or "").lower()
+    return max((w for k, w in SENIORITY.items() if k in t), default=0.0)
+
+def prefilter(jobs: List[Dict], lexical: Dict[str, float], learning=None) -> Tuple[List[Dict], Dict[str, int]]:
+    """Jobs worth embedding plus per-stage survivor counts."""
+    stats = {"input": len(jobs)}
+    if not ENABLED:
+        stats.update(rules=len(jobs), reach=len(jobs), embedded=len(jobs))
+        return jobs, stats
+
+    jobs = [j for j in jobs if not should_exclude_job(j.get("title") or "") and location_ok(j.get("location"))]
+    stats["rules"] = len(jobs)
+
+    adjustments = learning.calculate_preference_scores(jobs) if learning is not None and jobs else [0.0] * len(jobs)
+    top_lex = max(lexical.values(), default=0.0) or 1.0
+    candidates = []
+    for j, adj in zip(jobs, adjustments):
+        if CEILING + float(adj) < THRESHOLD:
+            continue  # learned avoidances make the digest threshold unreachable
+        cheap = lexical.get(j.get("id"), 0.0) / top_lex + seniority(j.get("title")) + float(adj)
+        candidates.append((cheap, j))
+    stats["reach"] = len(candidates)
+
+    if TOP_N and len(candidates) > TOP_N:
+        candidates.sort(key=lambda c: -c[0])
+        candidates = candidates[:TOP_N]
+    stats["embedded"] = len(candidates)
+    return [j for _, j in candidates], stats
@@ -8,6 +8,7 @@ import json
 from datetime import date, datetime, timedelta
 import pathlib
 from scripts.utils import create_session, job_id
+from scripts.shards import write_shard
 from bs4 import BeautifulSoup
 import re
 import time
@@ -408,11 +409,8 @@ def main():
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(unique_jobs, f, indent=2, ensure_ascii=False)
         
-        # Append to main jobs file
-        jobs_file = ROOT / "data" / "processed" / "jobs.jsonl"
-        with open(jobs_file, "a", encoding="utf-8") as f:
-            for job in unique_jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        # Write this source's shard; scripts/shards.py merges it into jobs.jsonl
+        write_shard("real_jobs", unique_jobs)
         
         print(f"[SUCCESS] Found {len(unique_jobs)} real DevOps leadership roles")
         print(f"[INFO] Sources: {len(greenhouse_jobs)} Greenhouse, {len(comeet_jobs)} Comeet, {len(verified_jobs)} verified companies, {len(research_jobs)} research, {len(job_board_jobs)} job boards")
@@ -0,0 +1,261 @@
+"""
+Headless rendering pool for job boards that only show postings after JavaScript runs.
+
+A fixed number of worker threads each own one reusable browser context (Chromium
+via Playwright, CPU only) and take URLs from a shared queue. Images, fonts, media
+and analytics requests are blocked, and rendered pages are cached in memory for the
+run and on disk for RENDER_CACHE_TTL_H hours. Playwright is optional: without it
+(or with RENDER_BACKEND=static) a plain-HTTP stand-in with the same interface is
+used, which is also what the tests run against.
+
+  page = render.pool().render(url)          # blocking
+  future = render.pool().submit(url)        # queued; Future[Page]
+"""
+
+import os
+import json
+import time
+import queue
+import pathlib
+import threading
+import importlib.util
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+from scripts.utils import create_session, capped_get
+from scripts.embedding_store import text_hash
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+RENDER_CACHE = ROOT / "data" / "processed" / "render_cache"
+
+POOL_SIZE = int(os.getenv("RENDER_POOL_SIZE", "2"))
+TIMEOUT = float(os.getenv("RENDER_TIMEOUT", "30"))  # seconds per page
+CACHE_TTL_H = float(os.getenv("RENDER_CACHE_TTL_H", "12"))
+BACKEND = os.getenv("RENDER_BACKEND", "auto")  # auto | playwright | static
+
+BLOCKED_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.net",
+                 "hotjar.com", "segment.io", "segment.com", "mixpanel.com", "clarity.ms", "newrelic.com")
+
+@dataclass
+class Page:
+    url: str
+    status_code: int
+    text: str
+    rendered: bool = False  # True when JavaScript ran
+
+def should_block(resource_type: str, url: str) -> bool:
+    """Requests a rendered page does not need: heavy assets and analytics."""
+    host = urlsplit(url).netloc.lower()
+    return resource_type in BLOCKED_TYPES or any(host == h or host.endswith("." + h) for h in BLOCKED_HOSTS)
+
+def playwright_available() -> bool:
+    return importlib.util.find_spec("playwright") is not None
+
+class StaticBackend:
+    """Stand-in without a browser: plain GETs, no JavaScript."""
+    name = "static"
+
+    def open(self):
+        return _StaticContext(create_session())
+
+class _StaticContext:
+    def __init__(self, session):
+        self.session = session
+
+    def render(self, url: str, timeout: float) -> Page:
+        r = capped_get(self.session, url, timeout=timeout)
+        return Page(url, r.status_code, r.text)
+
+    def close(self):
+        self.session.close()
+
+class PlaywrightBackend:
+    """Headless Chromium; every worker thread opens its own browser and context
+    (Playwright's sync API objects are bound to the thread that created them)."""
+    name = "playwright"
+
+    def __init__(self):
+        from playwright.sync_api import sync_playwright  # optional dependency
+        self._sync_playwright = sync_playwright
+
+    def open(self):
+        pw = self._sync_playwright().start()
+        try:
+            browser = pw.chromium.launch(headless=True, args=["--disable-gpu", "--disable-dev-shm-usage"])
+            context = browser.new_context(locale="en-US", service_workers="block")
+            context.route("**/*", lambda route: route.abort() if should_block(
+                route.request.resource_type, route.request.url) else route.continue_())
+        except Exception:
+            pw.stop()
+            raise
+        return _PlaywrightContext(pw, browser, context)
+
+class _PlaywrightContext:
+    def __init__(self, pw, browser, context):
+        self.pw, self.browser, self.context = pw, browser, context
+
+    def render(self, url: str, timeout: float) -> Page:
+        page = self.context.new_page()
+        try:
+            response = page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+            try:
+                page.wait_for_load_state("networkidle", timeout=timeout * 500)
+            except Exception:
+                pass  # long-polling pages never go idle; take what has rendered
+            return Page(url, response.status if response else 0, page.content(), rendered=True)
+        finally:
+            page.close()
+
+    def close(self):
+        for close in (self.context.close, self.browser.close, self.pw.stop):
+            try:
+                close()
+            except Exception:
+                pass
+
+def default_backend():
+    if BACKEND == "static" or (BACKEND == "auto" and not playwright_available()):
+        return StaticBackend()
+    return PlaywrightBackend()
+
+class RenderPool:
+    def __init__(self, size: int = POOL_SIZE, backend=None, cache_dir: Optional[pathlib.Path] = None,
+                 cache_ttl_h: float = CACHE_TTL_H, timeout: float = TIMEOUT):
+        self.size = max(1, size)
+        self.backend = backend or default_backend()
+        self.cache_dir = cache_dir or RENDER_CACHE
+        self.cache_ttl_h = cache_ttl_h
+        self.timeout = timeout
+        self.rendered = 0
+        self.cache_hits = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._workers = []
+        self._cache: Dict[str, Page] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, url: str, timeout: Optional[float] = None) -> Future:
+        """Queue a page; the Future resolves to a Page. Cached and in-flight URLs are shared."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("render pool is closed")
+            page = self._cache.get(url) or self._from_disk(url)
+            if page is not None:
+                self.cache_hits += 1
+                self._cache[url] = page
+                done = Future()
+                done.set_result(page)
+                return done
+            if url in self._inflight:
+                return self._inflight[url]
+            future = Future()
+            self._inflight[url] = future
+            if len(self._workers) < self.size:
+                worker = threading.Thread(target=self._work, daemon=True, name=f"render-{len(self._workers)}")
+                self._workers.append(worker)
+                worker.start()
+        self._queue.put((url, timeout or self.timeout, future))
+        return future
+
+    def render(self, url: str, timeout: Optional[float] = None) -> Page:
+        return self.submit(url, timeout).result()
+
+    def render_many(self, urls: Iterable[str]) -> Dict[str, Page]:
+        """Pages for all URLs, rendered in parallel; failed URLs are left out."""
+        futures = {url: self.submit(url) for url in urls}
+        out = {}
+        for url, future in futures.items():
+            try:
+                out[url] = future.result()
+            except Exception as e:
+                print(f"[WARN] render {url}: {e}")
+        return out
+
+    def _work(self):
+        context = None
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            url, timeout, future = item
+            try:
+                if context is None:
+                    context = self.backend.open()
+                page = context.render(url, timeout)
+            except Exception as e:
+                if context is not None:  # a crashed browser is replaced for the next page
+                    context.close()
+                    context = None
+                with self._lock:
+                    self._inflight.pop(url, None)
+                future.set_exception(e)
+                continue
+            with self._lock:
+                self.rendered += 1
+                if page.status_code == 200:
+                    self._cache[url] = page
+                    self._to_disk(page)
+                self._inflight.pop(url, None)
+            future.set_result(page)
+        if context is not None:
+            context.close()
+
+    def _cache_path(self, url: str) -> pathlib.Path:
+        return self.cache_dir / f"{text_hash(url)}.json"
+
+    def _from_disk(self, url: str) -> Optional[Page]:
+        try:
+            with open(self._cache_path(url), "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - cached.get("fetched", 0) > self.cache_ttl_h * 3600:
+            return None
+        return Page(url, cached["status_code"], cached["text"], cached.get("rendered", False))
+
+    def _to_disk(self, page: Page):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._cache_path(page.url)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"url": page.url, "fetched": time.time(), "status_code": page.status_code,
+                       "text": page.text, "rendered": page.rendered}, f)
+        os.replace(tmp, path)
+
+    def close(self):
+        """Stop the workers after the queued pages and close their browsers."""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def pool() -> RenderPool:
+    """Process-wide pool shared by all sources; browsers start on the first page."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = RenderPool()
+        return _pool
+
+def close_pool():
+    """Close the process-wide pool, if one was started, so its browsers exit cleanly."""
+    global _pool
+    with _pool_lock:
+        started, _pool = _pool, None
+    if started is not None:
+        started.close()
@@ -1,7 +1,10 @@
-import os, json, pathlib, numpy as np
+import os, json, heapq, pathlib, numpy as np
 from dotenv import load_dotenv
 from openai import OpenAI
 import tiktoken
+from scripts.embedding_store import EmbeddingStore, text_hash
+from scripts.bm25_index import BM25Index
+from scripts.prefilter import prefilter
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 load_dotenv()
@@ -13,8 +16,20 @@ def get_client():
 JOBS_JL = ROOT / "data" / "processed" / "jobs.jsonl"
 PROFILE = (ROOT / "configs" / "profile.md").read_text(encoding="utf-8")
 OUT_SCORES = ROOT / "outputs" / "scores.jsonl"
+SCORES_META = ROOT / "outputs" / "scores_meta.json"
+PROFILE_KEY = "__profile__"
 
 EMB_MODEL = "text-embedding-3-large"
+# "openai" (remote API) or "local" (CPU-only TF-IDF + SVD, see scripts/local_embeddings.py)
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "openai")
+LOCAL_EMBEDDINGS = ROOT / "outputs" / "embeddings_local.npy"
+LOCAL_EMBEDDINGS_INDEX = ROOT / "outputs" / "embeddings_local_index.json"
+
+# How the embedding score and the BM25 lexical score are combined into the output
+# order: "rrf" (reciprocal rank fusion), "cosine" (embedding only) or "bm25"
+FUSION = os.getenv("SCORE_FUSION", "rrf")
+RRF_K = int(os.getenv("SCORE_RRF_K", "60"))
+LEXICAL_WEIGHT = float(os.getenv("SCORE_LEXICAL_WEIGHT", "0.5"))
 
 def embed(text: str):
     text = text.replace("\n"," ")
@@ -27,74 +42,342 @@ def cosine(a, b):
     if denom == 0: return 0.0
     return float(np.dot(a, b) / denom)
 
-def main():
-    profile_vec = embed(PROFILE)
+class OpenAIBackend:
+    """Embeddings from the OpenAI API, one request per text."""
+    name = "openai"
+    model = EMB_MODEL
+    indexed = True  # feeds the persistent k-NN index used by /similar
+
+    def embed_batch(self, texts):
+        return np.vstack([embed(t) for t in texts])
+
+    def store(self):
+        return EmbeddingStore(self.model)
+
+class LocalBackend:
+    """CPU-only embeddings trained on our own job history; no network."""
+    name = "local"
+    indexed = False
+
+    def __init__(self, corpus):
+        from scripts.local_embeddings import LocalEmbedder
+        self.embedder = LocalEmbedder.for_corpus(list(corpus))
+        self.model = self.embedder.model
+
+    def embed_batch(self, texts):
+        return self.embedder.embed(texts)
+
+    def store(self):
+        # Separate file so switching backends never discards the API embeddings
+        return EmbeddingStore(self.model, LOCAL_EMBEDDINGS, LOCAL_EMBEDDINGS_INDEX)
+
+def get_backend(name=None, jobs=()):
+    """Embedding backend selected by EMBED_BACKEND."""
+    name = name or EMBED_BACKEND
+    if name == "local":
+        return LocalBackend(job_text(j) for j in jobs)
+    if name != "openai":
+        print(f"[WARN] Unknown EMBED_BACKEND '{name}', using openai")
+    return OpenAIBackend()
+
+def normalize_rows(m):
+    """Scale each row to unit length (zero rows stay zero)."""
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.where(norms == 0, 1, norms)
+
+def job_text(j):
+    return f"{j.get('title','')}\n{j.get('jd','')}"
+
+def embed_jobs(jobs, store, backend=None):
+    """Embeddings for all jobs; only new or changed job text is sent to the backend."""
+    backend = backend or OpenAIBackend()
+    vecs = [None] * len(jobs)
+    misses = []
+    for i, j in enumerate(jobs):
+        text = job_text(j)
+        h = text_hash(text)
+        jid = j.get("id")
+        if jid and store.lookup(jid, h) is not None:
+            vecs[i] = store[jid]
+        else:
+            misses.append((i, text, h))
+    if misses:
+        fresh = backend.embed_batch([text for _, text, _ in misses])
+        for (i, _, h), vec in zip(misses, fresh):
+            vecs[i] = vec
+            jid = jobs[i].get("id")
+            if jid:
+                store.put(jid, h, vec)
+    store.save()
+    print(f"[EMBED] {len(misses)} jobs embedded ({backend.name}), {len(jobs) - len(misses)} reused from {store.path.name}")
+    return vecs
+
+def index_vectors(jobs, vecs):
+    """Add this run's job embeddings to the persistent k-NN index; jobs whose text
+    changed since they were indexed get their new vector."""
+    from scripts.vector_index import VectorIndex
+    index = VectorIndex()
+    meta = [{k: j.get(k, "") for k in ("title", "company", "url")} for j in jobs]
+    hashes = [text_hash(job_text(j)) for j in jobs]
+    updated = index.add([j.get("id") for j in jobs], vecs, meta, hashes)
+    print(f"[INDEX] Added or updated {updated} job vectors ({len(index)} indexed)")
+
+def row_hash(j):
+    """Hash of every job field that feeds into its score row."""
+    fields = [j.get(k) or "" for k in ("title", "company", "location", "url", "jd")]
+    return text_hash(json.dumps(fields, ensure_ascii=False))
+
+def scoring_fingerprint(learning=None, model=EMB_MODEL):
+    """Identifies everything besides the job itself that a score depends on."""
+    parts = [PROFILE, model, learning.fingerprint() if learning else "no-learning"]
+    return text_hash("\x00".join(parts))
+
+def load_scores_meta():
+    """Fingerprint and per-job hashes of the previous scoring run."""
+    try:
+        with open(SCORES_META, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return meta if isinstance(meta, dict) else {}
+    except Exception:
+        return {}
+
+def save_scores_meta(fingerprint, hashes):
+    tmp = SCORES_META.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "fusion": FUSION, "rows": hashes}, f)
+    os.replace(tmp, SCORES_META)
+
+def profile_embedding(store, backend=None):
+    """Profile vector, re-embedded only when configs/profile.md changes."""
+    h = text_hash(PROFILE)
+    if store.lookup(PROFILE_KEY, h) is not None:
+        return store[PROFILE_KEY]
+    vec = (backend or OpenAIBackend()).embed_batch([PROFILE])[0]
+    store.put(PROFILE_KEY, h, vec)
+    return vec
+
+def reused_rows(ids, current):
+    """Stream still-valid rows from the previous scores file (already sorted)."""
+    seen = set()
+    with open(OUT_SCORES, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                r = json.loads(line)
+            except:
+                continue
+            jid = r.get("id")
+            if jid not in ids or jid in seen:
+                continue
+            seen.add(jid)
+            j = current[jid]
+            r["age"] = j.get("age", 1)
+            r["first_seen"] = j.get("first_seen", "")
+            yield r
+
+def why_terms(lexical, j):
+    """Profile terms that contribute most to a job's BM25 match."""
+    if lexical is None or not j.get("id"):
+        return []
+    return [t for t, _ in lexical.explain(PROFILE, j["id"])]
+
+def lexical_rows(jobs, lexical, lex):
+    """Offline rows ranked by BM25 alone, for when embeddings are unavailable.
+
+    BM25 is not on the cosine scale SCORE_THRESHOLD assumes, so these rows carry it in
+    `lexical` only, with a zero score and `lexical_only` set; the digest skips them
+    and they are scored properly on the next run with embeddings.
+    """
+    rows = []
+    for j in jobs:
+        terms = why_terms(lexical, j)
+        rows.append({
+            "id": j.get("id"),
+            "title": j.get("title"),
+            "company": j.get("company"),
+            "location": j.get("location"),
+            "url": j.get("url"),
+            "score": 0.0,
+            "lexical": round(lex.get(j.get("id"), 0.0), 4),
+            "lexical_only": True,
+            "base_score": None,
+            "why_fit": f"profile terms: {', '.join(terms)} (offline lexical match)" if terms else "offline lexical match",
+            "age": j.get("age", 1),
+            "first_seen": j.get("first_seen", ""),
+        })
+    rows.sort(key=lambda r: r["lexical"], reverse=True)
+    return rows
+
+def fuse(rows, method=None):
+    """Order score-sorted rows by the configured fusion with their `lexical` score."""
+    method = method or FUSION
+    if method == "bm25":
+        return sorted(rows, key=lambda r: -r.get("lexical", 0.0))
+    if method != "rrf":
+        return rows
+    lex_order = sorted(range(len(rows)), key=lambda i: -rows[i].get("lexical", 0.0))
+    lex_rank = [0] * len(rows)
+    for rank, i in enumerate(lex_order):
+        lex_rank[i] = rank
+    fused = [1.0 / (RRF_K + i + 1) + LEXICAL_WEIGHT / (RRF_K + lex_rank[i] + 1) for i in range(len(rows))]
+    return [rows[i] for i in sorted(range(len(rows)), key=lambda i: -fused[i])]
+
+def score_jobs(jobs, store, learning=None, use_vectors=False, lexical=None, backend=None):
+    """Score rows for the given jobs, sorted by score (best first)."""
+    if not jobs:
+        return []
+    backend = backend or OpenAIBackend()
+    use_learning = learning is not None
+    profile_vec = profile_embedding(store, backend)
+    
+    # Embed every job once (cached on disk), then score the batch with matrix products
+    vecs = np.vstack(embed_jobs(jobs, store, backend))
+    unit = normalize_rows(vecs)
+    base_scores = unit @ normalize_rows(profile_vec[None, :])[0]
+    
+    # Learned preferences: embedding direction from applied vs ignored feedback when
+    # both kinds exist, otherwise the compiled keyword patterns
+    adjustments = None
+    if use_learning:
+        if use_vectors:
+            adjustments = learning.calculate_embedding_preference_scores(unit)
+        else:
+            adjustments = learning.calculate_preference_scores(jobs)
+    
+    rows = []
+    for idx, j in enumerate(jobs):
+        base_score = float(base_scores[idx])
+        
+        # Apply learning adjustments
+        final_score = base_score
+        if use_learning:
+            final_score = base_score + float(adjustments[idx])
+            final_score = max(0.0, min(1.0, final_score))  # Keep between 0-1
+        
+        why = []
+        terms = why_terms(lexical, j)
+        if terms: why.append(f"profile terms: {', '.join(terms)}")
+        
+        # Add learning-based explanations
+        if use_learning and abs(final_score - base_score) > 0.05:
+            if use_vectors:
+                why.append("close to jobs you applied to" if final_score > base_score else "similar to jobs you ignored")
+            else:
+                terms = learning.explain_preference(j.get('title', ''), j.get('company', ''))
+                top = sorted((t for t, w in terms.items() if w > 0), key=lambda t: -terms[t])[:2]
+                if final_score > base_score:
+                    why.append(f"matches learned preferences ({', '.join(top)})" if top else "matches learned preferences")
+                else:
+                    why.append("adjusted based on feedback patterns")
+        
+        rows.append({
+            "id": j.get("id"),
+            "title": j.get("title"),
+            "company": j.get("company"),
+            "location": j.get("location"),
+            "url": j.get("url"),
+            "score": round(final_score, 4),
+            "base_score": round(base_score, 4) if use_learning else None,
+            "why_fit": ", ".join(why) or "strong profile alignment",
+            "age": j.get("age", 1),
+            "first_seen": j.get("first_seen", ""),
+        })
+    rows.sort(key=lambda r: r["score"], reverse=True)
     
+    if backend.indexed:
+        try:
+            index_vectors(jobs, unit)
+        except Exception as e:
+            print(f"[WARN] Could not update vector index: {e}")
+    return rows
+
+def main():
     # Load learning system for preference adjustments
     try:
         from scripts.learning_system import JobLearningSystem
         learning = JobLearningSystem()
-        use_learning = True
         print("[LEARNING] Using learned preferences for scoring adjustments")
     except:
         learning = None
-        use_learning = False
         print("[INFO] Learning system not available - using base scoring only")
     
-    rows = []
+    jobs = []
     with open(JOBS_JL, "r", encoding="utf-8") as f:
         for line in f:
             try:
-                j = json.loads(line)
+                jobs.append(json.loads(line))
             except:
                 continue
-            # Build JD text (title + jd if present)
-            jd_text = f"{j.get('title','')}\n{j.get('jd','')}"
-            vec = embed(jd_text)
-            base_score = cosine(profile_vec, vec)
-            
-            # Apply learning adjustments
-            final_score = base_score
-            if use_learning:
-                preference_adjustment = learning.calculate_preference_score(
-                    j.get('title', ''), 
-                    j.get('company', '')
-                )
-                final_score = base_score + preference_adjustment
-                final_score = max(0.0, min(1.0, final_score))  # Keep between 0-1
-            
-            why = []
-            ttl = (j.get('title','') or '').lower()
-            if 'head' in ttl or 'director' in ttl: why.append("senior leadership scope")
-            if 'devops' in ttl or 'platform' in ttl or 'sre' in ttl: why.append("platform reliability focus")
-            if 'infrastructure' in ttl: why.append("infrastructure expertise match")
-            if 'kubernetes' in j.get('jd','').lower() or 'eks' in j.get('jd','').lower(): why.append("k8s scale")
-            
-            # Add learning-based explanations
-            if use_learning and abs(final_score - base_score) > 0.05:
-                if final_score > base_score:
-                    why.append("matches learned preferences")
-                else:
-                    why.append("adjusted based on feedback patterns")
-            
-            rows.append({
-                "id": j.get("id"),
-                "title": j.get("title"),
-                "company": j.get("company"),
-                "location": j.get("location"),
-                "url": j.get("url"),
-                "score": round(final_score, 4),
-                "base_score": round(base_score, 4) if use_learning else None,
-                "why_fit": ", ".join(why) or "strong profile alignment",
-                "age": j.get("age", 1),
-                "first_seen": j.get("first_seen", ""),
-            })
-    rows.sort(key=lambda r: r["score"], reverse=True)
-    with open(OUT_SCORES, "w", encoding="utf-8") as f:
-        for r in rows:
+    
+    backend = get_backend(jobs=jobs)
+    store = backend.store()
+    use_vectors = learning.learn_from_embeddings(store) if learning else False
+    
+    # Rows from the previous run stay valid while the profile, embedding model,
+    # learned preferences and the job itself are unchanged
+    fingerprint = scoring_fingerprint(learning, backend.model)
+    hashes = {j["id"]: row_hash(j) for j in jobs if j.get("id")}
+    previous = load_scores_meta()
+    reusable = set()
+    if previous.get("fingerprint") == fingerprint and OUT_SCORES.exists():
+        reusable = {jid for jid, h in previous.get("rows", {}).items() if hashes.get(jid) == h}
+    else:
+        print("[INFO] Profile, model or learned preferences changed - rescoring all jobs")
+    todo = [j for j in jobs if j.get("id") not in reusable]
+    
+    # Local BM25 index over title + JD: a lexical ranking signal that needs no network
+    lexical = BM25Index()
+    lexical.update(jobs)
+    lexical.save()
+    ids = list(hashes)
+    lex = dict(zip(ids, lexical.scores(PROFILE, ids).tolist()))
+    
+    # Cheap rule/lexical stage first; only survivors reach the embedding backend.
+    # Screened-out jobs stay out of the cache so they are screened again next run.
+    screened = todo
+    todo, stages = prefilter(todo, lex, None if use_vectors else learning)
+    kept_ids = {id(j) for j in todo}
+    for j in screened:
+        if id(j) not in kept_ids:
+            hashes.pop(j.get("id"), None)
+    print(f"[PREFILTER] {stages['input']} to score -> {stages['rules']} pass rules -> "
+          f"{stages['reach']} can reach threshold -> {stages['embedded']} embedded "
+          f"({stages['input'] - stages['embedded']} {backend.name} embedding calls saved)")
+    
+    try:
+        new_rows = score_jobs(todo, store, learning, use_vectors, lexical, backend)
+    except Exception as e:
+        # Embedding API unavailable: rank new jobs lexically and retry them next run
+        print(f"[WARN] Embedding scoring failed ({e}); ranking {len(todo)} jobs with BM25 only")
+        new_rows = lexical_rows(todo, lexical, lex)
+        for j in todo:
+            hashes.pop(j.get("id"), None)
+    
+    # Heap-merge the fresh rows into the still-valid, already sorted previous rows
+    current = {j["id"]: j for j in jobs if j.get("id")}
+    kept = reused_rows(reusable, current) if reusable else iter(())
+    if previous.get("fusion", "cosine") != "cosine":
+        kept = iter(sorted(kept, key=lambda r: -r["score"]))  # previous file is in fused order
+    merged = heapq.merge(kept, new_rows, key=lambda r: -r["score"])
+    if FUSION != "cosine":
+        merged = list(merged)
+        for r in merged:
+            r["lexical"] = round(lex.get(r.get("id"), 0.0), 4)
+        merged = fuse(merged)
+    top = []
+    total = 0
+    tmp = OUT_SCORES.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for r in merged:
+            r["lexical"] = round(lex.get(r.get("id"), 0.0), 4)
             f.write(json.dumps(r, ensure_ascii=False) + "\n")
-    print(f"[OK] Scored {len(rows)} roles. Top 5:")
-    for r in rows[:5]:
+            total += 1
+            if len(top) < 5:
+                top.append(r)
+    os.replace(tmp, OUT_SCORES)
+    save_scores_meta(fingerprint, hashes)
+    
+    print(f"[OK] Scored {total} roles ({len(new_rows)} new or changed, {total - len(new_rows)} reused, {FUSION} ranking). Top 5:")
+    for r in top:
         print(f"  - {r['title']} @ {r['company']} :: {r['score']}")
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""
+Per-source crawl shards and the merge stage that builds jobs.jsonl.
+
+Each crawler writes its own shard to data/raw/<date>/<source>.jsonl (sorted by
+dedupe key, replaced atomically), so crawlers can run concurrently and a single
+source can be re-run without touching the others. The merge stage combines all
+shards for a day with the existing processed file using a streaming k-way merge.
+"""
+
+import os
+import json
+import heapq
+import pathlib
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from scripts.utils import job_id
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+RAW_DIR = ROOT / "data" / "raw"
+JOBS_JL = ROOT / "data" / "processed" / "jobs.jsonl"
+
+def dedupe_key(record: Dict) -> str:
+    """Key used to detect the same posting across sources."""
+    return "|".join([
+        (record.get("title") or "").lower(),
+        (record.get("company") or "").lower(),
+        (record.get("location") or "").lower(),
+    ])
+
+def shard_dir(day: Optional[str] = None) -> pathlib.Path:
+    """Directory holding all shards for a given day (default: today)."""
+    return RAW_DIR / (day or date.today().isoformat())
+
+def shard_path(source: str, day: Optional[str] = None) -> pathlib.Path:
+    """Path of the shard written by `source` for a given day."""
+    return shard_dir(day) / f"{source}.jsonl"
+
+def write_shard(source: str, records: Iterable[Dict], day: Optional[str] = None) -> pathlib.Path:
+    """Write (or replace) the shard for a source, sorted by dedupe key."""
+    rows = []
+    for r in records:
+        if not r.get("id"):
+            r["id"] = job_id(r)
+        rows.append(r)
+    rows.sort(key=dedupe_key)
+
+    path = shard_path(source, day)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".jsonl.tmp{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+    print(f"[SHARD] Wrote {len(rows)} records to {path}")
+    return path
+
+def iter_jsonl(path: pathlib.Path) -> Iterator[Dict]:
+    """Stream records from a JSONL file, skipping malformed lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+def _is_sorted(path: pathlib.Path) -> bool:
+    prev = None
+    for r in iter_jsonl(path):
+        k = dedupe_key(r)
+        if prev is not None and k < prev:
+            return False
+        prev = k
+    return True
+
+def _run(records: Iterable[Dict], rank: int) -> Iterator[Tuple[str, int, Dict]]:
+    for r in records:
+        yield dedupe_key(r), rank, r
+
+def _processed_run(path: pathlib.Path) -> Iterable[Dict]:
+    """The existing processed file as a sorted run.
+
+    The merge stage always writes jobs.jsonl in key order, so it normally streams;
+    files produced by older appenders are sorted in memory once.
+    """
+    if _is_sorted(path):
+        return iter_jsonl(path)
+    print(f"[MERGE] {path.name} is not in key order; sorting it once in memory")
+    return sorted(iter_jsonl(path), key=dedupe_key)
+
+def merge_shards(day: Optional[str] = None, out: Optional[pathlib.Path] = None,
+                 sources: Optional[List[str]] = None) -> Dict:
+    """Merge a day's shards into the processed jobs file.
+
+    Records already in the processed file win over shard records with the same
+    key (they carry id, age and first_seen); between shards the source name
+    order decides. Returns counts for reporting.
+    """
+    out = out or JOBS_JL
+    paths = sorted(shard_dir(day).glob("*.jsonl"))
+    if sources:
+        paths = [p for p in paths if p.stem in sources]
+
+    runs = []
+    if out.exists():
+        runs.append(_run(_processed_run(out), 0))
+    for rank, p in enumerate(paths, 1):
+        runs.append(_run(iter_jsonl(p), rank))
+
+    stats = {"shards": len(paths), "written": 0, "new": 0, "duplicates": 0}
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(f".jsonl.tmp{os.getpid()}")
+    last_key = None
+    with open(tmp, "w", encoding="utf-8") as f:
+        for key, rank, r in heapq.merge(*runs, key=lambda t: (t[0], t[1])):
+            if key == last_key:
+                stats["duplicates"] += 1
+                continue
+            last_key = key
+            if not r.get("id"):
+                r["id"] = job_id(r)
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            stats["written"] += 1
+            if rank:
+                stats["new"] += 1
+    os.replace(tmp, out)
+    return stats
+
+def main():
+    """Merge today's shards (or `python scripts/shards.py <date> [source ...]`)."""
+    import sys
+
+    day = sys.argv[1] if len(sys.argv) > 1 else None
+    sources = sys.argv[2:] or None
+    stats = merge_shards(day, sources=sources)
+    print(f"[OK] Merged {stats['shards']} shards into {JOBS_JL}: "
+          f"{stats['new']} new, {stats['duplicates']} duplicates, {stats['written']} total")
+
+if __name__ == "__main__":
+    main()
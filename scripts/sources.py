@@ -0,0 +1,273 @@
+"""
+Crawl source plugins.
+
+A source describes one place jobs come from in four steps, and the scheduler in
+scripts/crawl_scheduler.py runs every registered source concurrently:
+
+  discover()                -> targets (dicts with at least a "key", usually a company)
+  fetch(target, http)       -> raw payload, via the scheduler's shared rate-limited HTTP client
+  parse(target, payload)    -> raw items
+  normalize(target, item)   -> job record (or None to drop it)
+
+Only `keep(record)` survivors are written to the source's shard. Adding a source
+means subclassing Source and decorating it with @register; no new script.
+"""
+
+import abc
+import importlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+SOURCES: Dict[str, "Source"] = {}
+
+def register(cls):
+    """Class decorator adding a source to the registry under its name."""
+    SOURCES[cls.name] = cls()
+    return cls
+
+class Source(abc.ABC):
+    name = ""
+    enabled = True       # part of a default run; disabled sources run only when named
+    rate = 2.0           # requests per second across this source's workers
+    concurrency = 4      # targets fetched in parallel
+    budget = 200         # max targets per run
+    timeout = 300.0      # seconds; targets not started by then are skipped
+    validators = False   # keep responses on disk and re-request them with ETag/Last-Modified
+
+    def discover(self) -> Iterable[Dict]:
+        return []
+
+    def fetch(self, target: Dict, http):
+        return http.get_json(target["url"], params=target.get("params"), revalidate=self.validators)
+
+    def parse(self, target: Dict, payload) -> Iterable:
+        return payload or []
+
+    @abc.abstractmethod
+    def normalize(self, target: Dict, item) -> Optional[Dict]:
+        """A job record for one parsed item, or None to drop it."""
+
+    def keep(self, record: Dict) -> bool:
+        from scripts.crawl import title_matches, location_matches
+        return title_matches(record.get("title", "")) and location_matches(record.get("location", ""))
+
+def _board_companies(board: str) -> List[str]:
+    from scripts.crawl import CFG
+    return CFG.get("sources", {}).get(board, {}).get("companies", [])
+
+def _ats_companies(ats: str, default: List[str]) -> List[str]:
+    """Companies for an Israeli ATS from boards.yaml (sources.israeli_sources.apis.<ats>)."""
+    from scripts.crawl import CFG
+    apis = CFG.get("sources", {}).get("israeli_sources", {}).get("apis", {})
+    return (apis.get(ats) or {}).get("companies") or default
+
+def _released(posting: Dict) -> Optional[datetime]:
+    """A posting's releasedDate as an aware datetime (UTC when it carries no offset)."""
+    try:
+        dt = datetime.fromisoformat(posting.get("releasedDate", "").replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+@register
+class GreenhouseSource(Source):
+    name = "greenhouse"
+
+    def discover(self):
+        for company in _board_companies("greenhouse"):
+            yield {"key": company, "url": f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs"}
+
+    def parse(self, target, payload):
+        return (payload or {}).get("jobs", [])
+
+    def normalize(self, target, item):
+        from scripts.crawl import normalize_gh
+        return normalize_gh(item)
+
+@register
+class LeverSource(Source):
+    name = "lever"
+
+    def discover(self):
+        for company in _board_companies("lever"):
+            yield {"key": company, "url": f"https://api.lever.co/v0/postings/{company}?mode=json"}
+
+    def normalize(self, target, item):
+        from scripts.crawl import normalize_lever
+        return normalize_lever(item)
+
+@register
+class ComeetSource(Source):
+    name = "comeet"
+    # Every company is its own <company>.comeet.co host, so the per-host limit is the
+    # only one that matters and many companies can be fetched at once
+    rate = 0
+    concurrency = 16
+    validators = True
+
+    def discover(self):
+        from scripts.israeli_job_sources import COMEET_COMPANIES, comeet_url
+        for company in _ats_companies("comeet", COMEET_COMPANIES):
+            yield {"key": company, "url": comeet_url(company)}
+
+    def normalize(self, target, item):
+        from scripts.israeli_job_sources import comeet_record
+        return comeet_record(target["key"], item)
+
+    def keep(self, record):
+        return True  # comeet_record already filters title and location
+
+@register
+class SmartRecruitersSource(Source):
+    name = "smartrecruiters"
+    rate = 8.0
+    concurrency = 8
+    validators = True
+    page_size = 100
+
+    def discover(self):
+        from scripts.israeli_job_sources import SMARTRECRUITERS_COMPANIES, smartrecruiters_url
+        for company in _ats_companies("smartrecruiters", SMARTRECRUITERS_COMPANIES):
+            yield {"key": company, "url": smartrecruiters_url(company), "params": {"country": "il"}}
+
+    def fetch(self, target, http):
+        return self.postings(target, http)
+
+    def postings(self, target, http):
+        """Postings page by page, lazily; stops at the first page entirely older than
+        the job tracking window (postings come newest first), so old history is never read."""
+        from scripts.job_tracker import MAX_AGE
+        cutoff = datetime.now(timezone.utc) - timedelta(days=MAX_AGE)
+        offset = 0
+        while True:
+            page = http.get_json(target["url"], params={**target.get("params", {}), "limit": self.page_size,
+                                                        "offset": offset}, revalidate=self.validators) or {}
+            content = page.get("content", [])
+            dated = [(p, _released(p)) for p in content]
+            fresh = [p for p, released in dated if not (released and released < cutoff)]
+            yield from fresh
+            offset += len(content)
+            if not content or not fresh or offset >= page.get("totalFound", 0):
+                return
+
+    def normalize(self, target, item):
+        from scripts.israeli_job_sources import smartrecruiters_record
+        return smartrecruiters_record(target["key"], item)
+
+    def keep(self, record):
+        return True
+
+class FunctionSource(Source):
+    """Adapter for the older search_* crawlers, which do their own HTTP and filtering.
+
+    Each function ("module:function") is one target, so a source's functions run in
+    parallel and alongside every other source instead of one script after another.
+    """
+    functions: List[str] = []
+    args: Dict[str, str] = {}  # function -> "module:function" returning its single argument
+    rendered: List[str] = []   # functions taking fetch=; given Http.render, their pages go through the rendering pool
+
+    def discover(self):
+        for spec in self.functions:
+            yield {"key": spec.split(":")[1], "fn": spec}
+
+    def fetch(self, target, http):
+        fn = _resolve(target["fn"])
+        arg = self.args.get(target["fn"])
+        kwargs = {"fetch": http.render} if target["fn"] in self.rendered else {}
+        return fn(_resolve(arg)(), **kwargs) if arg else fn(**kwargs)
+
+    def normalize(self, target, item):
+        return item
+
+    def keep(self, record):
+        return True
+
+def _resolve(spec: str):
+    module, attr = spec.split(":")
+    return getattr(importlib.import_module(module), attr)
+
+@register
+class RealJobsSource(FunctionSource):
+    name = "real_jobs"
+    functions = ["scripts.real_job_finder:get_greenhouse_devops_jobs",
+                 "scripts.real_job_finder:get_verified_company_jobs",
+                 "scripts.real_job_finder:get_research_based_jobs",
+                 "scripts.real_job_finder:get_job_board_aggregated_jobs"]
+
+@register
+class VerifiedRealSource(FunctionSource):
+    name = "verified_real"
+    functions = ["scripts.real_verified_jobs:add_verified_jobs",
+                 "scripts.real_verified_jobs:search_more_real_positions"]
+
+@register
+class IsraeliSourcesSource(FunctionSource):
+    name = "israeli_sources"
+    functions = ["scripts.israeli_job_sources:search_alljobs",
+                 "scripts.israeli_job_sources:search_themarker_rss"]
+
+@register
+class TopCompaniesSource(FunctionSource):
+    name = "top_israeli_companies"
+    functions = ["scripts.top_israeli_companies:search_top_israeli_companies",
+                 "scripts.top_israeli_companies:search_medium_priority_companies"]
+
+@register
+class KnownJobsSource(FunctionSource):
+    name = "known_jobs"
+    functions = ["scripts.add_known_jobs:add_known_jobs"]
+
+@register
+class IsraeliJobBoardsSource(FunctionSource):
+    name = "israeli_job_boards"
+    enabled = False
+    functions = ["scripts.israeli_job_boards:search_alljobs_direct",
+                 "scripts.israeli_job_boards:search_jobmaster_direct",
+                 "scripts.israeli_job_boards:search_drushim_direct",
+                 "scripts.israeli_job_boards:search_glassdoor_israel"]
+    args = {f: "scripts.israeli_job_boards:load_position_types" for f in functions}
+
+@register
+class WorkaroundsSource(FunctionSource):
+    name = "workarounds"
+    functions = ["scripts.job_board_workarounds:search_alljobs_workaround",
+                 "scripts.job_board_workarounds:search_themarker_workaround",
+                 "scripts.job_board_workarounds:search_linkedin_workaround",
+                 "scripts.job_board_workarounds:search_glassdoor_workaround"]
+    # LinkedIn's endpoints are XHR APIs read with the stealth session, not pages to render
+    rendered = [f for f in functions if "linkedin" not in f]
+
+@register
+class CareerPagesSource(Source):
+    """One target per company; pages come through the rendering pool (Http.render)."""
+    name = "career_pages"
+    rate = 0  # every company is its own host; the per-host limit applies
+    concurrency = 4
+
+    def discover(self):
+        from scripts import dns_cache
+        from scripts.career_page_scraper import MAJOR_COMPANIES, career_urls_for
+        # Resolve every candidate host of every company in parallel up front
+        dns_cache.cache().prewarm(dns_cache.host_of(u) for c in MAJOR_COMPANIES for u in career_urls_for(c))
+        for company in MAJOR_COMPANIES:
+            yield {"key": company["name"], "company": company}
+
+    def fetch(self, target, http):
+        from scripts.career_page_scraper import search_company_careers, load_position_types
+        return search_company_careers(target["company"], load_position_types(), fetch=http.render)
+
+    def normalize(self, target, item):
+        return item
+
+    def keep(self, record):
+        return True  # search_company_careers already matches titles
+
+def get_sources(names: Optional[Iterable[str]] = None) -> List[Source]:
+    """Named sources (any, including disabled ones), or every enabled source."""
+    if names:
+        unknown = [n for n in names if n not in SOURCES]
+        if unknown:
+            raise SystemExit(f"Unknown source(s): {', '.join(unknown)}. Known: {', '.join(SOURCES)}")
+        return [SOURCES[n] for n in names]
+    return [s for s in SOURCES.values() if s.enabled]
@@ -1,6 +1,9 @@
 import os, json, pathlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from openai import OpenAI
+from scripts.embedding_store import text_hash
+from scripts.utils import retry_on_rate_limit
 
 load_dotenv()
 ROOT = pathlib.Path(__file__).resolve().parents[1]
@@ -10,26 +13,72 @@ def get_client():
     return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 SCORES = ROOT / "outputs" / "scores.jsonl"
+SCORES_INDEX = ROOT / "outputs" / "scores_index.json"
+COVER_CACHE = ROOT / "outputs" / "cover_notes"
 PROFILE = (ROOT / "configs" / "profile.md").read_text(encoding="utf-8")
 COVER_TPL = (ROOT / "configs" / "prompts" / "cover_note.j2").read_text(encoding="utf-8")
 
-def pick(job_id: str):
-    with open(SCORES, "r", encoding="utf-8") as f:
+THRESHOLD = float(os.getenv("SCORE_THRESHOLD", "0.78"))
+BATCH_SIZE = int(os.getenv("COVER_BATCH", "10"))
+CONCURRENCY = int(os.getenv("COVER_CONCURRENCY", "4"))
+MAX_RETRIES = 5
+
+def _file_stamp(path):
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+def load_index():
+    """Job id -> byte offset of its row in scores.jsonl; rebuilt whenever the file changes."""
+    stamp = _file_stamp(SCORES)
+    try:
+        with open(SCORES_INDEX, "r", encoding="utf-8") as f:
+            idx = json.load(f)
+        if idx.get("scores") == stamp:
+            return idx["offsets"]
+    except Exception:
+        pass
+
+    offsets = {}
+    pos = 0
+    with open(SCORES, "rb") as f:
         for line in f:
-            j = json.loads(line)
-            if j.get("id") == job_id:
-                return j
-    raise SystemExit("Job ID not found in outputs/scores.jsonl")
+            try:
+                jid = json.loads(line).get("id")
+            except Exception:
+                jid = None
+            if jid and jid not in offsets:
+                offsets[jid] = pos
+            pos += len(line)
+    try:
+        tmp = SCORES_INDEX.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"scores": stamp, "offsets": offsets}, f)
+        os.replace(tmp, SCORES_INDEX)
+    except OSError as e:
+        print(f"[WARN] Could not save {SCORES_INDEX.name}: {e}")
+    return offsets
 
-def gen_cover(job):
-    prompt = f"""You are drafting a brief, high-signal cover note (120-150 words) for Litan Shabtai Shamir.
-    Job title: {job.get('title')}
-    Company: {job.get('company')}
-    JD URL: {job.get('url')}
+def pick(job_id: str):
+    offset = load_index().get(job_id)
+    if offset is None:
+        raise SystemExit("Job ID not found in outputs/scores.jsonl")
+    with open(SCORES, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+# The prompt actually sent; cached notes are keyed on it, so editing it regenerates them
+COVER_PROMPT = """You are drafting a brief, high-signal cover note (120-150 words) for Litan Shabtai Shamir.
+    Job title: {title}
+    Company: {company}
+    JD URL: {url}
     Candidate profile:
-    {PROFILE}
+    {profile}
     Write 1 paragraph, crisp, metrics-forward, no fluff, focus on production ownership, live-event readiness, observability, GitOps, and leadership.
     """
+
+def gen_cover(job):
+    prompt = COVER_PROMPT.format(title=job.get('title'), company=job.get('company'), url=job.get('url'),
+                                 profile=PROFILE)
     client = get_client()
     resp = client.chat.completions.create(
         model="gpt-4o-mini",
@@ -38,9 +87,73 @@ def gen_cover(job):
     )
     return resp.choices[0].message.content.strip()
 
+def gen_cover_with_retry(job, retries: int = MAX_RETRIES):
+    return retry_on_rate_limit(gen_cover, job, retries=retries, label=job.get("id", "")[:12])
+
+def cache_path(job_id: str) -> pathlib.Path:
+    """Cover note cache entry for (job id, profile hash, prompt hash)."""
+    key = text_hash(f"{job_id}|{text_hash(PROFILE)}|{text_hash(COVER_PROMPT)}")
+    return COVER_CACHE / f"{key}.txt"
+
+def cached_cover(job_id: str):
+    path = cache_path(job_id)
+    return path.read_text(encoding="utf-8") if path.exists() else None
+
+def cover_for(job, refresh: bool = False):
+    """Cover note for a job, generated once and then served from the disk cache."""
+    if not refresh:
+        cached = cached_cover(job.get("id", ""))
+        if cached is not None:
+            return cached
+    note = gen_cover_with_retry(job)
+    path = cache_path(job.get("id", ""))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(note, encoding="utf-8")
+    os.replace(tmp, path)
+    return note
+
+def top_jobs(n: int = BATCH_SIZE):
+    """First n digest-eligible rows (above threshold, not applied or ignored)."""
+    from scripts.job_state import job_state
+    jobs = []
+    with open(SCORES, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                r = json.loads(line)
+            except:
+                continue
+            jid = r.get("id")
+            if not jid or r.get("score", 0) < THRESHOLD or r.get("lexical_only") or job_state.is_applied(jid) or job_state.is_ignored(jid):
+                continue
+            jobs.append(r)
+            if len(jobs) >= n:
+                break
+    return jobs
+
+def batch_covers(jobs, concurrency: int = CONCURRENCY):
+    """Pre-generate cover notes for jobs not yet cached, `concurrency` requests at a time."""
+    todo = [j for j in jobs if cached_cover(j.get("id", "")) is None]
+    done, failed = 0, 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(cover_for, j): j for j in todo}
+        for fut in as_completed(futures):
+            job = futures[fut]
+            try:
+                fut.result()
+                done += 1
+            except Exception as e:
+                failed += 1
+                print(f"[WARN] Cover note failed for {job.get('title')} @ {job.get('company')}: {e}")
+    print(f"[OK] Cover notes: {done} generated, {len(jobs) - len(todo)} cached, {failed} failed")
+    return {"generated": done, "cached": len(jobs) - len(todo), "failed": failed}
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
-        raise SystemExit("Usage: python scripts/tailor.py <JOB_ID>")
-    job = pick(sys.argv[1])
-    print(gen_cover(job))
+        raise SystemExit("Usage: python scripts/tailor.py <JOB_ID> | --batch [N]")
+    if sys.argv[1] == "--batch":
+        batch_covers(top_jobs(int(sys.argv[2]) if len(sys.argv) > 2 else BATCH_SIZE))
+    else:
+        job = pick(sys.argv[1])
+        print(cover_for(job))
@@ -82,6 +82,10 @@ class TelegramBot:
                     }
                 ],
                 [
+                    {
+                        "text": "📝 Cover Letter",
+                        "callback_data": f"cover_{job_id}"
+                    },
                     {
                         "text": "❌ Not Relevant",
                         "callback_data": ignore_data
@@ -120,6 +124,8 @@ class TelegramBot:
             message += f"\n⭐ Score: {score}{age_info}"
             if why_fit:
                 message += f"\n💡 {why_fit}"
+            if job.get("intros"):
+                message += f"\n🤝 Warm intro: {', '.join(job['intros'])}"
             
             # Create keyboard
             keyboard = self.create_job_keyboard(job_id, url)
@@ -206,6 +212,10 @@ class TelegramBot:
                 confirmation += f"🤖 <i>Automatically syncing with GitHub Actions...</i>"
                 self.send_message(confirmation)
                 
+            elif callback_data.startswith("cover_"):
+                job_id = callback_data.replace("cover_", "")
+                self.send_cover_letter(job_id)
+                
             elif callback_data.startswith("undo_apply_"):
                 job_id = callback_data.replace("undo_apply_", "")
                 success = job_state.remove_applied(job_id)
@@ -237,6 +247,19 @@ class TelegramBot:
             logger.error(f"Error handling callback: {e}")
             self.answer_callback_query(callback_query_id, "❌ Error processing request")
     
+    def send_cover_letter(self, job_id: str):
+        """Send a job's cover note (pre-generated by `tailor.py --batch`, else generated now)."""
+        import html
+        from scripts import tailor
+        
+        try:
+            job = tailor.pick(job_id)
+        except SystemExit:
+            self.send_message(f"📝 Job <code>{job_id[:12]}</code> is no longer in the scored jobs.")
+            return
+        note = tailor.cover_for(job)
+        self.send_message(f"📝 <b>Cover note: {job.get('title', '')} @ {job.get('company', '')}</b>\n\n{html.escape(note)}")
+    
     def edit_message(self, message_id: int, new_text: str, reply_markup: Optional[Dict] = None):
         """Edit an existing message."""
         url = f"{self.base_url}/editMessageText"
@@ -346,6 +369,7 @@ class TelegramBot:
 📊 <code>/stats</code> - Show job statistics
 📝 <code>/applied</code> - List applied jobs
 ❌ <code>/ignored</code> - List ignored jobs
+🧭 <code>/similar [job_id]</code> - Jobs like one you applied to
 🧹 <code>/clean</code> - Clean old jobs
 🔄 <code>/help</code> - Show this help
 
@@ -385,6 +409,10 @@ Use /applied or /ignored to see specific jobs."""
         elif command == "/ignored":
             self.list_job_category("ignored")
             
+        elif command.startswith("/similar"):
+            parts = command.split()
+            self.send_similar_jobs(parts[1] if len(parts) > 1 else "")
+            
         elif command == "/clean":
             self.send_message("🧹 <b>Cleaning Old Jobs...</b>\n\n⏳ Removing jobs older than 14 days...")
             self.trigger_github_search_pipeline("clean")
@@ -421,6 +449,34 @@ Use /applied or /ignored to see specific jobs."""
         
         self.send_message(message)
     
+    def send_similar_jobs(self, job_id: str = "", k: int = 5):
+        """Send the nearest indexed jobs to a job (default: the latest applied one)."""
+        from scripts.vector_index import load_synced
+        
+        if not job_id:
+            applied = job_state.data.get("applied", {})
+            if not applied:
+                self.send_message("🧭 No applied jobs yet. Usage: <code>/similar &lt;job_id&gt;</code>")
+                return
+            job_id = max(applied, key=lambda j: applied[j].get("date", ""))
+        
+        # Built from the persisted embedding store on first use; the index itself is local
+        index = load_synced()
+        results = index.similar_to(job_id, k)
+        if not results:
+            self.send_message(f"🧭 Job <code>{job_id[:12]}</code> is not in the similarity index yet.")
+            return
+        
+        source = index.info(job_id) if job_id in index else {}
+        message = f"🧭 <b>Jobs similar to {source.get('title', job_id[:12])}</b>\n\n"
+        for jid, sim in results:
+            info = index.info(jid)
+            message += f"• <b>{info.get('title', 'Unknown')}</b> @ {info.get('company', 'Unknown')} ({sim:.2f})\n"
+            if info.get("url"):
+                message += f"  🔗 {info['url']}\n"
+            message += f"  🆔 <code>{jid[:12]}</code>\n"
+        self.send_message(message)
+    
     def trigger_github_search_pipeline(self, search_type: str):
         """Trigger GitHub Actions to run job search pipeline."""
         if not GITHUB_TOKEN:
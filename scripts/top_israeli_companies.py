@@ -3,13 +3,15 @@ Top Israeli tech companies for 2025 - comprehensive list for DevOps leadership r
 Based on current market cap, funding, and growth trajectory.
 """
 
-import requests
 import json
 from datetime import date
 import pathlib
 from scripts.utils import create_session, job_id
+from scripts.shards import write_shard
+from scripts.ats_fingerprint import ats_map
+from scripts.jsonld import job_postings, page_records
+from scripts.async_crawl import probe_sync
 from bs4 import BeautifulSoup
-import time
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 
@@ -108,6 +110,7 @@ def search_top_israeli_companies():
     
     companies = get_all_companies_list()
     high_priority_companies = {k: v for k, v in companies.items() if v.get("priority") == "High"}
+    boards = ats_map()
     
     print(f"[TOP_ISRAELI] Searching {len(high_priority_companies)} high-priority Israeli tech companies...")
     
@@ -135,56 +138,73 @@ def search_top_israeli_companies():
         "VP Engineering", "VP of Engineering", "Director of Engineering", "CTO", "Chief Technology Officer", "VP Technology", "VP of Technology"
     ]
     
+    # Companies with a detected job board: one JSON request instead of probing pages
+    candidates = {}
     for company_key, company_info in high_priority_companies.items():
+        company_name = company_info["name"]
+        known = boards.known_jobs(company_key, session, display=company_name)
+        if known is not None:
+            jobs.extend(known)
+            print(f"[TOP_ISRAELI] {company_name}: {len(known)} matching jobs via its job board API")
+            continue
+        
+        # Try multiple career page URL patterns
+        candidates[company_key] = [
+            f"https://{company_key}.com/careers",
+            f"https://www.{company_key}.com/careers",
+            f"https://{company_key}.com/jobs",
+            f"https://careers.{company_key}.com",
+            f"https://jobs.{company_key}.com",
+            f"https://{company_name.lower().replace(' ', '')}.com/careers",
+            f"https://www.{company_name.lower().replace(' ', '')}.com/careers"
+        ]
+    
+    # All URL patterns of all companies are probed concurrently; the first working
+    # URL of each company (in the order above) is the one read
+    pages = probe_sync(candidates)
+    
+    for company_key, page in pages.items():
+        if page is None:
+            continue
+        company_info = high_priority_companies[company_key]
+        company_name = company_info["name"]
+        url = page.url
         try:
-            company_name = company_info["name"]
-            
-            # Try multiple career page URL patterns
-            career_urls = [
-                f"https://{company_key}.com/careers",
-                f"https://www.{company_key}.com/careers",
-                f"https://{company_key}.com/jobs",
-                f"https://careers.{company_key}.com",
-                f"https://jobs.{company_key}.com",
-                f"https://{company_name.lower().replace(' ', '')}.com/careers",
-                f"https://www.{company_name.lower().replace(' ', '')}.com/careers"
-            ]
-            
-            for url in career_urls:
-                try:
-                    response = session.get(url, timeout=20)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        page_text = soup.get_text().lower()
-                        
-                        # Look for DevOps leadership keywords
-                        for keyword in devops_keywords:
-                            if keyword.lower() in page_text and ("israel" in page_text or "tel aviv" in page_text):
-                                job = {
-                                    "title": keyword,
-                                    "company": company_name,
-                                    "location": "Israel",
-                                    "url": url,
-                                    "source": f"top_israeli_{company_info['tier']}",
-                                    "posted_at": date.today().isoformat(),
-                                    "jd": f"DevOps leadership role at {company_name} ({company_info['sector']}). {company_info['valuation']} valuation company.",
-                                    "id": job_id({
-                                        "title": keyword,
-                                        "company": company_name,
-                                        "location": "Israel",
-                                        "url": url
-                                    })
-                                }
-                                jobs.append(job)
-                                print(f"[TOP_ISRAELI] {keyword} @ {company_name} ({company_info['sector']}) - {url}")
-                                break  # Only add one job per company
-                        
-                        break  # Found working URL, stop trying others
-                        
-                except Exception as e:
+            board = boards.learn(company_key, page.text, url)
+            if board and board["ats"] != "jsonld":
+                known = boards.known_jobs(company_key, session, display=company_name)
+                if known is not None:
+                    jobs.extend(known)
                     continue
+            if job_postings(page.text):
+                # JobPosting JSON-LD: real titles, per-job URLs and dates
+                jobs.extend(page_records(page.text, url, company_name, f"top_israeli_{company_info['tier']}",
+                                         titles=devops_keywords, default_location="Israel"))
+                continue
+            soup = BeautifulSoup(page.text, 'html.parser')
+            page_text = soup.get_text().lower()
             
-            time.sleep(0.5)  # Rate limiting
+            # Look for DevOps leadership keywords
+            for keyword in devops_keywords:
+                if keyword.lower() in page_text and ("israel" in page_text or "tel aviv" in page_text):
+                    job = {
+                        "title": keyword,
+                        "company": company_name,
+                        "location": "Israel",
+                        "url": url,
+                        "source": f"top_israeli_{company_info['tier']}",
+                        "posted_at": date.today().isoformat(),
+                        "jd": f"DevOps leadership role at {company_name} ({company_info['sector']}). {company_info['valuation']} valuation company.",
+                        "id": job_id({
+                            "title": keyword,
+                            "company": company_name,
+                            "location": "Israel",
+                            "url": url
+                        })
+                    }
+                    jobs.append(job)
+                    print(f"[TOP_ISRAELI] {keyword} @ {company_name} ({company_info['sector']}) - {url}")
+                    break  # Only add one job per company
             
         except Exception as e:
             print(f"[TOP_ISRAELI] Error for {company_name}: {e}")
@@ -199,57 +219,68 @@ def search_medium_priority_companies():
     
     companies = get_all_companies_list()
     medium_priority_companies = {k: v for k, v in companies.items() if v.get("priority") == "Medium"}
+    boards = ats_map()
     
     print(f"[MEDIUM_PRIORITY] Searching {len(medium_priority_companies)} medium-priority companies...")
     
+    # Look for senior DevOps roles
+    senior_keywords = ["Head of DevOps", "DevOps Director", "Platform Director", "VP Engineering"]
+    
     # Limit to first 10 to avoid too many requests
+    candidates = {}
     for company_key, company_info in list(medium_priority_companies.items())[:10]:
+        company_name = company_info["name"]
+        known = boards.known_jobs(company_key, session, display=company_name)
+        if known is not None:
+            jobs.extend(known)
+            continue
+        
+        # Try main career page only for medium priority
+        candidates[company_key] = [
+            f"https://{company_key}.com/careers",
+            f"https://www.{company_key}.com/careers"
+        ]
+    
+    for company_key, page in probe_sync(candidates).items():
+        if page is None:
+            continue
+        company_info = medium_priority_companies[company_key]
+        company_name = company_info["name"]
+        url = page.url
         try:
-            company_name = company_info["name"]
-            
-            # Try main career page only for medium priority
-            career_urls = [
-                f"https://{company_key}.com/careers",
-                f"https://www.{company_key}.com/careers"
-            ]
-            
-            for url in career_urls:
-                try:
-                    response = session.get(url, timeout=15)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        page_text = soup.get_text().lower()
-                        
-                        # Look for senior DevOps roles
-                        senior_keywords = ["Head of DevOps", "DevOps Director", "Platform Director", "VP Engineering"]
-                        
-                        for keyword in senior_keywords:
-                            if keyword.lower() in page_text:
-                                job = {
-                                    "title": keyword,
-                                    "company": company_name,
-                                    "location": "Israel",
-                                    "url": url,
-                                    "source": f"medium_priority_{company_info['tier']}",
-                                    "posted_at": date.today().isoformat(),
-                                    "jd": f"Senior DevOps role at {company_name} ({company_info['sector']}).",
-                                    "id": job_id({
-                                        "title": keyword,
-                                        "company": company_name,
-                                        "location": "Israel",
-                                        "url": url
-                                    })
-                                }
-                                jobs.append(job)
-                                print(f"[MEDIUM_PRIORITY] {keyword} @ {company_name}")
-                                break
-                        
-                        break
-                        
-                except Exception as e:
+            board = boards.learn(company_key, page.text, url)
+            if board and board["ats"] != "jsonld":
+                known = boards.known_jobs(company_key, session, display=company_name)
+                if known is not None:
+                    jobs.extend(known)
                     continue
+            if job_postings(page.text):
+                jobs.extend(page_records(page.text, url, company_name, f"medium_priority_{company_info['tier']}",
+                                         titles=senior_keywords, default_location="Israel"))
+                continue
+            soup = BeautifulSoup(page.text, 'html.parser')
+            page_text = soup.get_text().lower()
             
-            time.sleep(0.3)
+            for keyword in senior_keywords:
+                if keyword.lower() in page_text:
+                    job = {
+                        "title": keyword,
+                        "company": company_name,
+                        "location": "Israel",
+                        "url": url,
+                        "source": f"medium_priority_{company_info['tier']}",
+                        "posted_at": date.today().isoformat(),
+                        "jd": f"Senior DevOps role at {company_name} ({company_info['sector']}).",
+                        "id": job_id({
+                            "title": keyword,
+                            "company": company_name,
+                            "location": "Israel",
+                            "url": url
+                        })
+                    }
+                    jobs.append(job)
+                    print(f"[MEDIUM_PRIORITY] {keyword} @ {company_name}")
+                    break
             
         except Exception as e:
             continue
@@ -295,11 +326,8 @@ def main():
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(unique_jobs, f, indent=2, ensure_ascii=False)
         
-        # Append to main jobs file
-        jobs_file = ROOT / "data" / "processed" / "jobs.jsonl"
-        with open(jobs_file, "a", encoding="utf-8") as f:
-            for job in unique_jobs:
-                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        # Write this source's shard; scripts/shards.py merges it into jobs.jsonl
+        write_shard("top_israeli_companies", unique_jobs)
         
         print(f"\n[SUCCESS] Found {len(unique_jobs)} DevOps leadership roles from top Israeli companies")
         print(f"[INFO] Sources: {len(high_priority_jobs)} high-priority, {len(medium_priority_jobs)} medium-priority")
@@ -1,9 +1,17 @@
-import os, hashlib, re, time
+import os, hashlib, re, time, random, threading, codecs
 import requests
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+MAX_BODY_BYTES = int(os.getenv("HTTP_MAX_BODY_BYTES", str(2 * 1024 * 1024)))
+# Content types worth reading when streaming; anything else (PDFs, images, downloads) is skipped
+TEXT_TYPES = ("text/html", "application/xhtml+xml", "application/json", "application/ld+json",
+              "text/plain", "text/xml", "application/xml", "application/rss+xml", "application/atom+xml")
+
+class ContentRejected(requests.exceptions.RequestException):
+    """A streamed response whose content type is not one the caller reads."""
+
 def getenv(name: str, default: str = "") -> str:
     v = os.getenv(name, default)
     if v is None:
@@ -43,15 +51,109 @@ def create_session() -> requests.Session:
     
     return session
 
-def safe_get(url: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
-    """Make a GET request with proper error handling and timeout."""
+def safe_get(url: str, session: Optional[requests.Session] = None, stream: bool = False,
+             max_bytes: int = MAX_BODY_BYTES, content_types: Optional[Iterable[str]] = TEXT_TYPES,
+             stop_at: Optional[Iterable[str]] = None, **kwargs) -> requests.Response:
+    """Make a GET request with proper error handling and timeout.
+
+    With stream=True the body is read through read_body(): non-text content types
+    are rejected before the body is downloaded, at most max_bytes are kept and
+    reading stops early once one of the `stop_at` markers has arrived.
+    """
     if session is None:
         session = create_session()
     
     try:
-        response = session.get(url, timeout=20, **kwargs)
+        if stream:
+            response = capped_get(session, url, max_bytes=max_bytes, content_types=content_types,
+                                  stop_at=stop_at, **kwargs)
+        else:
+            response = session.get(url, timeout=20, **kwargs)
         response.raise_for_status()
         return response
     except requests.exceptions.RequestException as e:
         print(f"[WARN] Request failed for {url}: {e}")
         raise
+
+def capped_get(session: requests.Session, url: str, timeout: float = 20, max_bytes: int = MAX_BODY_BYTES,
+               content_types: Optional[Iterable[str]] = TEXT_TYPES, stop_at: Optional[Iterable[str]] = None,
+               **kwargs) -> requests.Response:
+    """Streaming GET with a bounded body; status codes are left to the caller (unlike safe_get)."""
+    response = session.get(url, timeout=timeout, stream=True, **kwargs)
+    ctype = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_types is not None and ctype and not any(ctype.startswith(t) for t in content_types):
+        response.close()
+        raise ContentRejected(f"{ctype} from {url} is not read", response=response)
+    return read_body(response, max_bytes, stop_at)
+
+def read_body(response: requests.Response, max_bytes: int = MAX_BODY_BYTES,
+              stop_at: Optional[Iterable[str]] = None, chunk_size: int = 16 * 1024) -> requests.Response:
+    """Read a streamed response's body, up to max_bytes or until a `stop_at` marker shows up.
+
+    The chunk after the one holding the marker is still read, so whatever follows
+    the marker (say the board token after an ATS host name) is complete. The
+    (possibly partial) body is then available as usual through .content, .text and
+    .json(); response.truncated is True when the cap or a marker cut reading short
+    and response.stopped_at is the marker that did (None otherwise).
+    """
+    markers = [m for m in (stop_at or []) if m]
+    overlap = max((len(m) for m in markers), default=1) - 1
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace") if markers else None
+    chunks, size, tail, truncated, stopped_at = [], 0, "", False, None
+    try:
+        for chunk in response.iter_content(chunk_size):
+            if size + len(chunk) > max_bytes:
+                chunks.append(chunk[: max_bytes - size])
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+            if stopped_at:
+                truncated = True
+                break
+            if decoder:
+                # Markers may straddle chunks, so the end of the previous chunk is searched again
+                window = tail + decoder.decode(chunk)
+                stopped_at = next((m for m in markers if m in window), None)
+                tail = window[-overlap:] if overlap else ""
+    finally:
+        response.close()
+    response._content = b"".join(chunks)
+    response._content_consumed = True
+    response.truncated = truncated
+    response.stopped_at = stopped_at if truncated else None
+    return response
+
+def retry_on_rate_limit(fn, *args, retries: int = 5, label: str = "", **kwargs):
+    """Call fn, backing off on HTTP 429 (honours Retry-After when present)."""
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            # openai errors carry status_code/response, notion_client errors status/headers
+            status = getattr(e, "status_code", None) or getattr(e, "status", None)
+            if status != 429 or attempt == retries:
+                raise
+            headers = getattr(e, "headers", None) or getattr(getattr(e, "response", None), "headers", None) or {}
+            try:
+                delay = float(headers.get("retry-after"))
+            except (TypeError, ValueError):
+                delay = 2 ** attempt + random.random()
+            print(f"[WARN] Rate limited{' on ' + label if label else ''}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
@@ -0,0 +1,312 @@
+"""
+Persistent approximate nearest-neighbor index over job embeddings.
+
+Vectors are unit-normalized and appended to a raw float32 file that is
+memory-mapped on load, with one metadata line (id, title, company, url, text
+hash) per row; a job whose text changed gets its row overwritten in place.
+Search uses an inverted-file (IVF) layout: spherical k-means centroids,
+one posting list per centroid, and only the `nprobe` closest lists are scanned.
+Small indexes are searched exactly.
+
+    python scripts/vector_index.py similar <job_id> [k]
+    python scripts/vector_index.py dupes [threshold]
+    python scripts/vector_index.py stats | rebuild
+"""
+
+import os
+import json
+import pathlib
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+INDEX_DIR = ROOT / "data" / "processed" / "vector_index"
+
+NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "8"))
+EXACT_MAX = 4096          # below this many rows, search exhaustively
+RETRAIN_GROWTH = 4        # retrain centroids once the index grows this much
+KMEANS_SAMPLE = 20000
+KMEANS_ITERS = 10
+
+def _unit(m):
+    m = np.asarray(m, dtype=np.float32)
+    if m.ndim == 1:
+        n = np.linalg.norm(m)
+        return m / n if n else m
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.where(norms == 0, 1, norms)
+
+def _assign(vectors, centroids, chunk: int = 8192):
+    """Index of the closest centroid for every row (chunked to bound memory)."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk):
+        out[start:start + chunk] = np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1)
+    return out
+
+def spherical_kmeans(vectors, nlist: int, iters: int = KMEANS_ITERS, seed: int = 0):
+    """Cosine k-means; returns unit centroids of shape (nlist, dim)."""
+    rng = np.random.default_rng(seed)
+    centroids = np.array(vectors[rng.choice(len(vectors), nlist, replace=False)], dtype=np.float32)
+    for _ in range(iters):
+        labels = _assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty = ~sums.any(axis=1)
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = _unit(sums)
+    return centroids
+
+class VectorIndex:
+    def __init__(self, root: pathlib.Path = None):
+        self.root = pathlib.Path(root or INDEX_DIR)
+        self.vectors_file = self.root / "vectors.f32"
+        self.meta_file = self.root / "meta.jsonl"
+        self.ivf_file = self.root / "ivf.npz"
+
+        self.meta: List[Dict] = []
+        if self.meta_file.exists():
+            with open(self.meta_file, "r", encoding="utf-8") as f:
+                self.meta = [json.loads(line) for line in f if line.strip()]
+        self.row_of = {m["id"]: i for i, m in enumerate(self.meta)}
+
+        self.dim = 0
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        if self.meta and self.vectors_file.exists():
+            self.dim = self.vectors_file.stat().st_size // (4 * len(self.meta))
+            self.vectors = np.memmap(self.vectors_file, dtype=np.float32, mode="r",
+                                     shape=(len(self.meta), self.dim))
+
+        self.centroids = None
+        self.assign = np.zeros(0, dtype=np.int32)
+        self.trained_n = 0
+        if self.ivf_file.exists():
+            with np.load(self.ivf_file) as data:
+                self.centroids = data["centroids"]
+                self.assign = data["assign"]
+                self.trained_n = int(data["trained_n"])
+        self._postings = None
+
+    def __len__(self):
+        return len(self.meta)
+
+    def __contains__(self, job_id: str):
+        return job_id in self.row_of
+
+    def add(self, ids: Iterable[str], vectors, meta: Optional[List[Dict]] = None,
+            hashes: Optional[List[str]] = None) -> int:
+        """Append vectors for ids not yet indexed. With content hashes, indexed rows whose
+        hash changed are overwritten in place. Returns how many rows were added or replaced."""
+        ids = list(ids)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        meta = meta or [{} for _ in range(len(vectors))]
+        fresh, stale, seen = [], [], set()
+        for i, jid in enumerate(ids):
+            if not jid or jid in seen:
+                continue
+            seen.add(jid)
+            if jid not in self.row_of:
+                fresh.append(i)
+            elif hashes and self.meta[self.row_of[jid]].get("hash") != hashes[i]:
+                stale.append(i)
+        if not fresh and not stale:
+            return 0
+        dim = vectors.shape[1]
+        if self.dim and dim != self.dim:
+            raise ValueError(f"Vector size {dim} does not match index size {self.dim}; delete {self.root} to reindex")
+
+        def row_meta(i):
+            m = {"id": ids[i]}
+            m.update({k: v for k, v in meta[i].items() if k != "id"})
+            if hashes:
+                m["hash"] = hashes[i]
+            return m
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        if stale:
+            rows = [self.row_of[ids[i]] for i in stale]
+            changed = _unit(vectors[stale])
+            writable = np.memmap(self.vectors_file, dtype=np.float32, mode="r+", shape=(len(self.meta), self.dim))
+            writable[rows] = changed
+            writable.flush()
+            del writable
+            for i, row in zip(stale, rows):
+                self.meta[row] = row_meta(i)
+            if self.centroids is not None:
+                self.assign[rows] = _assign(changed, self.centroids)
+        if fresh:
+            new = _unit(vectors[fresh])
+            with open(self.vectors_file, "ab") as f:
+                f.write(new.tobytes())
+            for i in fresh:
+                m = row_meta(i)
+                self.row_of[m["id"]] = len(self.meta)
+                self.meta.append(m)
+            if self.centroids is not None:
+                self.assign = np.concatenate([self.assign, _assign(new, self.centroids)])
+        if stale:
+            # Rows changed in place, so the metadata is rewritten rather than appended to
+            tmp = self.meta_file.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(m, ensure_ascii=False) + "\n" for m in self.meta)
+            os.replace(tmp, self.meta_file)
+        else:
+            with open(self.meta_file, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(self.meta[self.row_of[ids[i]]], ensure_ascii=False) + "\n" for i in fresh)
+
+        self.dim = dim
+        self.vectors = np.memmap(self.vectors_file, dtype=np.float32, mode="r",
+                                 shape=(len(self.meta), self.dim))
+        self._postings = None
+        if len(self) > EXACT_MAX and len(self) >= RETRAIN_GROWTH * max(self.trained_n, EXACT_MAX // RETRAIN_GROWTH):
+            self.train()
+        elif self.centroids is not None:
+            self._save_ivf()
+        return len(fresh) + len(stale)
+
+    def sync(self, store, jobs: Iterable[Dict]) -> int:
+        """Bring the index up to date with an EmbeddingStore: jobs that are missing, or
+        whose stored text hash differs from the indexed one, get the store's vector."""
+        todo = [j for j in jobs if j.get("id") in store
+                and self.info(j["id"]).get("hash") != store.ids[j["id"]][1]]
+        if not todo:
+            return 0
+        ids = [j["id"] for j in todo]
+        meta = [{k: j.get(k, "") for k in ("title", "company", "url")} for j in todo]
+        return self.add(ids, store.get_many(ids), meta, [store.ids[jid][1] for jid in ids])
+
+    def train(self, nlist: Optional[int] = None):
+        """(Re)build IVF centroids from a sample and reassign every row."""
+        n = len(self)
+        if n == 0:
+            return
+        nlist = nlist or max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(0)
+        sample = np.sort(rng.choice(n, min(n, KMEANS_SAMPLE), replace=False))
+        self.centroids = spherical_kmeans(np.asarray(self.vectors[sample]), min(nlist, len(sample)))
+        self.assign = _assign(self.vectors, self.centroids)
+        self.trained_n = n
+        self._postings = None
+        self._save_ivf()
+        print(f"[INDEX] Trained {len(self.centroids)} lists over {n} vectors")
+
+    def _save_ivf(self):
+        tmp = self.ivf_file.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, centroids=self.centroids, assign=self.assign, trained_n=self.trained_n)
+        os.replace(tmp, self.ivf_file)
+
+    def _lists(self):
+        """Posting lists as (row order, offsets) built from the assignments."""
+        if self._postings is None:
+            order = np.argsort(self.assign, kind="stable").astype(np.int64)
+            offsets = np.searchsorted(self.assign[order], np.arange(len(self.centroids) + 1))
+            self._postings = (order, offsets)
+        return self._postings
+
+    def search(self, query, k: int = 10, nprobe: int = NPROBE,
+               exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """Top-k (id, cosine) for a query vector."""
+        if not len(self):
+            return []
+        q = _unit(query)
+        if self.centroids is None or len(self) <= EXACT_MAX or len(self.assign) != len(self):
+            rows = np.arange(len(self))
+        else:
+            order, offsets = self._lists()
+            probe = np.argsort(-(self.centroids @ q))[:nprobe]
+            rows = np.sort(np.concatenate([order[offsets[c]:offsets[c + 1]] for c in probe]))
+        sims = self.vectors[rows] @ q
+        skip = {self.row_of[j] for j in exclude if j in self.row_of}
+        want = min(len(rows), k + len(skip))
+        top = np.argpartition(-sims, want - 1)[:want] if want < len(rows) else np.arange(len(rows))
+        top = top[np.argsort(-sims[top])]
+        return [(self.meta[rows[i]]["id"], float(sims[i])) for i in top if rows[i] not in skip][:k]
+
+    def similar_to(self, job_id: str, k: int = 10, nprobe: int = NPROBE) -> List[Tuple[str, float]]:
+        """Nearest indexed jobs to an already indexed job."""
+        row = self.row_of.get(job_id)
+        if row is None:
+            matches = [j for j in self.row_of if j.startswith(job_id)]
+            if len(matches) != 1:
+                return []
+            job_id, row = matches[0], self.row_of[matches[0]]
+        return self.search(np.asarray(self.vectors[row]), k, nprobe, exclude=[job_id])
+
+    def info(self, job_id: str) -> Dict:
+        row = self.row_of.get(job_id)
+        return self.meta[row] if row is not None else {"id": job_id}
+
+def load_synced(root: pathlib.Path = None) -> VectorIndex:
+    """The index, first brought up to date with the embedding store.
+
+    The index is derived and stays local (gitignored), while the embedding store and
+    jobs.jsonl are state files, so a fresh checkout (CI, the Telegram bot) rebuilds it
+    from them on first use instead of calling the embedding API.
+    """
+    from scripts.embedding_store import EmbeddingStore
+    from scripts.score import EMB_MODEL, JOBS_JL
+    index = VectorIndex(root)
+    store = EmbeddingStore(EMB_MODEL)
+    if not len(store):
+        return index
+    jobs = []
+    try:
+        with open(JOBS_JL, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    jobs.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        return index
+    synced = index.sync(store, jobs)
+    if synced:
+        print(f"[INDEX] Synced {synced} job vectors from {store.path.name} ({len(index)} indexed)")
+    return index
+
+def main():
+    import sys
+
+    if len(sys.argv) < 2:
+        print(__doc__.strip().split("\n\n")[-1])
+        return
+    command = sys.argv[1]
+    index = load_synced()
+
+    if command == "similar" and len(sys.argv) > 2:
+        k = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+        results = index.similar_to(sys.argv[2], k)
+        if not results:
+            print(f"No indexed job matches '{sys.argv[2]}'")
+            return
+        print(f"\n🔎 Jobs similar to {sys.argv[2]}:")
+        for jid, sim in results:
+            m = index.info(jid)
+            print(f"  {sim:.3f}  {m.get('title', '')} @ {m.get('company', '')}  [{jid[:12]}]")
+
+    elif command == "dupes":
+        threshold = float(sys.argv[2]) if len(sys.argv) > 2 else 0.95
+        reported = set()
+        for m in index.meta[-500:]:
+            for jid, sim in index.similar_to(m["id"], 3):
+                pair = tuple(sorted((m["id"], jid)))
+                if sim >= threshold and pair not in reported:
+                    reported.add(pair)
+                    other = index.info(jid)
+                    print(f"{sim:.3f}  {m.get('title', '')} @ {m.get('company', '')}  ~  "
+                          f"{other.get('title', '')} @ {other.get('company', '')}")
+        print(f"[OK] {len(reported)} near-duplicate pairs at >= {threshold}")
+
+    elif command == "stats":
+        lists = len(index.centroids) if index.centroids is not None else 0
+        print(f"Vectors: {len(index)} x {index.dim}  IVF lists: {lists}  trained at: {index.trained_n}")
+
+    elif command == "rebuild":
+        index.train()
+
+    else:
+        print("Invalid command or missing parameters")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import time
+import asyncio
+from collections import Counter
+import httpx
+from scripts.async_crawl import fetch_all_sync, probe_sync, run_sync
+
+
+def transport(handler):
+    """MockTransport around an async handler(request) -> httpx.Response."""
+    return httpx.MockTransport(handler)
+
+
+class TestAsyncFetcher:
+    """Test the asyncio crawl engine against a mock transport."""
+
+    def test_fetch_all_in_order(self):
+        """Results come back in input order with their bodies."""
+        async def handler(request):
+            await asyncio.sleep(0.01 if request.url.path == "/1" else 0)
+            return httpx.Response(200, html=f"<p>{request.url.path}</p>")
+
+        pages = fetch_all_sync([f"https://a.example/{i}" for i in range(3)], transport=transport(handler))
+        assert [p.text for p in pages] == ["<p>/0</p>", "<p>/1</p>", "<p>/2</p>"]
+        assert all(p.ok for p in pages)
+
+    def test_retries_like_create_session(self):
+        """5xx answers and connection errors are retried up to 3 times."""
+        calls = Counter()
+
+        async def handler(request):
+            calls[request.url.host] += 1
+            if request.url.host == "down.example":
+                raise httpx.ConnectError("refused")
+            if calls[request.url.host] < 3:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"ok": True})
+
+        flaky, down = fetch_all_sync(["https://flaky.example/", "https://down.example/"],
+                                     transport=transport(handler), backoff=0)
+        assert flaky.ok and flaky.json() == {"ok": True} and calls["flaky.example"] == 3
+        assert not down.ok and "ConnectError" in down.error and calls["down.example"] == 4
+
+    def test_no_retry_on_client_errors(self):
+        """A 404 is final."""
+        calls = Counter()
+
+        async def handler(request):
+            calls[request.url.path] += 1
+            return httpx.Response(404)
+
+        (page,) = fetch_all_sync(["https://a.example/missing"], transport=transport(handler), backoff=0)
+        assert page.status_code == 404 and not page.ok and calls["/missing"] == 1
+
+    def test_body_cap_and_content_type(self):
+        """Bodies are capped and non-text responses are not read."""
+        async def handler(request):
+            if request.url.path == "/file.pdf":
+                return httpx.Response(200, content=b"%PDF" * 100, headers={"content-type": "application/pdf"})
+            return httpx.Response(200, html="x" * 10_000)
+
+        big, pdf = fetch_all_sync(["https://a.example/big", "https://a.example/file.pdf"],
+                                  transport=transport(handler), max_bytes=1_000)
+        assert len(big.content) == 1_000 and big.truncated
+        assert not pdf.ok and pdf.content == b""
+
+    def test_thousand_probes_with_host_limits(self):
+        """1000 probes over 250 hosts run concurrently without exceeding the per-host cap."""
+        inflight, peak = Counter(), Counter()
+
+        async def handler(request):
+            host = request.url.host
+            inflight[host] += 1
+            peak[host] = max(peak[host], inflight[host])
+            await asyncio.sleep(0.02)
+            inflight[host] -= 1
+            return httpx.Response(200, html="ok")
+
+        urls = [f"https://c{i % 250}.example/{i}" for i in range(1000)]
+        start = time.monotonic()
+        pages = fetch_all_sync(urls, transport=transport(handler), concurrency=500, per_host=2)
+        elapsed = time.monotonic() - start
+        assert len(pages) == 1000 and all(p.ok for p in pages)
+        assert max(peak.values()) <= 2
+        assert elapsed < 5  # sequentially this would take 20s
+
+    def test_probe_prefers_listed_order(self):
+        """The first working URL in the given order wins, whatever answers first."""
+        async def handler(request):
+            if request.url.host == "www.acme.example":
+                await asyncio.sleep(0.02)
+                return httpx.Response(200, html="www")
+            if request.url.host == "jobs.acme.example":
+                return httpx.Response(200, html="jobs")
+            return httpx.Response(404)
+
+        pages = probe_sync({"acme": ["https://acme.example/careers", "https://www.acme.example/careers",
+                                     "https://jobs.acme.example/"],
+                            "nobody": ["https://nobody.example/careers"]}, transport=transport(handler))
+        assert pages["acme"].text == "www"
+        assert pages["nobody"] is None
+
+    def test_broken_sites_do_not_abort_probe(self):
+        """Redirect loops and undecodable bodies come back as errors; other companies still resolve."""
+        calls = Counter()
+
+        async def handler(request):
+            calls[request.url.host] += 1
+            if request.url.host == "loop.example":
+                return httpx.Response(302, headers={"location": str(request.url)})
+            if request.url.host == "gzip.example":
+                return httpx.Response(200, content=b"not gzip at all", headers={"content-encoding": "gzip",
+                                                                                "content-type": "text/html"})
+            return httpx.Response(200, html="jobs")
+
+        pages = probe_sync({"loop": ["https://loop.example/careers"], "gzip": ["https://gzip.example/careers"],
+                            "acme": ["https://acme.example/careers"]}, transport=transport(handler), backoff=0)
+        assert pages == {"loop": None, "gzip": None, "acme": pages["acme"]} and pages["acme"].text == "jobs"
+        assert calls["gzip.example"] == 1  # not retried
+
+        loop, bad = fetch_all_sync(["https://loop.example/", "https://gzip.example/"], transport=transport(handler))
+        assert "TooManyRedirects" in loop.error and "DecodingError" in bad.error
+
+    def test_run_sync_inside_loop(self):
+        """The sync wrappers also work when called from running async code."""
+        async def inner():
+            return 42
+
+        async def outer():
+            return run_sync(inner())
+
+        assert asyncio.run(outer()) == 42
@@ -0,0 +1,147 @@
+import json
+from unittest.mock import MagicMock, patch
+import pytest
+import responses
+from scripts import ats_fingerprint
+from scripts.ats_fingerprint import AtsMap, fingerprint
+from scripts.utils import capped_get
+
+
+class FakeResponse:
+    def __init__(self, payload=None, status_code=200, text=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.text = text if text is not None else json.dumps(payload)
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        return self.pages.get(url, FakeResponse(status_code=404))
+
+
+GH_API = "https://boards-api.greenhouse.io/v1/boards/acme/jobs"
+GH_JOBS = {"jobs": [
+    {"title": "Head of DevOps", "absolute_url": "https://boards.greenhouse.io/acme/jobs/1",
+     "location": {"name": "Tel Aviv, Israel"}, "updated_at": "2025-03-01"},
+    {"title": "Data Analyst", "absolute_url": "https://boards.greenhouse.io/acme/jobs/2",
+     "location": {"name": "Tel Aviv, Israel"}},
+]}
+
+
+class TestFingerprint:
+    """Test detection of embedded job boards."""
+
+    @pytest.mark.parametrize("html,expected", [
+        ('<iframe src="https://boards.greenhouse.io/embed/job_board?for=acme"></iframe>', ("greenhouse", "acme")),
+        ('<script src="https://boards.greenhouse.io/embed/job_board/js?for=acme"></script>', ("greenhouse", "acme")),
+        ('<a href="https://jobs.lever.co/acme/123">Apply</a>', ("lever", "acme")),
+        ('<a href="https://jobs.ashbyhq.com/acme">Jobs</a>', ("ashby", "acme")),
+        ('<a href="https://www.comeet.com/jobs/acme/12.345">Open roles</a>', ("comeet", "acme")),
+        ('<a href="https://careers.smartrecruiters.com/Acme1">Jobs</a>', ("smartrecruiters", "Acme1")),
+    ])
+    def test_embedded_boards(self, html, expected):
+        """The board and its token are read from iframes, scripts and links."""
+        found = fingerprint(html, "https://acme.com/careers")
+        assert (found["ats"], found["board"]) == expected
+
+    def test_jsonld(self):
+        """Pages publishing JobPosting JSON-LD are mapped to themselves."""
+        html = ('<script type="application/ld+json">{"@context": "https://schema.org", '
+                '"@type": "JobPosting", "title": "Head of DevOps"}</script>')
+        assert fingerprint(html, "https://acme.com/careers") == {"ats": "jsonld", "board": "https://acme.com/careers"}
+
+    def test_plain_page(self):
+        """A page without a board is not fingerprinted."""
+        assert fingerprint("<html><h2>Head of DevOps</h2></html>", "https://acme.com/careers") is None
+
+
+class TestAtsMap:
+    """Test the persisted company to board mapping."""
+
+    def test_learn_then_api(self, temp_dir):
+        """A learned board is persisted and later read through its JSON API only."""
+        path = temp_dir / "ats_map.json"
+        AtsMap(path).learn("acme", '<iframe src="https://boards.greenhouse.io/embed/job_board?for=acme">',
+                           "https://acme.com/careers")
+
+        session = FakeSession({GH_API: FakeResponse(GH_JOBS)})
+        jobs = AtsMap(path).known_jobs("Acme", session, display="Acme Ltd")
+        assert session.requested == [GH_API]
+        assert [j["title"] for j in jobs] == ["Head of DevOps"]
+        assert jobs[0]["company"] == "Acme Ltd" and jobs[0]["url"].endswith("/jobs/1") and jobs[0]["id"]
+
+    def test_unknown_company(self, temp_dir):
+        """Companies without a mapping make no requests."""
+        session = FakeSession({})
+        assert AtsMap(temp_dir / "ats_map.json").known_jobs("acme", session) is None
+        assert session.requested == []
+
+    def test_stale_mapping_forgotten(self, temp_dir):
+        """A board that is gone is dropped so the page is fingerprinted again."""
+        ats = AtsMap(temp_dir / "ats_map.json")
+        ats.learn("acme", '<a href="https://jobs.lever.co/acme">', "https://acme.com/careers")
+        assert ats.known_jobs("acme", FakeSession({})) is None
+        assert ats.get("acme") is None
+        assert AtsMap(temp_dir / "ats_map.json").get("acme") is None
+
+    def test_jsonld_board(self, temp_dir):
+        """JSON-LD pages yield per-job URLs and dates."""
+        page = "https://acme.com/careers"
+        html = ('<script type="application/ld+json">[{"@type": "JobPosting", "title": "Head of DevOps", '
+                '"url": "https://acme.com/careers/7", "datePosted": "2025-03-01", '
+                '"jobLocation": {"address": {"addressLocality": "Tel Aviv", "addressCountry": "Israel"}}}]</script>')
+        ats = AtsMap(temp_dir / "ats_map.json")
+        ats.learn("acme", html, page)
+        jobs = ats.known_jobs("acme", FakeSession({page: FakeResponse(text=html)}))
+        assert jobs[0]["url"] == "https://acme.com/careers/7"
+        assert jobs[0]["posted_at"] == "2025-03-01" and jobs[0]["location"] == "Tel Aviv, Israel"
+
+    def test_career_scraper_uses_mapping(self, temp_dir):
+        """The career page scraper skips HTML for mapped companies."""
+        from scripts import career_page_scraper as cps
+        ats = AtsMap(temp_dir / "ats_map.json")
+        ats.learn("acme", '<iframe src="https://boards.greenhouse.io/embed/job_board?for=acme">',
+                  "https://acme.com/careers")
+        session = FakeSession({GH_API: FakeResponse(GH_JOBS)})
+        with patch.object(ats_fingerprint, "_map", ats), \
+             patch.object(cps, "create_stealth_session", lambda: session):
+            jobs = cps.search_company_careers({"name": "acme", "description": "Acme"}, ["Head of DevOps"])
+        assert session.requested == [GH_API]
+        assert [j["title"] for j in jobs] == ["Head of DevOps"]
+
+    @responses.activate
+    def test_career_scraper_stops_reading_at_board(self, temp_dir):
+        """An unmapped page is only read up to its board link; the jobs then come from the board API."""
+        from scripts import career_page_scraper as cps
+        page = "https://acme.com/careers"
+        html = '<iframe src="https://boards.greenhouse.io/embed/job_board?for=acme">' + "x" * 500_000
+        responses.add(responses.GET, page, body=html, content_type="text/html")
+        responses.add(responses.GET, GH_API, json=GH_JOBS)
+        read = []
+
+        def spy(*args, **kwargs):
+            response = capped_get(*args, **kwargs)
+            read.append(response)
+            return response
+
+        ats = AtsMap(temp_dir / "ats_map.json")
+        with patch.object(ats_fingerprint, "_map", ats), \
+             patch.object(cps, "capped_get", spy), \
+             patch.object(cps.time, "sleep"), \
+             patch.object(cps.dns_cache, "cache", lambda: MagicMock(filter_urls=lambda urls: urls[:1])):
+            jobs = cps.search_company_careers({"name": "acme", "description": "Acme", "career_page": page},
+                                              ["Head of DevOps"])
+        assert [j["title"] for j in jobs] == ["Head of DevOps"]
+        assert len(read) == 1 and read[0].stopped_at == "greenhouse.io" and len(read[0].content) < 50_000
@@ -0,0 +1,61 @@
+import json
+from benchmarks import generators as gen
+from benchmarks.run import run, compare, FakeEmbedder, main
+
+
+class TestGenerators:
+    """Test synthetic benchmark inputs."""
+    
+    def test_deterministic(self):
+        """The same size and seed always give identical data."""
+        assert gen.job_rows(50) == gen.job_rows(50)
+        assert gen.greenhouse_payload(20) == gen.greenhouse_payload(20)
+        assert gen.lever_payload(20, seed=1) != gen.lever_payload(20, seed=2)
+        assert gen.career_page_html(5) == gen.career_page_html(5)
+    
+    def test_shapes(self):
+        """Payloads look like the APIs the crawlers normalize."""
+        from scripts.crawl import normalize_gh, normalize_lever
+        gh = normalize_gh(gen.greenhouse_payload(1)["jobs"][0])
+        assert gh["company"] in gen.COMPANIES and gh["source"] == "greenhouse"
+        lever = normalize_lever(gen.lever_payload(1)[0])
+        assert lever["url"].startswith("https://jobs.lever.co/") and lever["jd"]
+        
+        rows = gen.job_rows(500)
+        keys = {(r["title"], r["company"], r["location"]) for r in rows}
+        assert len(keys) < len(rows)  # includes duplicates for deduplicate_jobs
+        assert len({r["id"] for r in rows}) == len(rows)
+        
+        state = gen.job_state_data(1000)
+        assert sum(len(state[k]) for k in ("applied", "ignored", "sent_to_telegram")) == 1000
+
+
+class TestRunner:
+    """Test the benchmark runner."""
+    
+    def test_fake_embedder(self):
+        """Vectors depend only on the text."""
+        vecs = FakeEmbedder().embed_batch(["kubernetes leadership", "kubernetes leadership", "kafka"])
+        assert vecs.shape == (3, FakeEmbedder.dim)
+        assert (vecs[0] == vecs[1]).all() and not (vecs[0] == vecs[2]).all()
+    
+    def test_run_small_cases(self):
+        """Every selected case runs on synthetic data and reports timings."""
+        doc = run(cases=["normalize", "digest", "score.warm"], max_rows=1000, repeat=1)
+        names = {r["case"] for r in doc["results"]}
+        assert names == {"crawl.normalize_gh", "crawl.normalize_lever", "digest.select_digest", "score.warm"}
+        assert all(r["size"] == 1000 and r["best_s"] > 0 for r in doc["results"])
+    
+    def test_compare_flags_regressions(self, temp_dir, capsys):
+        """Slowdowns beyond the tolerance are reported and fail the comparison."""
+        base = {"commit": "a", "results": [{"case": "x", "size": 10, "best_s": 1.0},
+                                           {"case": "y", "size": 10, "best_s": 1.0}]}
+        new = {"commit": "b", "results": [{"case": "x", "size": 10, "best_s": 1.1},
+                                          {"case": "y", "size": 10, "best_s": 2.0}]}
+        regressions = compare(base, new, tolerance=1.2)
+        assert [r["case"] for r in regressions] == ["y"]
+        
+        (temp_dir / "a.json").write_text(json.dumps(base))
+        (temp_dir / "b.json").write_text(json.dumps(new))
+        assert main(["--compare", str(temp_dir / "a.json"), str(temp_dir / "b.json")]) == 1
+        assert "[WARN] y" in capsys.readouterr().out
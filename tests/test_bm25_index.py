@@ -0,0 +1,46 @@
+import json
+from scripts.bm25_index import BM25Index, tokenize
+
+
+JOBS = [
+    {"id": "a", "title": "Head of DevOps", "jd": "Kubernetes, Terraform and AWS at scale"},
+    {"id": "b", "title": "Frontend Engineer", "jd": "React and TypeScript for our web app"},
+    {"id": "c", "title": "Platform Engineering Manager", "jd": "Kubernetes platform team, on-call and SRE"},
+]
+
+
+class TestBM25Index:
+    """Test the incremental BM25 index."""
+    
+    def test_tokenize(self):
+        """Lowercases, keeps tech tokens and drops stopwords."""
+        assert tokenize("The C++ and C# team, k8s!") == ["c++", "c#", "team", "k8s"]
+    
+    def test_ranking_and_explain(self, temp_dir):
+        """Jobs sharing rare query terms rank first; explanations name those terms."""
+        index = BM25Index(temp_dir / "bm25.json")
+        assert index.update(JOBS) == 3
+        
+        scores = index.scores("DevOps leader with Kubernetes and Terraform", ["a", "b", "c"])
+        
+        assert scores[0] > scores[2] > scores[1] == 0
+        assert [t for t, _ in index.explain("kubernetes terraform devops", "a")] == ["devops", "terraform", "kubernetes"]
+        assert index.search("react")[0][0] == "b"
+    
+    def test_incremental_update_and_persistence(self, temp_dir):
+        """Only changed jobs are reindexed, removed jobs leave the postings, state survives reload."""
+        path = temp_dir / "bm25.json"
+        index = BM25Index(path)
+        index.update(JOBS)
+        index.save()
+        
+        reloaded = BM25Index(path)
+        assert reloaded.update(JOBS) == 0
+        changed = [JOBS[0], dict(JOBS[1], jd="Kubernetes operators in Go")]
+        assert reloaded.update(changed) == 2  # b changed, c removed
+        assert "c" not in reloaded
+        assert "react" not in reloaded.postings
+        assert set(reloaded.postings["kubernetes"]) == {"a", "b"}
+        
+        reloaded.save()
+        assert json.loads(path.read_text())["docs"].keys() == {"a", "b"}
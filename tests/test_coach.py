@@ -0,0 +1,71 @@
+import pytest
+import json
+from unittest.mock import patch, MagicMock
+from scripts.coach import best_job, top_jobs, questions_for, precompute, score_answer
+
+
+@pytest.fixture
+def scores_file(temp_dir):
+    rows = [{"id": f"job{i}", "title": f"Job {i}", "company": "acme", "score": s}
+            for i, s in enumerate([0.7, 0.9, 0.8, 0.9, 0.6])]
+    scores = temp_dir / "scores.jsonl"
+    scores.write_text("\n".join(json.dumps(r) for r in rows) + "\nnot json\n")
+    with patch('scripts.coach.SCORES', scores):
+        yield scores
+
+
+class TestCoach:
+    """Test interview coaching helpers."""
+    
+    def test_best_and_top_jobs(self, scores_file):
+        """Max selection keeps the first of equal scores; top-N is ordered by score."""
+        assert best_job()["id"] == "job1"
+        assert [j["id"] for j in top_jobs(3)] == ["job1", "job3", "job2"]
+    
+    def test_best_job_empty(self, temp_dir):
+        """No scored jobs means no default job."""
+        empty = temp_dir / "empty.jsonl"
+        empty.write_text("")
+        with patch('scripts.coach.SCORES', empty):
+            assert best_job() is None
+    
+    @patch('scripts.coach.generate_questions', return_value="1. Why?\n2. How?")
+    def test_questions_cached_per_job_and_profile(self, mock_gen, temp_dir):
+        """Questions are generated once per (job, profile) and read back from disk."""
+        job = {"id": "job1", "title": "Head of DevOps", "company": "acme"}
+        with patch('scripts.coach.PREP_CACHE', temp_dir / "prep"):
+            assert questions_for(job) == "1. Why?\n2. How?"
+            assert questions_for(job) == "1. Why?\n2. How?"
+            assert mock_gen.call_count == 1
+            
+            with patch('scripts.coach.PROFILE', 'Another profile'):
+                questions_for(job)
+            assert mock_gen.call_count == 2
+    
+    def test_precompute_concurrently(self, temp_dir):
+        """Precompute fills the cache for uncached jobs and survives individual failures."""
+        jobs = [{"id": f"job{i}", "title": f"Job {i}", "company": "acme"} for i in range(4)]
+        
+        def fake_gen(job):
+            if job["id"] == "job2":
+                raise RuntimeError("boom")
+            return f"questions for {job['id']}"
+        
+        with patch('scripts.coach.PREP_CACHE', temp_dir / "prep"), \
+             patch('scripts.coach.generate_questions', side_effect=fake_gen):
+            assert precompute(jobs, concurrency=2) == {"generated": 3, "cached": 0, "failed": 1}
+            assert precompute(jobs, concurrency=2) == {"generated": 0, "cached": 3, "failed": 1}
+    
+    @patch('scripts.coach.get_client')
+    def test_score_answer_streams(self, mock_get_client):
+        """Answer feedback is requested as a stream and assembled from the deltas."""
+        def chunk(text):
+            c = MagicMock()
+            c.choices = [MagicMock()]
+            c.choices[0].delta.content = text
+            return c
+        mock_get_client.return_value.chat.completions.create.return_value = iter(
+            [chunk('{"score": '), chunk(None), chunk('8}')])
+        
+        assert score_answer("Q?", "A.") == '{"score": 8}'
+        assert mock_get_client.return_value.chat.completions.create.call_args[1]["stream"] is True
@@ -1,7 +1,7 @@
 import pytest
 import json
 import responses
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 from scripts.crawl import (
     greenhouse_company_jobs, lever_company_jobs,
     normalize_gh, normalize_lever,
@@ -107,9 +107,8 @@ class TestCrawl:
     
     @responses.activate
     @patch('scripts.crawl.CFG')
-    @patch('scripts.crawl.OUT_RAW')
-    @patch('scripts.crawl.OUT_JL')
-    def test_main_integration(self, mock_out_jl, mock_out_raw, mock_cfg, 
+    @patch('scripts.crawl.write_shard')
+    def test_main_integration(self, mock_write_shard, mock_cfg,
                             sample_greenhouse_response, sample_lever_response):
         """Test main crawling function."""
         # Mock config
@@ -118,10 +117,6 @@ class TestCrawl:
             'lever': {'companies': ['lemonade']}
         }
         
-        # Mock file operations
-        mock_out_raw.write_text = lambda x: None
-        mock_out_jl.exists.return_value = False
-        
         # Mock API responses
         responses.add(
             responses.GET,
@@ -136,11 +131,15 @@ class TestCrawl:
             status=200
         )
         
-        # Mock open for writing to jsonl
-        with patch('builtins.open', mock_open()):
-            with patch('scripts.crawl.title_matches', return_value=True):
-                with patch('scripts.crawl.location_matches', return_value=True):
-                    main()
+        with patch('scripts.crawl.title_matches', return_value=True):
+            with patch('scripts.crawl.location_matches', return_value=True):
+                main()
         
         # Verify API calls were made
         assert len(responses.calls) == 2
+        
+        # One shard per source instead of appending to jobs.jsonl
+        shards = {c.args[0]: c.args[1] for c in mock_write_shard.call_args_list}
+        assert set(shards) == {'greenhouse', 'lever'}
+        assert len(shards['greenhouse']) == 2
+        assert len(shards['lever']) == 1
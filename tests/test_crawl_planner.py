@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from scripts.crawl_planner import CrawlPlan, MIN_INTERVAL_H, MAX_INTERVAL_H
+
+
+def job(title, company="acme"):
+    return {"title": title, "company": company, "location": "Tel Aviv, Israel"}
+
+
+NOW = datetime(2025, 3, 1, 6, 0, 0)
+
+
+class TestCrawlPlan:
+    """Test adaptive revisit scheduling."""
+    
+    def test_static_target_backs_off(self, temp_dir):
+        """A board with nothing new doubles its interval up to the cap."""
+        plan = CrawlPlan(temp_dir / "plan.json")
+        plan.record("greenhouse", "acme", True, [job("Head of DevOps")], NOW)
+        intervals = []
+        for day in range(1, 12):
+            e = plan.record("greenhouse", "acme", True, [job("Head of DevOps")], NOW + timedelta(days=day))
+            intervals.append(e["interval_h"])
+        
+        assert intervals[:3] == [MIN_INTERVAL_H * 2, MIN_INTERVAL_H * 4, MIN_INTERVAL_H * 8]
+        assert intervals[-1] == MAX_INTERVAL_H
+        assert plan.targets["greenhouse:acme"]["new"] == 0
+    
+    def test_active_target_polled_more_often(self, temp_dir):
+        """New postings halve the interval; the first visit sets the baseline only."""
+        plan = CrawlPlan(temp_dir / "plan.json")
+        plan.record("lever", "busy", True, [job("Head of DevOps")], NOW)
+        e = plan.entry("lever", "busy")
+        e["interval_h"] = MIN_INTERVAL_H * 8
+        
+        e = plan.record("lever", "busy", True, [job("Head of DevOps"), job("VP Infrastructure")], NOW)
+        assert e["interval_h"] == MIN_INTERVAL_H * 4
+        assert e["new"] == 1 and e["yield"] > 0
+    
+    def test_due_and_priority(self, temp_dir):
+        """Only due targets are returned; never-crawled first, then by yield."""
+        plan = CrawlPlan(temp_dir / "plan.json")
+        plan.record("s", "quiet", True, [], NOW)
+        plan.record("s", "active", True, [], NOW)
+        plan.record("s", "active", True, [job("Head of DevOps")], NOW)
+        plan.record("s", "quiet", True, [], NOW)  # interval doubles to 48h
+        
+        targets = [{"key": k} for k in ("quiet", "active", "new")]
+        assert [t["key"] for t in plan.due("s", targets, NOW + timedelta(hours=23))] == ["new", "active"]
+        assert [t["key"] for t in plan.due("s", targets, NOW + timedelta(hours=47))] == ["new", "active", "quiet"]
+    
+    def test_failures_retry_with_backoff(self, temp_dir):
+        """Failures retry after 1, 2, 4 days and reset on success."""
+        plan = CrawlPlan(temp_dir / "plan.json")
+        dues = []
+        for _ in range(3):
+            e = plan.record("s", "flaky", False, now=NOW)
+            dues.append(datetime.fromisoformat(e["next_due"]) - NOW)
+        assert dues == [timedelta(days=1), timedelta(days=2), timedelta(days=4)]
+        
+        e = plan.record("s", "flaky", True, [job("Head of DevOps")], NOW)
+        assert e["failures"] == 0
+    
+    def test_persisted(self, temp_dir):
+        """The plan survives a reload and summarizes per source."""
+        path = temp_dir / "plan.json"
+        plan = CrawlPlan(path)
+        plan.record("greenhouse", "acme", False, now=NOW)
+        plan.record("lever", "beta", True, [job("Head of DevOps")], NOW)
+        plan.save()
+        
+        summary = CrawlPlan(path).summary(NOW)
+        assert summary["greenhouse"]["failing"] == 1
+        assert summary["lever"] == {"targets": 1, "due": 0, "new": 0, "failing": 0, "interval_h": MIN_INTERVAL_H}
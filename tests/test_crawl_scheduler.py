@@ -0,0 +1,230 @@
+import json
+import time
+import threading
+import pytest
+from unittest.mock import patch
+from scripts.crawl_scheduler import Http, run
+from scripts.sources import Source, SOURCES, get_sources
+
+
+class FakeResponse:
+    def __init__(self, payload, status=200, headers=None):
+        self.payload = payload
+        self.status_code = status
+        self.headers = headers or {}
+    
+    def json(self):
+        return self.payload
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Serves canned JSON per URL, counting calls and peak parallelism."""
+    
+    def __init__(self, pages, delay=0.0):
+        self.pages = pages
+        self.delay = delay
+        self.calls = []
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def get(self, url, params=None, timeout=None, headers=None):
+        with self._lock:
+            self.calls.append(url)
+            self.requests.append((url, dict(params or {}), dict(headers or {})))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if url not in self.pages:
+            return FakeResponse(None, 404)
+        page = self.pages[url]
+        if callable(page):
+            return page(params or {}, headers or {})
+        return FakeResponse(page)
+
+
+def make_source(name, companies, **attrs):
+    class Board(Source):
+        def discover(self):
+            for c in companies:
+                yield {"key": c, "url": f"https://{name}.example/{c}"}
+        
+        def normalize(self, target, item):
+            return {"title": item, "company": target["key"], "location": "Tel Aviv, Israel",
+                    "url": f"https://{name}.example/{target['key']}/{item}"}
+        
+        def keep(self, record):
+            return "Intern" not in record["title"]
+    Board.name = name
+    for k, v in attrs.items():
+        setattr(Board, k, v)
+    return Board()
+
+
+@pytest.fixture
+def raw_dir(temp_dir):
+    with patch('scripts.shards.RAW_DIR', temp_dir):
+        yield temp_dir
+
+
+class TestCrawlScheduler:
+    """Test the concurrent crawl scheduler."""
+    
+    def test_runs_sources_and_writes_shards(self, raw_dir):
+        """Targets are fetched in parallel, filtered and written one shard per source."""
+        pages = {f"https://a.example/c{i}": ["Head of DevOps", "Intern"] for i in range(6)}
+        session = FakeSession(pages, delay=0.05)
+        source = make_source("a", [f"c{i}" for i in range(6)], concurrency=3, rate=0)
+        
+        stats = run([source], Http(session, host_rate=0), concurrency=8)
+        
+        assert stats["a"]["fetched"] == 6 and stats["a"]["records"] == 6
+        assert session.peak == 3  # capped by the source's concurrency
+        shard = next(raw_dir.glob("*/a.jsonl"))
+        rows = [json.loads(l) for l in shard.read_text().splitlines()]
+        assert {r["company"] for r in rows} == {f"c{i}" for i in range(6)}
+        assert all(r["title"] == "Head of DevOps" and r["id"] for r in rows)
+    
+    def test_dedupe_budget_and_failures(self, raw_dir):
+        """Earlier sources win duplicates; budgets cap targets; failures are counted, not fatal."""
+        pages = {"https://a.example/x": ["Head of DevOps"], "https://b.example/x": ["Head of DevOps"],
+                 "https://b.example/y": ["VP Infrastructure"]}
+        a = make_source("a", ["x"], rate=0)
+        b = make_source("b", ["x", "y", "missing", "z1", "z2"], budget=3, rate=0)
+        
+        stats = run([a, b], Http(FakeSession(pages), host_rate=0))
+        
+        assert stats["a"]["records"] == 1
+        assert stats["b"] == {**stats["b"], "targets": 3, "fetched": 2, "failed": 1, "skipped": 2,
+                              "records": 1, "duplicates": 1}
+    
+    def test_timeout_skips_unstarted_targets(self, raw_dir):
+        """Targets not started before the source's deadline are skipped."""
+        pages = {f"https://a.example/c{i}": ["Head of DevOps"] for i in range(4)}
+        source = make_source("a", [f"c{i}" for i in range(4)], concurrency=1, timeout=0.05, rate=0)
+        
+        stats = run([source], Http(FakeSession(pages, delay=0.1), host_rate=0))
+        
+        assert stats["a"]["fetched"] == 1
+        assert stats["a"]["skipped"] == 3
+    
+    def test_shared_run_cache(self):
+        """Two sources asking for the same URL cause a single request."""
+        session = FakeSession({"https://shared.example/jobs": {"ok": True}}, delay=0.05)
+        http = Http(session, host_rate=0)
+        threads = [threading.Thread(target=http.get_json, args=("https://shared.example/jobs",)) for _ in range(4)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        
+        assert session.calls == ["https://shared.example/jobs"]
+        assert http.cache_hits == 3
+    
+    def test_registry(self):
+        """Default runs include enabled sources only; disabled ones run when named."""
+        names = [s.name for s in get_sources()]
+        assert "greenhouse" in names and "career_pages" in names and "israeli_job_boards" not in names
+        assert [s.name for s in get_sources(["israeli_job_boards"])] == ["israeli_job_boards"]
+        with pytest.raises(SystemExit):
+            get_sources(["nope"])
+    
+    def test_greenhouse_plugin(self, sample_greenhouse_response):
+        """The Greenhouse plugin keeps only matching roles in Israel."""
+        gh = SOURCES["greenhouse"]
+        target = {"key": "monday", "url": "https://boards-api.greenhouse.io/v1/boards/monday/jobs"}
+        records = [gh.normalize(target, j) for j in gh.parse(target, sample_greenhouse_response)]
+        kept = [r for r in records if gh.keep(r)]
+        assert [r["title"] for r in kept] == ["Head of DevOps"]
+        assert kept[0]["company"] == "monday"
+    
+    def test_plan_skips_targets_not_due(self, raw_dir, temp_dir):
+        """With a plan, targets not yet due are deferred and outcomes are recorded."""
+        from scripts.crawl_planner import CrawlPlan
+        pages = {f"https://a.example/c{i}": ["Head of DevOps"] for i in range(3)}
+        source = make_source("a", ["c0", "c1", "c2"], rate=0)
+        plan = CrawlPlan(temp_dir / "plan.json")
+        plan.record("a", "c1", True, [])  # crawled just now
+        
+        session = FakeSession(pages)
+        stats = run([source], Http(session, host_rate=0), plan=plan)
+        
+        assert stats["a"]["deferred"] == 1
+        assert sorted(session.calls) == ["https://a.example/c0", "https://a.example/c2"]
+        assert plan.targets["a:c0"]["crawls"] == 1
+        assert (temp_dir / "plan.json").exists()
+
+
+
+class TestAtsSources:
+    """Test the Comeet and SmartRecruiters plugins on the scheduler."""
+    
+    def test_comeet_many_companies_concurrently(self):
+        """Hundreds of Comeet companies are fetched in parallel, not one every 0.5s."""
+        from scripts.crawl_scheduler import crawl
+        companies = [f"co{i}" for i in range(200)]
+        pages = {f"https://{c}.comeet.co/careers-api/2.0/company/positions": [
+            {"name": "Head of DevOps", "location": {"name": "Tel Aviv, Israel"}, "uid": f"{c}-1"},
+            {"name": "Backend Engineer", "location": {"name": "Tel Aviv, Israel"}, "uid": f"{c}-2"},
+        ] for c in companies}
+        session = FakeSession(pages, delay=0.02)
+        
+        with patch('scripts.sources._ats_companies', return_value=companies):
+            start = time.monotonic()
+            records, stats = crawl([SOURCES["comeet"]], Http(session, host_rate=0), concurrency=16)
+            elapsed = time.monotonic() - start
+        
+        assert stats["comeet"]["fetched"] == 200
+        assert len(records["comeet"]) == 200
+        assert session.peak > 4
+        assert elapsed < 200 * 0.02 / 2
+    
+    def test_smartrecruiters_pages_lazily_and_stops_at_old_postings(self):
+        """Pages are requested only until a page holds nothing inside the tracking window."""
+        from datetime import datetime, timedelta, timezone
+        from scripts.crawl_scheduler import crawl
+        now = datetime.now(timezone.utc)
+        
+        def posting(i, days_old):
+            released = now - timedelta(days=days_old)
+            # Some boards send UTC with a Z, others without any offset
+            stamp = released.isoformat().replace("+00:00", "Z") if i % 2 else released.replace(tzinfo=None).isoformat()
+            return {"id": str(i), "name": f"Director of Platform Engineering {i}",
+                    "location": {"city": "Tel Aviv", "country": "Israel"}, "releasedDate": stamp}
+        
+        def api(params, headers):
+            offset, limit = params["offset"], params["limit"]
+            ages = [1, 2, 3, 40, 50, 60, 70, 80]  # newest first
+            content = [posting(i, ages[i]) for i in range(offset, min(offset + limit, len(ages)))]
+            return FakeResponse({"content": content, "totalFound": len(ages)})
+        
+        session = FakeSession({"https://api.smartrecruiters.com/v1/companies/acme/postings": api})
+        with patch('scripts.sources._ats_companies', return_value=["acme"]), \
+             patch.object(SOURCES["smartrecruiters"], "page_size", 2), \
+             patch.object(SOURCES["smartrecruiters"], "validators", False):
+            records, stats = crawl([SOURCES["smartrecruiters"]], Http(session, host_rate=0))
+        
+        assert len(records["smartrecruiters"]) == 3
+        assert [r[1]["offset"] for r in session.requests] == [0, 2, 4]  # offset 6 never requested
+    
+    def test_validators_reuse_cached_body(self, temp_dir):
+        """A stored ETag is sent back and a 304 reuses the stored body."""
+        def api(params, headers):
+            if headers.get("If-None-Match") == '"v1"':
+                return FakeResponse(None, 304)
+            return FakeResponse([{"name": "VP Infrastructure"}], headers={"ETag": '"v1"'})
+        
+        url = "https://acme.comeet.co/careers-api/2.0/company/positions"
+        session = FakeSession({url: api})
+        first = Http(session, host_rate=0, cache_dir=temp_dir).get_json(url, revalidate=True)
+        http = Http(session, host_rate=0, cache_dir=temp_dir)
+        second = http.get_json(url, revalidate=True)
+        
+        assert first == second == [{"name": "VP Infrastructure"}]
+        assert session.requests[1][2] == {"If-None-Match": '"v1"'}
+        assert http.not_modified == 1
@@ -1,8 +1,8 @@
 import pytest
 import json
 import responses
-from unittest.mock import patch, mock_open
-from scripts.digest import send_telegram, main
+from unittest.mock import patch, mock_open, MagicMock
+from scripts.digest import send_telegram, main, select_digest
 
 
 class TestDigest:
@@ -129,3 +129,42 @@ class TestDigest:
         call_args = mock_send_telegram.call_args[0][0]
         job_count = call_args.count('• <b>')
         assert job_count == 5  # Should be limited to MAX_ITEMS
+
+    def test_select_digest_streams_top_k(self, temp_dir):
+        """One pass keeps the first DIGEST_MAX unsent rows in file order and counts every status."""
+        rows = [{"id": f"job{i}", "title": f"Job {i}", "score": 0.9 - i * 0.01} for i in range(20)]
+        rows.insert(3, {"id": "low", "score": 0.1})
+        scores = temp_dir / "scores.jsonl"
+        scores.write_text("\n".join(json.dumps(r) for r in rows) + "\nnot json\n")
+        
+        state = MagicMock()
+        state.is_applied.side_effect = lambda j: j in {"job0", "job5"}
+        state.is_ignored.side_effect = lambda j: j == "job1"
+        state.was_sent_to_telegram.side_effect = lambda j: j in {"job2", "job5"}
+        
+        with patch('scripts.digest.job_state', state):
+            picked, counts = select_digest(scores, threshold=0.78, limit=3)
+        
+        assert [r["id"] for r in picked] == ["job3", "job4", "job6"]
+        assert counts == {"above": 13, "unsent": 9, "applied": 2, "ignored": 1, "sent": 2}
+        
+        with patch('scripts.digest.job_state', state):
+            picked, counts = select_digest(scores, threshold=0.78, limit=50)
+        assert len(picked) == 9
+        assert counts == {"above": 13, "unsent": 9, "applied": 2, "ignored": 1, "sent": 2}
+
+    def test_select_digest_skips_lexical_only_rows(self, temp_dir):
+        """Offline BM25-only rows never reach the digest, whatever the threshold."""
+        rows = [{"id": "bm25", "score": 0.0, "lexical": 12.5, "lexical_only": True},
+                {"id": "cosine", "score": 0.8, "lexical": 3.0}]
+        scores = temp_dir / "scores.jsonl"
+        scores.write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+        
+        state = MagicMock()
+        state.is_applied.return_value = state.is_ignored.return_value = False
+        state.was_sent_to_telegram.return_value = False
+        
+        with patch('scripts.digest.job_state', state):
+            for threshold in (0.78, 0.0):
+                picked, counts = select_digest(scores, threshold=threshold, limit=5)
+                assert [r["id"] for r in picked] == ["cosine"] and counts["above"] == 1
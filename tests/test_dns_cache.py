@@ -0,0 +1,92 @@
+import socket
+import time
+import threading
+from collections import Counter
+import httpx
+from scripts.dns_cache import DnsCache, NXDOMAIN
+from scripts.async_crawl import probe_sync
+
+
+class FakeResolver:
+    """Resolves hosts listed in `known`; everything else is NXDOMAIN."""
+
+    def __init__(self, known, delay=0.0):
+        self.known = known
+        self.delay = delay
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, host):
+        with self._lock:
+            self.calls[host] += 1
+        time.sleep(self.delay)
+        if host in self.known:
+            return ["10.0.0.1"]
+        raise socket.gaierror(next(iter(NXDOMAIN)), "Name or service not known")
+
+
+class TestDnsCache:
+    """Test positive/negative DNS caching for host probes."""
+
+    def test_positive_and_negative_verdicts_cached(self, temp_dir):
+        """Both answers are cached; later lookups cost nothing, even after a restart."""
+        resolver = FakeResolver({"acme.com"})
+        dns = DnsCache(temp_dir / "dns.json", resolver=resolver)
+        assert dns.resolve("acme.com") and not dns.resolve("jobs.acme.com")
+        assert dns.resolve("ACME.com") and not dns.resolve("jobs.acme.com")
+        assert resolver.calls == {"acme.com": 1, "jobs.acme.com": 1}
+
+        dns.save()
+        again = DnsCache(temp_dir / "dns.json", resolver=resolver)
+        assert again.resolve("acme.com") and not again.resolve("jobs.acme.com")
+        assert sum(resolver.calls.values()) == 2
+
+    def test_ttls(self, temp_dir):
+        """Verdicts expire after their own TTL."""
+        dns = DnsCache(temp_dir / "dns.json", ttl_h=1, negative_ttl_h=24, resolver=FakeResolver({"acme.com"}))
+        dns.resolve("acme.com")
+        dns.resolve("jobs.acme.com")
+        now = time.time()
+        assert dns.cached("acme.com", now + 1800) is True
+        assert dns.cached("acme.com", now + 7200) is None
+        assert dns.cached("jobs.acme.com", now + 7200) is False
+        assert dns.cached("jobs.acme.com", now + 25 * 3600) is None
+
+    def test_transient_failures_not_cached(self, temp_dir):
+        """A resolver timeout is not an answer: the host counts as existing and is asked again."""
+        calls = []
+
+        def flaky(host):
+            calls.append(host)
+            raise socket.gaierror(socket.EAI_AGAIN, "Temporary failure in name resolution")
+
+        dns = DnsCache(temp_dir / "dns.json", resolver=flaky)
+        assert dns.resolve("acme.com") and dns.resolve("acme.com")
+        assert len(calls) == 2
+
+    def test_prewarm_parallel_and_filter(self, temp_dir):
+        """Many hosts resolve concurrently; dead hosts are filtered out of URL lists."""
+        resolver = FakeResolver({f"c{i}.com" for i in range(50)}, delay=0.05)
+        dns = DnsCache(temp_dir / "dns.json", resolver=resolver)
+        start = time.monotonic()
+        verdicts = dns.prewarm([f"c{i}.com" for i in range(50)] + [f"careers.c{i}.com" for i in range(50)], workers=50)
+        assert time.monotonic() - start < 1.0  # 100 x 50ms sequentially would be 5s
+        assert sum(verdicts.values()) == 50 and (temp_dir / "dns.json").exists()
+
+        urls = ["https://c1.com/careers", "https://careers.c1.com", "https://c1.com/jobs"]
+        assert dns.filter_urls(urls) == ["https://c1.com/careers", "https://c1.com/jobs"]
+        assert resolver.calls["c1.com"] == 1
+
+    def test_async_probe_skips_dead_hosts(self, temp_dir):
+        """The async engine never contacts hosts that do not resolve."""
+        requested = []
+
+        async def handler(request):
+            requested.append(request.url.host)
+            return httpx.Response(200, html="careers")
+
+        dns = DnsCache(temp_dir / "dns.json", resolver=FakeResolver({"acme.com"}))
+        pages = probe_sync({"acme": ["https://careers.acme.com/", "https://acme.com/careers"]},
+                           transport=httpx.MockTransport(handler), dns=dns)
+        assert requested == ["acme.com"]
+        assert pages["acme"].url == "https://acme.com/careers"
@@ -0,0 +1,58 @@
+import numpy as np
+from unittest.mock import patch
+from scripts.embedding_store import EmbeddingStore, text_hash
+
+
+class TestEmbeddingStore:
+    """Test the memory-mapped embedding matrix."""
+    
+    def _store(self, temp_dir, model="test-model", dtype=None):
+        return EmbeddingStore(model, temp_dir / "emb.npy", temp_dir / "emb_index.json", dtype=dtype)
+    
+    def test_put_save_reload(self, temp_dir):
+        """Embeddings round-trip through the .npy memmap and id index."""
+        store = self._store(temp_dir)
+        store.put("a", text_hash("A"), [1.0, 0.0, 0.5])
+        store.put("b", text_hash("B"), [0.0, 1.0, 0.25])
+        store.save()
+        
+        reloaded = self._store(temp_dir)
+        assert len(reloaded) == 2
+        assert reloaded.dtype == np.float16
+        assert isinstance(reloaded.matrix, np.memmap)
+        assert np.allclose(reloaded["b"], [0.0, 1.0, 0.25])
+        assert reloaded.get_many(["b", "a"]).shape == (2, 3)
+        assert reloaded.view().shape == (2, 3)
+        assert np.load(temp_dir / "emb.npy").shape[1] == 3  # still a valid .npy
+    
+    def test_lookup_requires_same_text(self, temp_dir):
+        """Changed job text misses the cache; replacing reuses the row."""
+        store = self._store(temp_dir)
+        store.put("a", text_hash("old"), [1.0, 0.0])
+        
+        assert store.lookup("a", text_hash("old")) == 0
+        assert store.lookup("a", text_hash("new")) is None
+        
+        store.put("a", text_hash("new"), [0.0, 1.0])
+        assert store.rows == 1
+        assert store.lookup("a", text_hash("new")) == 0
+    
+    def test_grows_past_capacity(self, temp_dir):
+        """Appends beyond the preallocated rows keep earlier data."""
+        with patch('scripts.embedding_store.MIN_CAPACITY', 4):
+            store = self._store(temp_dir, dtype="float32")
+            for i in range(10):
+                store.put(f"j{i}", "h", [float(i), 1.0])
+            store.save()
+        
+        reloaded = self._store(temp_dir)
+        assert reloaded.matrix.shape[0] >= 10
+        assert [reloaded[f"j{i}"][0] for i in range(10)] == list(range(10))
+    
+    def test_model_change_starts_fresh(self, temp_dir):
+        """Embeddings from another model are not reused."""
+        store = self._store(temp_dir)
+        store.put("a", "h", [1.0, 0.0])
+        store.save()
+        
+        assert "a" not in self._store(temp_dir, model="other-model")
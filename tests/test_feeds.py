@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import feedparser
+import pytest
+from scripts import feeds
+from scripts.feeds import FeedPoller
+
+
+URL = "https://example.com/rss"
+NOW = datetime(2025, 3, 1, 6, 0, 0)
+
+
+def entry(n):
+    return feedparser.FeedParserDict(id=f"guid-{n}", title=f"Head of DevOps {n}", link=f"https://example.com/{n}")
+
+
+def parsed(entries, status=200, etag='"v1"', modified="Sat, 01 Mar 2025 06:00:00 GMT"):
+    if status == 304:
+        return feedparser.FeedParserDict(status=304, entries=[], bozo=False)
+    return feedparser.FeedParserDict(status=status, entries=entries, etag=etag, modified=modified, bozo=False)
+
+
+class TestFeedPoller:
+    """Test conditional feed polling and seen-entry dedupe."""
+
+    def test_only_new_entries_returned(self, temp_dir):
+        """Entries from earlier polls are skipped; validators are sent back."""
+        poller = FeedPoller(temp_dir / "feed_state.json")
+        with patch.object(feeds.feedparser, "parse", return_value=parsed([entry(1), entry(2)])) as parse:
+            fresh, info = poller.poll(URL, now=NOW)
+        assert [e.id for e in fresh] == ["guid-1", "guid-2"]
+        assert info == {"status": 200, "entries": 2, "new": 2}
+        parse.assert_called_with(URL, etag=None, modified=None)
+
+        with patch.object(feeds.feedparser, "parse", return_value=parsed([entry(3), entry(1), entry(2)], etag='"v2"')) as parse:
+            fresh, info = poller.poll(URL, now=NOW + timedelta(days=1))
+        assert [e.id for e in fresh] == ["guid-3"]
+        parse.assert_called_with(URL, etag='"v1"', modified="Sat, 01 Mar 2025 06:00:00 GMT")
+
+    def test_not_modified(self, temp_dir):
+        """A 304 yields nothing and keeps the stored validators."""
+        poller = FeedPoller(temp_dir / "feed_state.json")
+        with patch.object(feeds.feedparser, "parse", return_value=parsed([entry(1)])):
+            poller.poll(URL, now=NOW)
+        with patch.object(feeds.feedparser, "parse", return_value=parsed([], status=304)):
+            fresh, info = poller.poll(URL, now=NOW + timedelta(days=1))
+        assert fresh == [] and info["status"] == 304
+        assert poller.feeds[URL]["etag"] == '"v1"'
+
+    def test_state_persists_and_expires(self, temp_dir):
+        """Seen GUIDs survive a restart and expire after the TTL once out of the feed."""
+        path = temp_dir / "feed_state.json"
+        with patch.object(feeds.feedparser, "parse", return_value=parsed([entry(1)])):
+            FeedPoller(path, ttl_days=30).poll(URL, now=NOW)
+
+        with patch.object(feeds.feedparser, "parse", return_value=parsed([entry(1)])):
+            fresh, _ = FeedPoller(path, ttl_days=30).poll(URL, now=NOW + timedelta(days=10))
+        assert fresh == []
+
+        with patch.object(feeds.feedparser, "parse", return_value=parsed([entry(2)])):
+            FeedPoller(path, ttl_days=30).poll(URL, now=NOW + timedelta(days=11))
+        poller = FeedPoller(path, ttl_days=30)
+        assert len(poller.feeds[URL]["seen"]) == 2
+        with patch.object(feeds.feedparser, "parse", return_value=parsed([entry(2)])):
+            poller.poll(URL, now=NOW + timedelta(days=45))
+        assert len(poller.feeds[URL]["seen"]) == 1
+
+    def test_limit(self, temp_dir):
+        """Only the first `limit` entries are considered."""
+        poller = FeedPoller(temp_dir / "feed_state.json")
+        with patch.object(feeds.feedparser, "parse", return_value=parsed([entry(i) for i in range(5)])):
+            fresh, info = poller.poll(URL, limit=2, now=NOW)
+        assert len(fresh) == 2 and info["entries"] == 2
+
+    def test_broken_feed_raises(self, temp_dir):
+        """An unreachable feed raises instead of looking empty."""
+        poller = FeedPoller(temp_dir / "feed_state.json")
+        broken = feedparser.FeedParserDict(entries=[], bozo=True, bozo_exception=OSError("timeout"))
+        with patch.object(feeds.feedparser, "parse", return_value=broken):
+            with pytest.raises(RuntimeError):
+                poller.poll(URL, now=NOW)
+        assert not (temp_dir / "feed_state.json").exists()
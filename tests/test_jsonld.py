@@ -0,0 +1,86 @@
+import json
+from unittest.mock import patch
+import responses
+from scripts import ats_fingerprint, dns_cache
+from scripts.ats_fingerprint import AtsMap
+from scripts.dns_cache import DnsCache
+from scripts.jsonld import job_postings, posting_record, page_records, location
+
+
+def ld(data):
+    return f'<script type="application/ld+json">{json.dumps(data)}</script>'
+
+
+POSTING = {
+    "@context": "https://schema.org",
+    "@type": "JobPosting",
+    "title": "Head of DevOps",
+    "url": "https://acme.com/careers/42",
+    "datePosted": "2025-03-01",
+    "description": "<p>Lead the <b>platform</b> team.</p><ul><li>Kubernetes</li></ul>",
+    "hiringOrganization": {"@type": "Organization", "name": "Acme"},
+    "jobLocation": {"@type": "Place", "address": {"addressLocality": "Tel Aviv",
+                                                  "addressCountry": {"@type": "Country", "name": "Israel"}}},
+}
+
+
+class TestJsonLd:
+    """Test JobPosting extraction without a DOM."""
+
+    def test_posting_fields(self):
+        """Title, per-job URL, date, location and plain-text description are read."""
+        html = f"<html><head>{ld({'@type': 'Organization', 'name': 'Acme'})}{ld(POSTING)}</head></html>"
+        postings = job_postings(html)
+        assert len(postings) == 1
+        rec = posting_record(postings[0], "https://acme.com/careers")
+        assert rec["title"] == "Head of DevOps" and rec["company"] == "Acme"
+        assert rec["url"] == "https://acme.com/careers/42" and rec["posted_at"] == "2025-03-01"
+        assert rec["location"] == "Tel Aviv, Israel"
+        assert rec["jd"] == "Lead the platform team.\nKubernetes"
+
+    def test_graph_and_lists(self):
+        """Postings inside @graph, arrays and ItemList elements are found."""
+        other = {**POSTING, "title": "VP Infrastructure", "url": "https://acme.com/careers/43"}
+        html = (ld({"@graph": [POSTING]}) + ld([other]) +
+                ld({"@type": "ItemList", "itemListElement": [{"@type": "ListItem", "item": {**other, "title": "CTO"}}]}))
+        assert [p["title"] for p in job_postings(html)] == ["Head of DevOps", "VP Infrastructure", "CTO"]
+
+    def test_broken_or_absent(self):
+        """Invalid JSON is skipped and pages without JSON-LD cost nothing."""
+        html = '<script type="application/ld+json">{"@type": "JobPosting", </script>' + ld(POSTING)
+        assert len(job_postings(html)) == 1
+        assert job_postings("<html><div class='job'>Head of DevOps</div></html>") == []
+
+    def test_locations(self):
+        """Several places are joined and telecommute postings are marked remote."""
+        posting = {"jobLocation": [{"address": {"addressLocality": "Tel Aviv", "addressCountry": "IL"}},
+                                   {"address": "Haifa"}], "jobLocationType": "TELECOMMUTE"}
+        assert location(posting) == "Tel Aviv, IL; Haifa; Remote"
+
+    def test_page_records_filters_titles(self):
+        """Only titles containing a wanted position are kept, with ids and a default location."""
+        no_place = {k: v for k, v in POSTING.items() if k != "jobLocation"}
+        html = ld(no_place) + ld({**POSTING, "title": "Data Analyst"})
+        recs = page_records(html, "https://acme.com/careers", "Acme", titles=["head of devops"],
+                            default_location="Israel")
+        assert [r["title"] for r in recs] == ["Head of DevOps"]
+        assert recs[0]["location"] == "Israel" and recs[0]["id"]
+
+    @responses.activate
+    def test_career_scraper_prefers_jsonld(self, temp_dir):
+        """The career page scraper returns the structured postings instead of guessing from HTML."""
+        from scripts import career_page_scraper as cps
+
+        html = (f"<html>{ld(POSTING)}<div class='job-card'><h3>Head of DevOps</h3></div>"
+                "<p>Jobs in Tel Aviv, Israel</p></html>")
+        responses.add(responses.GET, "https://acme.com/careers", body=html, content_type="text/html")
+
+        dns = DnsCache(temp_dir / "dns_cache.json", resolver=lambda host: ["127.0.0.1"])
+        with patch.object(ats_fingerprint, "_map", AtsMap(temp_dir / "ats_map.json")), \
+             patch.object(dns_cache, "_cache", dns), \
+             patch.object(cps.time, "sleep", lambda s: None):
+            jobs = cps.search_company_careers({"name": "acme", "description": "Acme",
+                                               "career_page": "https://acme.com/careers"}, ["Head of DevOps"])
+        assert len(jobs) == 1
+        assert jobs[0]["url"] == "https://acme.com/careers/42" and jobs[0]["posted_at"] == "2025-03-01"
+        assert jobs[0]["source"] == "career_page_jsonld"
@@ -0,0 +1,120 @@
+import pytest
+import numpy as np
+from scripts.learning_system import PreferenceMatcher, PreferenceVectorModel, JobLearningSystem
+
+
+PATTERNS = {
+    "preferred_keywords": ["devops", "dev", "platform"],
+    "avoided_keywords": ["test"],
+    "preferred_companies": ["jfrog"],
+    "avoided_companies": ["bigid", ""],
+    "preferred_roles": ["head", "director"],
+    "avoided_roles": ["architect"],
+}
+
+
+class TestPreferenceMatcher:
+    """Test the compiled learning-preference scorer."""
+    
+    def test_matches_substring_loops(self):
+        """Batch scores equal the per-term substring checks, including overlapping terms."""
+        matcher = PreferenceMatcher(PATTERNS)
+        titles = ["Head of DevOps", "Platform Architect", "Test Director", "", "DevDevOps"]
+        companies = ["JFrog", "BigID", "monday", "", None]
+        
+        scores = matcher.scores(titles, companies)
+        
+        assert scores == pytest.approx([0.45, -0.4, -0.05, 0.0, 0.2])
+    
+    def test_explain_per_term(self):
+        """Per-term contributions are exposed for explanations."""
+        matcher = PreferenceMatcher(PATTERNS)
+        
+        terms = matcher.explain("Head of DevOps", "jfrog")
+        
+        assert terms == pytest.approx({"head": 0.15, "devops": 0.1, "dev": 0.1, "jfrog": 0.1})
+    
+    def test_empty_patterns(self):
+        """No learned patterns means no adjustment."""
+        scores = PreferenceMatcher({}).scores(["Head of DevOps"], ["monday"])
+        assert isinstance(scores, np.ndarray)
+        assert scores.tolist() == [0.0]
+    
+    def test_learning_system_batch_and_single_agree(self):
+        """JobLearningSystem exposes single and batch scoring over the same matcher."""
+        learning = JobLearningSystem()
+        learning.patterns = dict(PATTERNS)
+        learning._matcher = None
+        jobs = [{"title": "Head of DevOps", "company": "JFrog"}, {"title": "QA Test Lead", "company": "bigid"}]
+        
+        batch = learning.calculate_preference_scores(jobs)
+        
+        assert batch[0] == pytest.approx(learning.calculate_preference_score("Head of DevOps", "JFrog"))
+        assert batch[1] == pytest.approx(-0.4)
+
+
+class TestPreferenceVectorModel:
+    """Test the embedding preference model learned from feedback."""
+    
+    def _state(self, applied=(), ignored=()):
+        return {"applied": {j: {} for j in applied}, "ignored": {j: {} for j in ignored}}
+    
+    def test_untrained_until_both_labels(self):
+        """A direction needs at least one applied and one ignored job."""
+        model = PreferenceVectorModel()
+        model.update(self._state(applied=["a"]), {"a": np.array([1.0, 0.0])})
+        
+        assert not model.ready
+        assert model.scores(np.eye(2)).tolist() == [0.0, 0.0]
+    
+    def test_centroid_difference_scores(self):
+        """Jobs near applied ones get boosted, jobs near ignored ones penalized."""
+        model = PreferenceVectorModel()
+        vectors = {"a": np.array([1.0, 0.0]), "b": np.array([0.0, 2.0])}
+        
+        changes = model.update(self._state(applied=["a"], ignored=["b"]), vectors)
+        scores = model.scores(np.array([[1.0, 0.0], [0.0, 1.0]]))
+        
+        assert changes == 2
+        assert scores[0] > 0 > scores[1]
+        assert scores[0] == pytest.approx(-scores[1])
+    
+    def test_incremental_relabel_and_removal(self, temp_dir):
+        """Label changes and removed feedback are applied without new embeddings."""
+        model = PreferenceVectorModel()
+        vectors = {"a": np.array([1.0, 0.0]), "b": np.array([0.0, 1.0]), "c": np.array([1.0, 1.0])}
+        model.update(self._state(applied=["a", "c"], ignored=["b"]), vectors)
+        
+        # c moves to ignored, a is un-applied; no vectors available this run
+        changes = model.update(self._state(applied=[], ignored=["b", "c"]), {})
+        
+        assert changes == 2
+        assert sorted(model.ids) == ["b", "c"]
+        assert model.labels.tolist() == [-1, -1]
+        
+        path = temp_dir / "prefs.npz"
+        model.save(path)
+        loaded = PreferenceVectorModel.load(path)
+        assert loaded.ids == model.ids
+        assert np.array_equal(loaded.vectors, model.vectors)
+
+
+class TestLearningFingerprint:
+    """Test the fingerprint used to invalidate cached scores."""
+    
+    def test_changes_with_patterns_and_labels(self):
+        """Pattern edits and feedback relabels change the fingerprint; dates do not."""
+        learning = JobLearningSystem()
+        learning.patterns = dict(PATTERNS, last_updated="2024-01-01")
+        learning.vector_model = PreferenceVectorModel(["a"], [1], np.ones((1, 2), dtype=np.float32))
+        base = learning.fingerprint()
+        
+        learning.patterns["last_updated"] = "2024-02-01"
+        assert learning.fingerprint() == base
+        
+        learning.patterns["avoided_roles"] = ["architect", "manager"]
+        edited = learning.fingerprint()
+        assert edited != base
+        
+        learning.vector_model.labels[0] = -1
+        assert learning.fingerprint() != edited
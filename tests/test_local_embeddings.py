@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+from scripts.local_embeddings import LocalEmbedder, features, N_FEATURES
+
+
+CORPUS = [
+    "Head of DevOps\nKubernetes, Terraform and AWS infrastructure at scale",
+    "Director of Platform Engineering\nKubernetes platform, SRE and observability",
+    "Frontend Engineer\nReact, TypeScript and CSS for our web application",
+    "Senior UI Developer\nReact components, design systems and TypeScript",
+    "Data Scientist\nPython, statistics and machine learning models",
+    "ML Engineer\nMachine learning pipelines in Python and PyTorch",
+]
+
+
+class TestLocalEmbedder:
+    """Test the offline TF-IDF + SVD embedding backend."""
+    
+    def test_features_are_stable_hashes(self):
+        """Feature ids are deterministic and inside the hashing space."""
+        feats = features("Kubernetes platform")
+        assert feats == features("kubernetes PLATFORM")
+        assert all(0 <= f < N_FEATURES for f in feats)
+    
+    def test_embeddings_capture_similarity(self):
+        """Related job texts end up closer than unrelated ones."""
+        model = LocalEmbedder().train(CORPUS)
+        vecs = model.embed(["DevOps lead for Kubernetes on AWS", "React TypeScript developer", CORPUS[0]])
+        
+        assert vecs.dtype == np.float32
+        assert np.linalg.norm(vecs, axis=1) == pytest.approx([1.0, 1.0, 1.0], abs=1e-5)
+        assert vecs[0] @ vecs[2] > vecs[1] @ vecs[2]
+    
+    def test_save_load_and_retrain(self, temp_dir):
+        """The saved model reproduces embeddings; it retrains only once the corpus has grown."""
+        path = temp_dir / "local.npz"
+        model = LocalEmbedder.for_corpus(CORPUS[:3], path)
+        reloaded = LocalEmbedder.for_corpus(CORPUS[:4], path)
+        
+        assert reloaded.model == model.model
+        assert np.allclose(reloaded.embed(CORPUS[:2]), model.embed(CORPUS[:2]))
+        
+        grown = LocalEmbedder.for_corpus(CORPUS, path)
+        assert grown.model != model.model
+        assert grown.trained_n == len(CORPUS)
+    
+    def test_untrained_model_refuses_to_embed(self):
+        """Embedding before training is an error, not silent zeros."""
+        with pytest.raises(RuntimeError):
+            LocalEmbedder().embed(["text"])
@@ -2,7 +2,24 @@ import pytest
 import csv
 import io
 from unittest.mock import patch, mock_open
-from scripts.network import norm, main
+from scripts.network import norm, main, company_key, ConnectionsIndex, warm_intros
+
+
+@pytest.fixture(autouse=True)
+def index_path(temp_dir):
+    """Keep the connections index out of data/processed."""
+    path = temp_dir / "connections.db"
+    with patch('scripts.network.INDEX', path):
+        yield path
+
+
+def write_connections(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=['First Name', 'Last Name', 'Company', 'Email Address', 'Position'])
+        writer.writeheader()
+        for first, last, company in rows:
+            writer.writerow({'First Name': first, 'Last Name': last, 'Company': company,
+                             'Email Address': '', 'Position': 'Engineer'})
 
 
 class TestNetwork:
@@ -103,3 +120,62 @@ class TestNetwork:
         
         captured = capsys.readouterr()
         assert "No likely connectors found." in captured.out
+
+
+class TestConnectionsIndex:
+    """Test the persistent connections index."""
+    
+    def test_company_key(self):
+        """Domains, legal suffixes and punctuation collapse to one key."""
+        assert company_key("Monday.com") == "monday"
+        assert company_key("monday.com Ltd.") == "monday"
+        assert company_key("https://www.wix.com/") == "wix"
+        assert company_key("Check Point Software Technologies") == "check point software"
+        assert company_key("Inc") == "inc"
+    
+    def test_index_rebuilt_only_when_csv_changes(self, temp_dir, index_path, capsys):
+        """A second open reuses the SQLite index; editing the CSV rebuilds it."""
+        conns = temp_dir / "connections.csv"
+        write_connections(conns, [("John", "Doe", "Monday.com")])
+        
+        index = ConnectionsIndex(conns, index_path)
+        assert [p[0] for p in index.lookup("monday")] == ["John Doe"]
+        index.close()
+        
+        index = ConnectionsIndex(conns, index_path)
+        index.lookup("monday")
+        index.close()
+        assert capsys.readouterr().out.count("[NETWORK] Indexed") == 1
+        
+        write_connections(conns, [("John", "Doe", "Monday.com"), ("Jane", "Smith", "monday.com Ltd")])
+        index = ConnectionsIndex(conns, index_path)
+        assert [p[0] for p in index.lookup("Monday")] == ["John Doe", "Jane Smith"]
+        index.close()
+        assert "[NETWORK] Indexed 2 connections" in capsys.readouterr().out
+    
+    def test_lookup_many_fuzzy(self, temp_dir, index_path):
+        """Batch lookup resolves aliases, substrings and near-miss spellings."""
+        conns = temp_dir / "connections.csv"
+        write_connections(conns, [
+            ("John", "Doe", "Monday.com"),
+            ("Ann", "Lee", "Lemonade Inc."),
+            ("Bob", "Ray", "Check Point Software Technologies"),
+        ])
+        index = ConnectionsIndex(conns, index_path)
+        found = index.lookup_many(["monday.com", "Lemonaid", "Check Point", "Unknown Co", ""])
+        index.close()
+        
+        assert [p[0] for p in found["monday.com"]] == ["John Doe"]
+        assert [p[0] for p in found["Lemonaid"]] == ["Ann Lee"]
+        assert [p[0] for p in found["Check Point"]] == ["Bob Ray"]
+        assert found["Unknown Co"] == []
+        assert "" not in found
+    
+    def test_warm_intros(self, temp_dir):
+        """Only companies with connections get intro candidates; no CSV means no intros."""
+        conns = temp_dir / "connections.csv"
+        write_connections(conns, [("John", "Doe", "Wix"), ("Jane", "Smith", "Wix.com"), ("Max", "Roe", "wix")])
+        with patch('scripts.network.CSV', conns):
+            assert warm_intros(["Wix", "Other"], limit=2) == {"Wix": ["John Doe", "Jane Smith"]}
+        with patch('scripts.network.CSV', temp_dir / "missing.csv"):
+            assert warm_intros(["Wix"]) == {}
@@ -0,0 +1,81 @@
+import pytest
+import json
+from unittest.mock import patch
+from scripts.notion_writer import FakeNotionClient, sync, RateLimiter
+
+
+def rows(n=4, **overrides):
+    return [dict({"id": f"job{i}", "title": f"Job {i}", "company": "acme", "location": "Tel Aviv",
+                  "url": f"https://example.com/{i}", "score": 0.9 - i / 100, "why_fit": "fit"}, **overrides)
+            for i in range(n)]
+
+
+@pytest.fixture
+def ledger(temp_dir):
+    path = temp_dir / "ledger.json"
+    with patch('scripts.notion_writer.LEDGER', path), patch('scripts.notion_writer.NOTION_DB_ID', 'db1'):
+        yield path
+
+
+class TestNotionSync:
+    """Test the idempotent Notion sync engine against the fake client."""
+    
+    def test_first_sync_creates_with_status(self, ledger):
+        """New rows are created once, with the initial Status, and recorded in the ledger."""
+        notion = FakeNotionClient()
+        
+        stats = sync(notion, rows(), rate=0)
+        
+        assert stats == {"created": 4, "updated": 0, "unchanged": 0, "failed": 0}
+        assert all(p["Status"]["select"]["name"] == "New" for p in notion.pages.store.values())
+        assert set(json.loads(ledger.read_text())["pages"]) == {"job0", "job1", "job2", "job3"}
+    
+    def test_resync_is_o_changed(self, ledger):
+        """Unchanged rows make no calls; changed rows are updated without touching Status."""
+        notion = FakeNotionClient()
+        sync(notion, rows(), rate=0)
+        notion.pages.calls.clear()
+        
+        assert sync(notion, rows(), rate=0)["unchanged"] == 4
+        assert notion.pages.calls == []
+        
+        changed = rows()
+        changed[1]["score"] = 0.95
+        changed.append(dict(rows(5)[4]))
+        stats = sync(notion, changed, rate=0)
+        
+        assert stats == {"created": 1, "updated": 1, "unchanged": 3, "failed": 0}
+        assert sorted(c[0] for c in notion.pages.calls) == ["create", "update"]
+        assert len(notion.pages.store) == 5
+        page = json.loads(ledger.read_text())["pages"]["job1"]["page"]
+        assert notion.pages.store[page]["Score"]["number"] == 0.95
+        assert notion.pages.store[page]["Status"]["select"]["name"] == "New"
+    
+    def test_deleted_page_is_recreated(self, ledger):
+        """A page removed in Notion is created again instead of failing the sync."""
+        notion = FakeNotionClient()
+        sync(notion, rows(1), rate=0)
+        notion.pages.store.clear()
+        
+        stats = sync(notion, rows(1, score=0.5), rate=0)
+        
+        assert stats["created"] == 1
+        assert len(notion.pages.store) == 1
+    
+    def test_new_database_starts_fresh_ledger(self, ledger):
+        """Switching NOTION_DB_ID does not reuse page ids from another database."""
+        notion = FakeNotionClient()
+        sync(notion, rows(2), rate=0)
+        
+        with patch('scripts.notion_writer.NOTION_DB_ID', 'db2'):
+            assert sync(notion, rows(2), rate=0)["created"] == 2
+    
+    @patch('scripts.utils.time.sleep')
+    @patch('scripts.utils.time.monotonic', return_value=100.0)
+    def test_rate_limiter_spaces_calls(self, mock_now, mock_sleep):
+        """Calls are spaced 1/rate seconds apart."""
+        limiter = RateLimiter(4)
+        for _ in range(3):
+            limiter.wait()
+        
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [0.25, 0.5]
@@ -0,0 +1,57 @@
+from unittest.mock import patch, MagicMock
+from scripts.prefilter import prefilter, location_ok, seniority
+
+
+JOBS = [
+    {"id": "a", "title": "Head of DevOps", "location": "Tel-Aviv"},
+    {"id": "b", "title": "Senior Software Engineer", "location": "Tel Aviv, Israel"},
+    {"id": "c", "title": "Director of Platform", "location": "Berlin, Germany"},
+    {"id": "d", "title": "Engineering Manager", "location": ""},
+    {"id": "e", "title": "VP Engineering", "location": "Remote"},
+]
+
+
+class TestPrefilter:
+    """Test the cheap stage of the scoring cascade."""
+    
+    def test_location_and_seniority(self):
+        """Israeli, remote and unknown locations pass; seniority ranks VP/head above manager."""
+        assert location_ok("Tel-Aviv") and location_ok("") and location_ok("Remote - EMEA")
+        assert not location_ok("London, UK")
+        assert seniority("VP Engineering") > seniority("Engineering Manager") > seniority("Staff Engineer") == 0.0
+    
+    def test_rule_stage(self):
+        """Excluded titles and explicit foreign locations never reach the embedding stage."""
+        survivors, stats = prefilter(JOBS, {})
+        
+        assert [j["id"] for j in survivors] == ["a", "d", "e"]
+        assert stats == {"input": 5, "rules": 3, "reach": 3, "embedded": 3}
+    
+    def test_learned_avoidances_respect_threshold(self):
+        """Jobs whose learned penalty makes SCORE_THRESHOLD unreachable are dropped."""
+        learning = MagicMock()
+        learning.calculate_preference_scores.return_value = [0.1, -0.3, 0.0]
+        
+        with patch('scripts.prefilter.THRESHOLD', 0.78), patch('scripts.prefilter.CEILING', 0.9):
+            survivors, stats = prefilter(JOBS, {}, learning)
+        assert [j["id"] for j in survivors] == ["a", "e"]
+        assert stats["reach"] == 2
+        
+        with patch('scripts.prefilter.THRESHOLD', 0.5):
+            survivors, _ = prefilter(JOBS, {}, learning)
+        assert len(survivors) == 3
+    
+    def test_top_n_by_cheap_score(self):
+        """With a cap, the best lexical + seniority matches are embedded."""
+        with patch('scripts.prefilter.TOP_N', 2):
+            survivors, stats = prefilter(JOBS, {"a": 2.0, "d": 4.0, "e": 0.0})
+        
+        assert [j["id"] for j in survivors] == ["d", "a"]
+        assert stats["embedded"] == 2
+    
+    def test_disabled(self):
+        """SCORE_PREFILTER=0 passes everything through."""
+        with patch('scripts.prefilter.ENABLED', False):
+            survivors, stats = prefilter(JOBS, {})
+        assert survivors == JOBS
+        assert stats["embedded"] == 5
@@ -0,0 +1,170 @@
+import time
+import socket
+import threading
+import http.server
+from unittest.mock import patch
+from functools import partial
+import pytest
+from scripts.render import RenderPool, StaticBackend, Page, should_block
+
+
+@pytest.fixture
+def fixture_server(temp_dir):
+    """Static files from temp_dir on a local port; yields (base_url, request log)."""
+    (temp_dir / "jobs.html").write_text("<html><body><h2>Head of DevOps</h2></body></html>")
+    (temp_dir / "other.html").write_text("<html><body><h2>VP Infrastructure</h2></body></html>")
+    log = []
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def do_GET(self):
+            log.append(self.path)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), partial(Handler, directory=str(temp_dir)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", log
+    server.shutdown()
+    server.server_close()
+
+
+class CountingBackend(StaticBackend):
+    """Static backend that counts the contexts it opens."""
+
+    def __init__(self):
+        self.opened = 0
+
+    def open(self):
+        self.opened += 1
+        return super().open()
+
+
+class TestRenderPool:
+    """Test the rendering pool against a local fixture server."""
+
+    def test_render_and_cache(self, temp_dir, fixture_server):
+        """Pages are fetched once; repeats come from the memory and disk caches."""
+        base, log = fixture_server
+        with RenderPool(size=2, backend=StaticBackend(), cache_dir=temp_dir / "cache") as pool:
+            page = pool.render(f"{base}/jobs.html")
+            again = pool.render(f"{base}/jobs.html")
+        assert isinstance(page, Page) and page.status_code == 200
+        assert "Head of DevOps" in page.text and again.text == page.text
+        assert log == ["/jobs.html"] and pool.cache_hits == 1
+
+        with RenderPool(backend=StaticBackend(), cache_dir=temp_dir / "cache") as pool:
+            assert "Head of DevOps" in pool.render(f"{base}/jobs.html").text
+        assert log == ["/jobs.html"]
+
+    def test_cache_expires(self, temp_dir, fixture_server):
+        """A disk cache entry older than the TTL is fetched again."""
+        base, log = fixture_server
+        with RenderPool(backend=StaticBackend(), cache_dir=temp_dir / "cache") as pool:
+            pool.render(f"{base}/jobs.html")
+        with RenderPool(backend=StaticBackend(), cache_dir=temp_dir / "cache", cache_ttl_h=0) as pool:
+            pool.render(f"{base}/jobs.html")
+        assert log == ["/jobs.html", "/jobs.html"]
+
+    def test_render_many_reuses_contexts(self, temp_dir, fixture_server):
+        """Many pages share at most `size` browser contexts; only 200s are cached."""
+        base, _ = fixture_server
+        backend = CountingBackend()
+        urls = [f"{base}/jobs.html", f"{base}/other.html", f"{base}/missing.html"]
+        with RenderPool(size=2, backend=backend, cache_dir=temp_dir / "cache") as pool:
+            pages = pool.render_many(urls)
+        assert set(pages) == set(urls)
+        assert pages[urls[2]].status_code == 404
+        assert backend.opened <= 2
+        assert len(list((temp_dir / "cache").glob("*.json"))) == 2  # the 404 is not cached
+
+    def test_errors_propagate(self, temp_dir):
+        """A page that cannot be loaded raises from render()."""
+        with RenderPool(backend=StaticBackend(), cache_dir=temp_dir / "cache") as pool:
+            with pytest.raises(Exception):
+                pool.render("not-a-url")
+
+    def test_should_block(self):
+        """Heavy assets and analytics are blocked, documents and scripts are not."""
+        assert should_block("image", "https://acme.com/logo.png")
+        assert should_block("script", "https://www.google-analytics.com/analytics.js")
+        assert not should_block("script", "https://acme.com/app.js")
+        assert not should_block("document", "https://acme.com/careers")
+
+
+class ScriptedBrowser(StaticBackend):
+    """Browser stand-in: "runs" a page's script by filling its app root, and records
+    how many pages render at once."""
+    name = "scripted"
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def open(self):
+        context = super().open()
+        backend = self
+
+        class Context:
+            def render(self, url, timeout):
+                with backend.lock:
+                    backend.active += 1
+                    backend.peak = max(backend.peak, backend.active)
+                try:
+                    time.sleep(backend.delay)
+                    page = context.render(url, timeout)
+                finally:
+                    with backend.lock:
+                        backend.active -= 1
+                html = page.text.replace('<div id="app"></div>', APP_JOBS)
+                return Page(url, page.status_code, html, rendered=True)
+
+            def close(self):
+                context.close()
+
+        return Context()
+
+
+APP_JOBS = ('<div class="job-card"><h3>Head of DevOps</h3></div>'
+            '<p>Open positions in Tel Aviv, Israel. Join our engineering team.</p>')
+
+
+def _nxdomain(host):
+    raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+
+class TestRenderedSources:
+    """Test crawl sources reading pages through the scheduler's Http.render and the pool."""
+
+    def test_career_pages_render_concurrently(self, temp_dir, fixture_server):
+        """Career pages built by JavaScript are crawled through the pool, several at once."""
+        from scripts import ats_fingerprint, dns_cache, render
+        from scripts import career_page_scraper as cps
+        from scripts.ats_fingerprint import AtsMap
+        from scripts.crawl_scheduler import Http, crawl
+        from scripts.dns_cache import DnsCache
+        from scripts.sources import SOURCES
+
+        base, log = fixture_server
+        (temp_dir / "careers.html").write_text('<html><body><div id="app"></div><script src="app.js"></script></body></html>')
+        companies = [{"name": f"co{i}", "description": f"Co {i}", "career_page": f"{base}/careers.html?co={i}"}
+                     for i in range(4)]
+        browser = ScriptedBrowser()
+        dns = DnsCache(temp_dir / "dns.json",
+                       resolver=lambda host: ["127.0.0.1"] if host == "127.0.0.1" else _nxdomain(host))
+        with RenderPool(size=2, backend=browser, cache_dir=temp_dir / "cache") as pool, \
+             patch.object(render, "_pool", pool), patch.object(cps, "MAJOR_COMPANIES", companies), \
+             patch.object(dns_cache, "_cache", dns), \
+             patch.object(ats_fingerprint, "_map", AtsMap(temp_dir / "ats_map.json")):
+            http = Http(host_rate=0)
+            collected, stats = crawl([SOURCES["career_pages"]], http)
+
+        records = collected["career_pages"]
+        assert len(records) == 4 and {r["title"] for r in records} == {"Head of DevOps"}
+        assert stats["career_pages"]["fetched"] == 4 and http.requests == 4
+        assert pool.rendered == 4 and browser.peak == 2  # the pool size, not one page at a time
+        assert len(log) == 4  # guessed hosts that do not resolve were never requested
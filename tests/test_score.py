@@ -2,7 +2,9 @@ import pytest
 import json
 import numpy as np
 from unittest.mock import patch, mock_open, MagicMock
-from scripts.score import embed, cosine, main
+from scripts.score import embed, cosine, main, fuse
+from scripts.bm25_index import BM25Index
+from scripts.embedding_store import EmbeddingStore
 
 
 class TestScore:
@@ -50,12 +52,23 @@ class TestScore:
         assert cosine(a, d) == 0.0
         assert cosine(d, d) == 0.0
     
+    @patch('scripts.score.BM25Index')
+    @patch('scripts.score.os.replace')
+    @patch('scripts.score.SCORES_META')
+    @patch('scripts.score.EmbeddingStore')
+    @patch('scripts.score.index_vectors')
     @patch('scripts.score.get_client')
     @patch('scripts.score.PROFILE', 'Senior DevOps leader with Kubernetes experience')
     @patch('scripts.score.JOBS_JL')
     @patch('scripts.score.OUT_SCORES')
-    def test_main_integration(self, mock_out_scores, mock_jobs_jl, mock_get_client, sample_jobs_data):
+    def test_main_integration(self, mock_out_scores, mock_jobs_jl, mock_get_client, mock_index_vectors, mock_store,
+                              mock_meta, mock_replace, mock_bm25, sample_jobs_data):
         """Test main scoring function."""
+        mock_bm25.return_value.scores.return_value = np.array([1.0, 0.0])
+        mock_bm25.return_value.explain.return_value = [("kubernetes", 1.2)]
+        # Empty embedding cache: every job is embedded
+        mock_store.return_value.lookup.return_value = None
+
         # Mock OpenAI embeddings
         mock_client = MagicMock()
         mock_response = MagicMock()
@@ -75,6 +88,131 @@ class TestScore:
         
         # Verify embeddings were created (profile + each job)
         assert mock_get_client.call_count >= 1  # At least one client creation
+        
+        # New job vectors are handed to the k-NN index
+        indexed_jobs, indexed_vecs = mock_index_vectors.call_args[0]
+        assert [j['id'] for j in indexed_jobs] == ['job123', 'job456']
+        assert indexed_vecs.shape == (2, 3)
+    
+    @patch('scripts.learning_system.JobLearningSystem', side_effect=Exception("no learning"))
+    @patch('scripts.score.index_vectors')
+    @patch('scripts.score.get_client')
+    @patch('scripts.score.PROFILE', 'Senior DevOps leader with Kubernetes experience')
+    def test_incremental_rescoring(self, mock_get_client, mock_index_vectors, mock_learning, temp_dir,
+                                   sample_jobs_data):
+        """Only new or changed jobs are embedded; unchanged rows are merged back in score order."""
+        texts = []
+        def create(model, input):
+            texts.append(input[0])
+            resp = MagicMock()
+            resp.data = [MagicMock(embedding=[float(len(input[0]) % 7), 1.0, 0.5])]
+            return resp
+        mock_get_client.return_value.embeddings.create.side_effect = create
+
+        jobs_jl = temp_dir / "jobs.jsonl"
+        out = temp_dir / "scores.jsonl"
+        store = lambda model: EmbeddingStore(model, temp_dir / "emb.npy", temp_dir / "emb.json")
+
+        def run(jobs):
+            jobs_jl.write_text("\n".join(json.dumps(j) for j in jobs) + "\n")
+            texts.clear()
+            with patch('scripts.score.JOBS_JL', jobs_jl), patch('scripts.score.OUT_SCORES', out), \
+                 patch('scripts.score.SCORES_META', temp_dir / "meta.json"), \
+                 patch('scripts.score.EmbeddingStore', store), \
+                 patch('scripts.score.BM25Index', lambda: BM25Index(temp_dir / "bm25.json")), \
+                 patch('scripts.score.FUSION', 'cosine'):
+                main()
+            return [json.loads(line) for line in out.read_text().splitlines()]
+
+        first = run(sample_jobs_data)
+        assert len(texts) == 3  # profile + 2 jobs
+
+        changed = dict(sample_jobs_data[1], jd="Completely rewritten description")
+        new = dict(sample_jobs_data[0], id="job789", title="Head of SRE", age=1)
+        aged = dict(sample_jobs_data[0], age=5)
+        rows = run([aged, changed, new])
+        assert len(texts) == 2  # only the changed and the new job
+        assert [r["id"] for r in rows] == [r["id"] for r in sorted(rows, key=lambda r: -r["score"])]
+        assert {r["id"] for r in rows} == {"job123", "job456", "job789"}
+        kept = next(r for r in rows if r["id"] == "job123")
+        assert kept["score"] == next(r for r in first if r["id"] == "job123")["score"]
+        assert kept["age"] == 5
+
+        # Removed jobs drop out without any new embeddings
+        rows = run([aged])
+        assert len(texts) == 0
+        assert [r["id"] for r in rows] == ["job123"]
+
+        # A profile change rescores every row; only the profile is re-embedded
+        with patch('scripts.score.PROFILE', 'Platform engineering manager'):
+            rows = run([aged])
+        assert texts == ['Platform engineering manager']
+        assert rows[0]["score"] != kept["score"]
+
+    def test_rrf_fusion_promotes_lexical_matches(self):
+        """RRF reorders cosine-sorted rows using the lexical rank; cosine mode keeps them."""
+        rows = [{"id": "a", "score": 0.9, "lexical": 0.0},
+                {"id": "b", "score": 0.8, "lexical": 5.0},
+                {"id": "c", "score": 0.7, "lexical": 4.0}]
+        
+        assert [r["id"] for r in fuse(rows, "cosine")] == ["a", "b", "c"]
+        assert [r["id"] for r in fuse(rows, "bm25")] == ["b", "c", "a"]
+        with patch('scripts.score.LEXICAL_WEIGHT', 1.0):
+            assert [r["id"] for r in fuse(rows, "rrf")] == ["b", "a", "c"]
+        with patch('scripts.score.LEXICAL_WEIGHT', 0.0):
+            assert [r["id"] for r in fuse(rows, "rrf")] == ["a", "b", "c"]
+    
+    @patch('scripts.learning_system.JobLearningSystem', side_effect=Exception("no learning"))
+    @patch('scripts.score.index_vectors')
+    @patch('scripts.score.get_client')
+    def test_offline_lexical_fallback(self, mock_get_client, mock_index_vectors, mock_learning, temp_dir,
+                                      sample_jobs_data):
+        """When the embedding API fails, jobs are ranked by BM25 and retried next run."""
+        mock_get_client.return_value.embeddings.create.side_effect = ConnectionError("API down")
+        jobs_jl = temp_dir / "jobs.jsonl"
+        jobs_jl.write_text("\n".join(json.dumps(j) for j in sample_jobs_data) + "\n")
+        out = temp_dir / "scores.jsonl"
+        meta = temp_dir / "meta.json"
+        
+        with patch('scripts.score.JOBS_JL', jobs_jl), patch('scripts.score.OUT_SCORES', out), \
+             patch('scripts.score.SCORES_META', meta), \
+             patch('scripts.score.PROFILE', 'Director of platform engineering, Terraform and AWS'), \
+             patch('scripts.score.EmbeddingStore', lambda m: EmbeddingStore(m, temp_dir / "e.npy", temp_dir / "e.json")), \
+             patch('scripts.score.BM25Index', lambda: BM25Index(temp_dir / "bm25.json")):
+            main()
+        
+        rows = [json.loads(line) for line in out.read_text().splitlines()]
+        assert [r["id"] for r in rows] == ["job456", "job123"]
+        assert all(r["score"] == 0.0 and r["lexical_only"] for r in rows)  # BM25 is not on the threshold's scale
+        assert "offline lexical match" in rows[0]["why_fit"]
+        assert rows[0]["lexical"] > rows[1]["lexical"]
+        assert json.loads(meta.read_text())["rows"] == {}
+    
+    @patch('scripts.learning_system.JobLearningSystem', side_effect=Exception("no learning"))
+    @patch('scripts.score.index_vectors')
+    @patch('scripts.score.get_client')
+    def test_local_backend_runs_offline(self, mock_get_client, mock_index_vectors, mock_learning, temp_dir,
+                                        sample_jobs_data):
+        """EMBED_BACKEND=local scores without touching the API or the shared k-NN index."""
+        jobs_jl = temp_dir / "jobs.jsonl"
+        jobs_jl.write_text("\n".join(json.dumps(j) for j in sample_jobs_data) + "\n")
+        out = temp_dir / "scores.jsonl"
+        
+        with patch('scripts.score.JOBS_JL', jobs_jl), patch('scripts.score.OUT_SCORES', out), \
+             patch('scripts.score.SCORES_META', temp_dir / "meta.json"), \
+             patch('scripts.score.EMBED_BACKEND', 'local'), \
+             patch('scripts.local_embeddings.LOCAL_MODEL', temp_dir / "local.npz"), \
+             patch('scripts.score.LOCAL_EMBEDDINGS', temp_dir / "e.npy"), \
+             patch('scripts.score.LOCAL_EMBEDDINGS_INDEX', temp_dir / "e.json"), \
+             patch('scripts.score.BM25Index', lambda: BM25Index(temp_dir / "bm25.json")):
+            main()
+        
+        rows = [json.loads(line) for line in out.read_text().splitlines()]
+        assert {r["id"] for r in rows} == {"job123", "job456"}
+        assert all(0.0 <= r["score"] <= 1.0 for r in rows)
+        assert (temp_dir / "local.npz").exists()
+        mock_get_client.assert_not_called()
+        mock_index_vectors.assert_not_called()
     
     def test_why_fit_logic(self):
         """Test the why_fit scoring logic."""
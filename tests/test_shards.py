@@ -0,0 +1,73 @@
+import json
+from unittest.mock import patch
+from scripts.shards import dedupe_key, write_shard, merge_shards, iter_jsonl
+
+
+def _job(title, company, location="Tel Aviv, Israel", **extra):
+    job = {"title": title, "company": company, "location": location,
+           "url": f"https://example.com/{company}/{title.replace(' ', '-')}"}
+    job.update(extra)
+    return job
+
+
+class TestShards:
+    """Test per-source shards and the k-way merge stage."""
+    
+    def test_dedupe_key(self):
+        """Key is case-insensitive over title, company and location."""
+        assert dedupe_key(_job("Head of DevOps", "Monday")) == dedupe_key(_job("head of devops", "monday"))
+        assert dedupe_key({"title": None}) == "||"
+    
+    def test_write_shard_sorted_with_ids(self, temp_dir):
+        """Shards are sorted by dedupe key and every record gets an id."""
+        with patch('scripts.shards.RAW_DIR', temp_dir):
+            path = write_shard("greenhouse", [_job("VP R&D", "wix"), _job("Head of DevOps", "monday")], day="2025-01-01")
+        
+        assert path == temp_dir / "2025-01-01" / "greenhouse.jsonl"
+        rows = list(iter_jsonl(path))
+        assert [r["company"] for r in rows] == ["monday", "wix"]
+        assert all(len(r["id"]) == 20 for r in rows)
+        assert not list(path.parent.glob("*.tmp*"))
+    
+    def test_merge_dedupes_and_keeps_existing(self, temp_dir):
+        """Existing processed records win; shard duplicates are dropped."""
+        out = temp_dir / "jobs.jsonl"
+        existing = _job("Head of DevOps", "monday", id="old123", age=5, first_seen="2025-01-01")
+        out.write_text(json.dumps(existing) + "\n")
+        
+        with patch('scripts.shards.RAW_DIR', temp_dir):
+            write_shard("lever", [_job("Head of DevOps", "Monday"), _job("Director of Platform", "lemonade")], day="d")
+            write_shard("greenhouse", [_job("Director of Platform", "lemonade"), _job("VP Engineering", "wix")], day="d")
+            stats = merge_shards("d", out=out)
+        
+        rows = list(iter_jsonl(out))
+        keys = [dedupe_key(r) for r in rows]
+        assert keys == sorted(keys)
+        assert len(rows) == 3
+        assert rows[1]["id"] == "old123" and rows[1]["age"] == 5
+        assert stats == {"shards": 2, "written": 3, "new": 2, "duplicates": 2}
+    
+    def test_merge_is_idempotent_and_sorts_legacy_file(self, temp_dir):
+        """An unsorted legacy jobs.jsonl is sorted once; re-merging adds nothing."""
+        out = temp_dir / "jobs.jsonl"
+        out.write_text("\n".join(json.dumps(j) for j in [_job("VP R&D", "wix"), _job("Head of SRE", "gong")]) + "\n")
+        
+        with patch('scripts.shards.RAW_DIR', temp_dir):
+            write_shard("known_jobs", [_job("Head of DevOps", "monday")], day="d")
+            merge_shards("d", out=out)
+            stats = merge_shards("d", out=out)
+        
+        assert [r["company"] for r in iter_jsonl(out)] == ["monday", "gong", "wix"]
+        assert stats["new"] == 0
+        assert stats["duplicates"] == 1
+    
+    def test_merge_selected_sources(self, temp_dir):
+        """Replaying a single source only merges that shard."""
+        out = temp_dir / "jobs.jsonl"
+        with patch('scripts.shards.RAW_DIR', temp_dir):
+            write_shard("lever", [_job("Head of DevOps", "monday")], day="d")
+            write_shard("greenhouse", [_job("VP Engineering", "wix")], day="d")
+            stats = merge_shards("d", out=out, sources=["lever"])
+        
+        assert stats["shards"] == 1
+        assert [r["company"] for r in iter_jsonl(out)] == ["monday"]
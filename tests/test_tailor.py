@@ -1,30 +1,41 @@
 import pytest
 import json
-from unittest.mock import patch, mock_open, MagicMock
-from scripts.tailor import pick, gen_cover
+from unittest.mock import patch, MagicMock
+from scripts.tailor import pick, gen_cover, cover_for, batch_covers, gen_cover_with_retry, load_index
 
 
 class TestTailor:
     """Test tailoring functionality."""
     
-    def test_pick_job_found(self, sample_scores_data):
+    @pytest.fixture
+    def scores_file(self, temp_dir, sample_scores_data):
+        scores = temp_dir / "scores.jsonl"
+        scores.write_text('\n'.join([json.dumps(score) for score in sample_scores_data]) + '\n')
+        with patch('scripts.tailor.SCORES', scores), patch('scripts.tailor.SCORES_INDEX', temp_dir / "idx.json"):
+            yield scores
+    
+    def test_pick_job_found(self, scores_file):
         """Test picking a job by ID when it exists."""
-        scores_content = '\n'.join([json.dumps(score) for score in sample_scores_data])
-        
-        with patch('builtins.open', mock_open(read_data=scores_content)):
-            job = pick('job123')
+        job = pick('job123')
         
         assert job['id'] == 'job123'
         assert job['title'] == 'Head of DevOps'
         assert job['company'] == 'monday'
+        assert pick('job456')['company'] == 'lemonade'
     
-    def test_pick_job_not_found(self, sample_scores_data):
+    def test_pick_job_not_found(self, scores_file):
         """Test picking a job by ID when it doesn't exist."""
-        scores_content = '\n'.join([json.dumps(score) for score in sample_scores_data])
+        with pytest.raises(SystemExit, match="Job ID not found"):
+            pick('nonexistent_job')
+    
+    def test_index_rebuilt_when_scores_change(self, scores_file):
+        """The id index is persisted and refreshed when scores.jsonl is rewritten."""
+        assert set(load_index()) == {'job123', 'job456'}
         
-        with patch('builtins.open', mock_open(read_data=scores_content)):
-            with pytest.raises(SystemExit, match="Job ID not found"):
-                pick('nonexistent_job')
+        scores_file.write_text(json.dumps({"id": "job789", "title": "VP Engineering"}) + '\n')
+        
+        assert set(load_index()) == {'job789'}
+        assert pick('job789')['title'] == 'VP Engineering'
     
     @patch('scripts.tailor.get_client')
     @patch('scripts.tailor.PROFILE', 'Senior DevOps leader')
@@ -54,3 +65,51 @@ class TestTailor:
         call_kwargs = mock_client.chat.completions.create.call_args[1]
         assert call_kwargs['model'] == 'gpt-4o-mini'
         assert call_kwargs['temperature'] == 0.4
+
+    @patch('scripts.tailor.gen_cover', return_value="Cached note")
+    def test_cover_cache(self, mock_gen, temp_dir):
+        """Notes are generated once per (job, profile, prompt) and then served from disk."""
+        job = {'id': 'job123', 'title': 'Head of DevOps', 'company': 'monday'}
+        with patch('scripts.tailor.COVER_CACHE', temp_dir / "covers"):
+            assert cover_for(job) == "Cached note"
+            assert cover_for(job) == "Cached note"
+            assert mock_gen.call_count == 1
+            
+            with patch('scripts.tailor.PROFILE', 'A different profile'):
+                cover_for(job)
+            assert mock_gen.call_count == 2
+            
+            with patch('scripts.tailor.COVER_PROMPT', 'Write a note for {title} at {company}'):
+                cover_for(job)
+            assert mock_gen.call_count == 3
+    
+    @patch('scripts.utils.time.sleep')
+    def test_retry_on_rate_limit(self, mock_sleep):
+        """HTTP 429 is retried with backoff; other errors are raised immediately."""
+        rate_limited = Exception("rate limited")
+        rate_limited.status_code = 429
+        with patch('scripts.tailor.gen_cover', side_effect=[rate_limited, rate_limited, "note"]) as mock_gen:
+            assert gen_cover_with_retry({'id': 'job123'}) == "note"
+        assert mock_gen.call_count == 3
+        assert mock_sleep.call_count == 2
+        
+        with patch('scripts.tailor.gen_cover', side_effect=ValueError("bad request")):
+            with pytest.raises(ValueError):
+                gen_cover_with_retry({'id': 'job123'})
+    
+    def test_batch_covers_skips_cached(self, temp_dir):
+        """Batch mode generates only missing notes and reports failures without aborting."""
+        jobs = [{'id': f'job{i}', 'title': f'Job {i}', 'company': 'acme'} for i in range(5)]
+        
+        def fake_gen(job):
+            if job['id'] == 'job3':
+                raise RuntimeError("boom")
+            return f"note for {job['id']}"
+        
+        with patch('scripts.tailor.COVER_CACHE', temp_dir / "covers"), \
+             patch('scripts.tailor.gen_cover', side_effect=fake_gen) as mock_gen:
+            cover_for(jobs[0])
+            stats = batch_covers(jobs, concurrency=3)
+            assert stats == {"generated": 3, "cached": 1, "failed": 1}
+            assert mock_gen.call_count == 5
+            assert cover_for(jobs[2]) == "note for job2"
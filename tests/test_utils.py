@@ -2,7 +2,7 @@ import pytest
 import responses
 from scripts.utils import (
     getenv, slug, job_id, now_iso, 
-    create_session, safe_get
+    create_session, safe_get, capped_get, ContentRejected
 )
 
 
@@ -125,3 +125,45 @@ class TestUtils:
         
         with pytest.raises(Exception):
             safe_get('https://api.example.com/data')
+    
+    @responses.activate
+    def test_safe_get_stream_caps_body(self):
+        """Streaming keeps at most max_bytes of the body."""
+        responses.add(responses.GET, 'https://acme.com/careers', body="x" * 100_000, content_type='text/html')
+        
+        response = safe_get('https://acme.com/careers', stream=True, max_bytes=1000)
+        assert len(response.content) == 1000 and len(response.text) == 1000
+        assert response.truncated
+        
+        response = safe_get('https://acme.com/careers', stream=True)
+        assert len(response.content) == 100_000 and not response.truncated
+    
+    @responses.activate
+    def test_safe_get_stream_json(self):
+        """Streamed JSON decodes as usual."""
+        responses.add(responses.GET, 'https://api.example.com/data', json={'status': 'success'})
+        
+        assert safe_get('https://api.example.com/data', stream=True).json() == {'status': 'success'}
+    
+    @responses.activate
+    def test_capped_get_content_type_gate(self):
+        """Non-text responses are rejected before the body is read."""
+        responses.add(responses.GET, 'https://acme.com/brochure.pdf', body=b"%PDF" * 1000,
+                      content_type='application/pdf')
+        
+        with pytest.raises(ContentRejected):
+            capped_get(create_session(), 'https://acme.com/brochure.pdf')
+    
+    @responses.activate
+    def test_capped_get_stops_at_marker(self):
+        """Reading stops one chunk after a marker has arrived, even across chunk boundaries."""
+        body = "a" * 16_376 + "lever.co/acme"  # straddles the first 16 KiB chunk
+        body += "b" * 200_000
+        responses.add(responses.GET, 'https://acme.com/careers', body=body, content_type='text/html')
+        
+        response = capped_get(create_session(), 'https://acme.com/careers', stop_at=["lever.co"])
+        assert "lever.co/acme" in response.text and response.stopped_at == "lever.co"
+        assert len(response.content) < 50_000 and response.truncated
+        
+        response = capped_get(create_session(), 'https://acme.com/careers', stop_at=["<never>"])
+        assert len(response.content) == len(body) and not response.truncated and response.stopped_at is None
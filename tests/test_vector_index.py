@@ -0,0 +1,104 @@
+import pytest
+import numpy as np
+from unittest.mock import patch
+from scripts.vector_index import VectorIndex, spherical_kmeans
+
+
+def _clustered(n, dim=16, clusters=8, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return (centers[rng.integers(0, clusters, n)] + 0.1 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+class TestVectorIndex:
+    """Test the persistent IVF nearest-neighbor index."""
+    
+    def test_add_persist_and_search(self, temp_dir):
+        """Vectors and metadata survive a reload; the query job itself is excluded."""
+        index = VectorIndex(temp_dir)
+        vecs = np.array([[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+        meta = [{"title": f"Job {i}", "company": "acme"} for i in range(4)]
+        
+        assert index.add(["a", "b", "c", "d"], vecs, meta) == 4
+        assert index.add(["a", "e"], vecs[:2], meta[:2]) == 1  # only e is new
+        
+        reloaded = VectorIndex(temp_dir)
+        assert len(reloaded) == 5
+        assert reloaded.info("b")["title"] == "Job 1"
+        results = reloaded.similar_to("a", k=2)
+        assert {jid for jid, _ in results} == {"b", "e"}  # e was added with b's vector
+        assert results[0][1] == pytest.approx(0.9 / np.sqrt(0.82))
+    
+    def test_prefix_lookup(self, temp_dir):
+        """Telegram shows 12-char id prefixes; unique prefixes resolve."""
+        index = VectorIndex(temp_dir)
+        index.add(["abcdef123456xyz", "zzz"], np.eye(2, dtype=np.float32))
+        
+        assert [jid for jid, _ in index.similar_to("abcdef123456")] == ["zzz"]
+        assert index.similar_to("nope") == []
+    
+    def test_dimension_mismatch(self, temp_dir):
+        """Mixing embedding sizes is rejected."""
+        index = VectorIndex(temp_dir)
+        index.add(["a"], np.ones((1, 3)))
+        with pytest.raises(ValueError):
+            index.add(["b"], np.ones((1, 4)))
+    
+    def test_ivf_matches_exact_search(self, temp_dir):
+        """Once trained, probed IVF search agrees with brute force on clustered data."""
+        vecs = _clustered(600)
+        with patch('scripts.vector_index.EXACT_MAX', 100):
+            index = VectorIndex(temp_dir)
+            index.add([f"j{i}" for i in range(600)], vecs)
+            assert index.centroids is not None
+            
+            unit = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+            for i in range(10):
+                exact = [f"j{r}" for r in np.argsort(-(unit @ unit[i]))[1:6]]
+                approx = [jid for jid, _ in index.similar_to(f"j{i}", k=5, nprobe=4)]
+                assert len(set(exact) & set(approx)) >= 4
+            
+            # Incremental inserts are assigned to existing lists
+            index.add(["new"], vecs[:1])
+            assert len(index.assign) == 601
+            assert VectorIndex(temp_dir).similar_to("new", k=1)[0][0] == "j0"
+    
+    def test_changed_text_replaces_vector(self, temp_dir):
+        """A job whose content hash changed gets its new vector in place; unchanged ones are kept."""
+        index = VectorIndex(temp_dir)
+        index.add(["a", "b", "c"], np.eye(3, dtype=np.float32), hashes=["h1", "h2", "h3"])
+        
+        assert index.add(["a", "b"], np.array([[0, 0, 1], [0, 1, 0]], dtype=np.float32), hashes=["h1x", "h2"]) == 1
+        reloaded = VectorIndex(temp_dir)
+        assert len(reloaded) == 3 and reloaded.info("a")["hash"] == "h1x"
+        assert reloaded.similar_to("a", k=1)[0] == ("c", pytest.approx(1.0))
+    
+    def test_sync_from_embedding_store(self, temp_dir):
+        """A cold index is rebuilt from the persisted embedding store, and follows text changes."""
+        from scripts.embedding_store import EmbeddingStore
+        from scripts.vector_index import load_synced
+        
+        store = EmbeddingStore("m", temp_dir / "emb.npy", temp_dir / "emb.json")
+        for jid, h, vec in [("a", "h1", [1, 0, 0]), ("b", "h2", [0.9, 0.1, 0]), ("c", "h3", [0, 1, 0])]:
+            store.put(jid, h, vec)
+        store.save()
+        jobs_jl = temp_dir / "jobs.jsonl"
+        jobs_jl.write_text("\n".join(f'{{"id": "{j}", "title": "Job {j}"}}' for j in "abc"))
+        
+        with patch('scripts.embedding_store.EMBEDDINGS', temp_dir / "emb.npy"), \
+             patch('scripts.embedding_store.EMBEDDINGS_INDEX', temp_dir / "emb.json"), \
+             patch('scripts.score.EMB_MODEL', "m"), patch('scripts.score.JOBS_JL', jobs_jl):
+            index = load_synced(temp_dir / "index")
+            assert len(index) == 3 and index.info("b")["title"] == "Job b"
+            assert index.similar_to("a", k=1)[0][0] == "b"
+            assert load_synced(temp_dir / "index").sync(store, [{"id": "a"}]) == 0  # already current
+            
+            store.put("b", "h2x", [-1, 0, 0])
+            store.save()
+            assert load_synced(temp_dir / "index").similar_to("a", k=1)[0][0] == "c"
+    
+    def test_spherical_kmeans_unit_centroids(self):
+        """Centroids are unit length."""
+        centroids = spherical_kmeans(_clustered(200), 4)
+        assert centroids.shape == (4, 16)
+        assert np.allclose(np.linalg.norm(centroids, axis=1), 1.0, atol=1e-5)